@@ -300,6 +300,7 @@ setup(
     entry_points={
         'console_scripts': [
             'sort_wsdl=spyne.test.sort_wsdl:main',
+            'spyne_benchmark=spyne.test.benchmark:main',
         ]
     },
 
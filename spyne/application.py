@@ -29,6 +29,7 @@ from spyne import BODY_STYLE_EMPTY, BODY_STYLE_BARE, BODY_STYLE_WRAPPED, \
 from spyne.error import Fault, Redirect, RespawnError, InvalidRequestError
 from spyne.interface import Interface, InterfaceDocuments
 from spyne.util import six
+from spyne.util.aio import iscoroutine, run_coroutine
 from spyne.util.appreg import register_application
 
 
@@ -172,6 +173,12 @@ class Application(object):
             # call user method
             ctx.out_object = self.call_wrapper(ctx)
 
+            # async def methods return coroutines. run them in the shared
+            # event loop unless the transport can await them itself.
+            if iscoroutine(ctx.out_object) and not getattr(
+                           ctx.transport.itself, 'native_coroutines', False):
+                ctx.out_object = run_coroutine(ctx.out_object)
+
             # out object is always a sequence of return values. see
             # MethodContext docstrings for more info
             if ctx.descriptor.body_style is not BODY_STYLE_WRAPPED or \
@@ -304,6 +311,13 @@ class Application(object):
                 d.service_class.initialize(server)
                 seen.add(id(d.service_class))
 
+            # precompute the handler table of the method so that the first
+            # request doesn't have to.
+            d.event_handlers
+
+        self.in_protocol.finalize_handlers()
+        self.out_protocol.finalize_handlers()
+
     def __hash__(self):
         return hash(tuple((id(s) for s in self.services)))
 
@@ -1,4 +1,3 @@
-
 #
 # spyne - Copyright (C) Spyne contributors.
 #
@@ -17,15 +16,103 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301
 #
 
-"""The HTTP (urllib2) client transport."""
+"""The HTTP (httplib) client transport. Connections to the server are kept
+alive and reused by later calls."""
+
+import logging
+logger = logging.getLogger(__name__)
+
+import socket
+import threading
+
+from multiprocessing.pool import ThreadPool
 
 from spyne import RemoteService, ClientBase, RemoteProcedureBase
+from spyne.util import six
+from spyne.util.six.moves import http_client
+from spyne.util.six.moves.urllib.parse import urlsplit
+
+
+class HttpConnectionPool(object):
+    """A thread-safe pool of persistent connections to a single HTTP server.
+
+    :param url: The url of the server endpoint. Only its scheme and network
+        location are used by the pool.
+    :param max_size: Max. number of idle connections to keep around. As many
+        connections as needed are opened, but the ones that are released when
+        the pool is full are closed.
+    :param timeout: Socket timeout for new connections, in seconds.
+    """
+
+    def __init__(self, url, max_size=10, timeout=None):
+        parsed = urlsplit(url)
+
+        if parsed.scheme == 'https':
+            self.connection_class = http_client.HTTPSConnection
+        elif parsed.scheme == 'http':
+            self.connection_class = http_client.HTTPConnection
+        else:
+            raise ValueError("Unsupported url scheme %r" % parsed.scheme)
+
+        self.netloc = parsed.netloc
+        self.max_size = max_size
+        self.timeout = timeout
+
+        self.connections = []
+        self._mtx_connections = threading.Lock()
+
+    def get(self):
+        """Returns an idle connection, or a new one when there are none. The
+        second element of the returned tuple is ``True`` when the connection
+        was used before."""
+
+        with self._mtx_connections:
+            if len(self.connections) > 0:
+                return self.connections.pop(), True
+
+        if self.timeout is None:
+            return self.connection_class(self.netloc), False
 
-from six.moves.urllib.request import Request, urlopen
-from six.moves.urllib.error import HTTPError
+        return self.connection_class(self.netloc, timeout=self.timeout), False
+
+    def put(self, conn):
+        """Gives the given connection back to the pool. The response to the
+        last request must have been read in full."""
+
+        with self._mtx_connections:
+            if len(self.connections) < self.max_size:
+                self.connections.append(conn)
+                return
+
+        conn.close()
+
+    def close(self):
+        """Closes all idle connections."""
+
+        with self._mtx_connections:
+            connections, self.connections = self.connections, []
+
+        for conn in connections:
+            conn.close()
+
+
+# errors that mean the server closed an idle connection that we tried to reuse.
+_STALE_CONNECTION_ERRORS = (http_client.BadStatusLine, socket.error)
 
 
 class _RemoteProcedure(RemoteProcedureBase):
+    def __init__(self, url, app, name, out_header=None, pool=None,
+                                                                chunked=False):
+        super(_RemoteProcedure, self).__init__(url, app, name, out_header)
+
+        self.pool = pool
+        self.chunked = chunked
+
+        parsed = urlsplit(url)
+        self.path = parsed.path or '/'
+        if parsed.query:
+            self.path += '?' + parsed.query
+
     def __call__(self, *args, **kwargs):
         # there's no point in having a client making the same request more than
         # once, so if there's more than just one context, it is a bug.
@@ -40,16 +127,7 @@ class _RemoteProcedure(RemoteProcedureBase):
         # sets ctx.out_string
         self.get_out_string(self.ctx)
 
-        out_string = b''.join(self.ctx.out_string) # FIXME: just send the iterable to the http stream.
-        request = Request(self.url, out_string)
-        code = 200
-        try:
-            response = urlopen(request)
-            self.ctx.in_string = [response.read()]
-
-        except HTTPError as e:
-            code = e.code
-            self.ctx.in_string = [e.read()]
+        code, self.ctx.in_string = self.send(self.ctx.out_string)
 
         # this sets ctx.in_error if there's an error, and ctx.in_object if
         # there's none.
@@ -62,9 +140,129 @@ class _RemoteProcedure(RemoteProcedureBase):
         else:
             return self.ctx.in_object
 
+    def send(self, out_string):
+        """Sends the request body over a pooled connection and returns the
+        response status and body.
+
+        The chunks of ``out_string`` are written to the socket one by one,
+        without joining them first. They're sent with chunked transfer
+        encoding if the client was created with ``chunked=True``, otherwise
+        with a ``Content-Length`` header.
+        """
+
+        headers = {'Content-Type': self.ctx.out_protocol.mime_type}
+
+        # httplib can't do chunked transfer encoding.
+        chunked = self.chunked and not six.PY2
+        if chunked:
+            headers['Transfer-Encoding'] = 'chunked'
+
+        else:
+            if not isinstance(out_string, (list, tuple)):
+                out_string = list(out_string)
+
+            headers['Content-Length'] = str(sum(len(s) for s in out_string))
+
+        while True:
+            conn, reused = self.pool.get()
+
+            try:
+                if chunked:
+                    conn.request('POST', self.path, out_string, headers,
+                                                           encode_chunked=True)
+                else:
+                    conn.request('POST', self.path, out_string, headers)
+
+                response = conn.getresponse()
+                in_string = response.read()
+
+            except socket.timeout:
+                conn.close()
+                raise
+
+            except _STALE_CONNECTION_ERRORS as e:
+                conn.close()
+
+                # an iterator can't be sent twice.
+                if not reused or not isinstance(out_string, (list, tuple)):
+                    raise
+
+                logger.debug("Reused connection failed with %r, retrying", e)
+                continue
+
+            except BaseException:
+                conn.close()
+                raise
+
+            if response.will_close:
+                conn.close()
+            else:
+                self.pool.put(conn)
+
+            return response.status, [in_string]
+
 
 class HttpClient(ClientBase):
-    def __init__(self, url, app):
+    """The HTTP client transport.
+
+    :param url: The url for the server endpoint.
+    :param app: The application instance the client belongs to.
+    :param pool_size: Max. number of idle connections to keep alive, as well
+        as the number of calls that :func:`call_many` runs at the same time.
+    :param timeout: Socket timeout, in seconds.
+    :param chunked: Send request bodies with chunked transfer encoding,
+        without knowing their length in advance. Not every server supports
+        this, e.g. ``wsgiref`` doesn't.
+    """
+
+    def __init__(self, url, app, pool_size=10, timeout=None, chunked=False):
         super(HttpClient, self).__init__(url, app)
 
-        self.service = RemoteService(_RemoteProcedure, url, app)
+        self.pool = HttpConnectionPool(url, max_size=pool_size,
+                                                               timeout=timeout)
+
+        self.service = RemoteService(_RemoteProcedure, url, app,
+                                                pool=self.pool, chunked=chunked)
+
+    def call_many(self, calls, return_exceptions=False):
+        """Calls several remote methods at the same time over the connection
+        pool and returns their results in the order of ``calls``.
+
+        :param calls: An iterable of ``(method_name, args)`` or
+            ``(method_name, args, kwargs)`` tuples.
+        :param return_exceptions: When ``True``, exceptions raised by calls
+            are returned in place of their results. Otherwise the first one
+            is re-raised once all calls are finished.
+        """
+
+        calls = list(calls)
+        if len(calls) == 0:
+            return []
+
+        def _call(call):
+            if len(call) == 2:
+                (name, args), kwargs = call, {}
+            else:
+                name, args, kwargs = call
+
+            try:
+                return True, getattr(self.service, name)(*args, **kwargs)
+
+            except Exception as e:
+                return False, e
+
+        thread_pool = ThreadPool(min(self.pool.max_size, len(calls)))
+        try:
+            results = thread_pool.map(_call, calls)
+
+        finally:
+            thread_pool.close()
+
+        retval = []
+        for success, result in results:
+            if not (success or return_exceptions):
+                raise result
+
+            retval.append(result)
+
+        return retval
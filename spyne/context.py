@@ -130,8 +130,10 @@ class MethodContext(object):
 
         desc = self.descriptor
         if desc is not None:
-            for evmgr in desc.event_managers:
-                evmgr.fire_event(event, self, *args, **kwargs)
+            handlers = desc.event_handlers.get(event, None)
+            if handlers is not None:
+                for handler in handlers:
+                    handler(self, *args, **kwargs)
 
     @property
     def method_name(self):
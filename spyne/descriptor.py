@@ -21,8 +21,10 @@ import logging
 logger = logging.getLogger('spyne')
 
 from spyne import LogicError
+from spyne.evmgr import EventManager, merge_handlers
 from spyne.util import six
 from spyne.util import DefaultAttrDict
+from spyne.util.aio import iscoroutinefunction
 from spyne.service import Service, ServiceBaseBase
 from spyne.const.xml import DEFAULT_NS
 
@@ -44,7 +46,7 @@ class MethodDescriptor(object):
                  parent_class, port_type, no_ctx, udd, class_key, aux, patterns,
                  body_style, args, operation_name, no_self, translations,
                  when, static_when, service_class, href, internal_key_suffix,
-                 default_on_null, event_managers, logged):
+                 default_on_null, event_managers, logged, compress=True):
 
         self.__real_function = function
         """The original callable for the user code."""
@@ -183,9 +185,31 @@ class MethodDescriptor(object):
         self.logged = logged
         """Denotes the logging style for this method."""
 
+        self.compress = compress
+        """When False, HTTP transports never compress the responses of this
+        method, even when response compression is enabled and the client
+        accepts it."""
+
         if self.service_class is not None:
             self.event_managers.append(self.service_class.event_manager)
 
+        self.__event_handlers = None
+        self.__event_handlers_generation = None
+
+    @property
+    def event_handlers(self):
+        """A dict of event name/handler tuple pairs, merged from all event
+        managers registered with this method. Only events that have at least
+        one handler are present. It's rebuilt whenever a listener is added to
+        or removed from any event manager.
+        """
+
+        if self.__event_handlers_generation != EventManager.generation:
+            self.__event_handlers = merge_handlers(self.event_managers)
+            self.__event_handlers_generation = EventManager.generation
+
+        return self.__event_handlers
+
     def translate(self, locale, default):
         """
         :param locale: locale string
@@ -272,6 +296,10 @@ class MethodDescriptor(object):
             self.__real_function = val
         self.function = self.__real_function
 
+        self.is_coroutine = iscoroutinefunction(self.function)
+        """True when the user function is a coroutine function, i.e. it's
+        defined with ``async def``."""
+
     @property
     def in_header(self):
         return self.__in_header
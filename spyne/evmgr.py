@@ -18,9 +18,14 @@
 #
 
 
+from collections import defaultdict
+
 from spyne.util.oset import oset
 
 
+_NO_HANDLERS = ()
+
+
 class EventManager(object):
     """Spyne supports a simple event system that can be used to have repetitive
     boilerplate code that has to run for every method call nicely tucked away
@@ -35,6 +40,10 @@ class EventManager(object):
     run twice.
     """
 
+    generation = 0
+    """Incremented every time a listener is added to or removed from any event
+    manager. Used to invalidate precomputed handler tables."""
+
     def __init__(self, parent, handlers={}):
         """Initializer for the ``EventManager`` instance.
 
@@ -48,6 +57,7 @@ class EventManager(object):
 
         self.parent = parent
         self.handlers = dict(handlers)
+        self.counters = None
 
     def add_listener(self, event_name, handler):
         """Register a handler for the given event name.
@@ -58,16 +68,56 @@ class EventManager(object):
                         MethodContext argument.
         """
 
-        handlers = self.handlers.get(event_name, oset())
+        handlers = self.handlers.get(event_name, None)
+        if handlers is None:
+            handlers = self.handlers[event_name] = oset()
         handlers.add(handler)
-        self.handlers[event_name] = handlers
+
+        EventManager.generation += 1
 
     def del_listener(self, event_name, handler=None):
         if handler is None:
             del self.handlers[event_name]
         else:
             self.handlers[event_name].remove(handler)
+            if len(self.handlers[event_name]) == 0:
+                del self.handlers[event_name]
+
+        EventManager.generation += 1
+
+    def has_listeners(self, event_name):
+        """Returns ``True`` when at least one handler is registered for the
+        given event name."""
+
+        return event_name in self.handlers
+
+    def get_handlers(self, event_name):
+        """Returns the handlers registered for the given event name as a
+        sequence. Returns an empty sequence when there are no handlers."""
+
+        return self.handlers.get(event_name, _NO_HANDLERS)
+
+    def enable_counters(self):
+        """Start counting how many times each event is fired. Counting is off
+        by default to keep :func:`fire_event` as cheap as possible."""
+
+        if self.counters is None:
+            self.counters = defaultdict(int)
 
+    def disable_counters(self):
+        self.counters = None
+
+    def get_counters(self):
+        """Returns a dict of event name/fire count pairs. Returns an empty dict
+        when counters are not enabled."""
+
+        if self.counters is None:
+            return {}
+        return dict(self.counters)
+
+    def reset_counters(self):
+        if self.counters is not None:
+            self.counters.clear()
 
     def fire_event(self, event_name, ctx, *args, **kwargs):
         """Run all the handlers for a given event name.
@@ -78,6 +128,31 @@ class EventManager(object):
                         stored in ctx.event attribute.
         """
 
-        handlers = self.handlers.get(event_name, oset())
+        if self.counters is not None:
+            self.counters[event_name] += 1
+
+        handlers = self.handlers.get(event_name, None)
+        if handlers is None:
+            return
+
         for handler in handlers:
             handler(ctx, *args, **kwargs)
+
+
+def merge_handlers(event_managers):
+    """Merges the handlers of the given event managers into a dict of event
+    name/handler tuple pairs. Handlers are kept in the order they would run if
+    the event managers fired them one after the other. Event names without any
+    handlers are left out."""
+
+    retval = {}
+
+    for evmgr in event_managers:
+        for event_name, handlers in evmgr.handlers.items():
+            if len(handlers) == 0:
+                continue
+
+            retval[event_name] = retval.get(event_name, _NO_HANDLERS) + \
+                                                                 tuple(handlers)
+
+    return retval
@@ -258,6 +258,8 @@ class ModelBase(object):
     mainly used for defining constraints on input values.
     """
 
+    __slots__ = ()
+
     __orig__ = None
     """This holds the original class the class .customize()d from. Ie if this is
     None, the class is not a customize()d one."""
@@ -937,6 +939,10 @@ class PushBase(object):
         self._eb_finish = None
         self.interim = False
 
+        self.flow_control = None
+        """Set by transports that can tell when the outgoing stream can't take
+        more data. See :func:`when_writable` and :func:`feed`."""
+
     def _init(self, ctx, gen, _cb_finish, _eb_finish, interim):
         self.length = 0
 
@@ -967,6 +973,32 @@ class PushBase(object):
             self.gen.send(inst)
             self.length += 1
 
+    def when_writable(self):
+        """Returns ``None`` when the outgoing stream can take more data right
+        away. Otherwise, returns a transport-specific object (e.g. a Twisted
+        ``Deferred``) that fires when it can."""
+
+        if self.flow_control is None:
+            return None
+        return self.flow_control.when_writable()
+
+    def feed(self, insts):
+        """Appends the instances from the given iterable as long as the
+        outgoing stream can take more data, and resumes once the stream is
+        drained. Unlike :func:`extend`, it doesn't buffer a big response in
+        memory when the client is slow to consume it.
+
+        Returns ``None`` when all instances were appended. Otherwise, returns
+        a transport-specific object (e.g. a Twisted ``Deferred``) that fires
+        when they are. It must be returned from the push callback so that the
+        response is not closed prematurely."""
+
+        if self.flow_control is None:
+            self.extend(insts)
+            return None
+
+        return self.flow_control.feed(self, insts)
+
     def close(self):
         try:
             self.gen.throw(Break())
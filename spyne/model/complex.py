@@ -28,11 +28,12 @@ from __future__ import print_function
 import logging
 logger = logging.getLogger(__name__)
 
+import re
 import decimal
 import traceback
 
 from copy import copy
-from weakref import WeakKeyDictionary
+from weakref import ref, WeakKeyDictionary
 from collections import deque, OrderedDict
 from inspect import isclass
 from itertools import chain
@@ -43,10 +44,10 @@ from spyne.const.xml import PREFMAP
 from spyne.model import Point, Unicode, PushBase, ModelBase
 from spyne.model._base import PSSM_VALUES, apply_pssm
 from spyne.model.primitive import NATIVE_MAP
+from spyne.model.primitive import Double, Integer, UnsignedInteger
 from spyne.model.primitive._base import AnyXml
 
-from spyne.util import six, memoize, memoize_id, sanitize_args, \
-    memoize_ignore_none
+from spyne.util import six, memoize, memoize_id, sanitize_args
 from spyne.util.color import YEL
 from spyne.util.meta import Prepareable
 from spyne.util.odict import odict
@@ -70,6 +71,10 @@ def _get_flat_type_info(cls, retval):
 
 
 class TypeInfo(odict):
+    # weakref to the class whose _type_info this is. the class is notified
+    # about changes so that it can update the tables derived from it.
+    _owner = None
+
     def __init__(self, *args, **kwargs):
         super(TypeInfo, self).__init__(*args, **kwargs)
 
@@ -81,6 +86,26 @@ class TypeInfo(odict):
         assert isinstance(key, string_types)
         super(TypeInfo, self).__setitem__(key, val)
 
+        if self._owner is not None:
+            self._notify_owner()
+
+    def __delitem__(self, key):
+        super(TypeInfo, self).__delitem__(key)
+
+        if self._owner is not None:
+            self._notify_owner()
+
+    def insert(self, index, item):
+        super(TypeInfo, self).insert(index, item)
+
+        if self._owner is not None:
+            self._notify_owner()
+
+    def _notify_owner(self):
+        owner = self._owner()
+        if owner is not None and owner._type_info is self:
+            _on_members_changed(owner)
+
 
 class _SimpleTypeInfoElement(object):
     __slots__ = ['path', 'parent', 'type', 'is_array', 'can_be_empty']
@@ -318,7 +343,7 @@ def _get_type_info(cls, cls_name, cls_bases, cls_dict, attrs):
                     "customized class. You should first get your class " \
                     "hierarchy right, then start customizing classes."
 
-                b.get_subclasses.memo.clear()
+                b.get_subclasses.reset()
                 logger.debug("Registering %r as base of '%s'", b, cls_name)
 
     if not ('_type_info' in cls_dict):
@@ -641,6 +666,287 @@ def _init_member(inst, key, cls, attr):
     setattr(inst, key, None)
 
 
+_identifier_re = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+def _get_slot_name(key, cls):
+    """Returns the name of the slot that stores the value of the ``key`` field
+    of type ``cls``."""
+
+    if issubclass(cls, ModelBase) and cls.Attributes.validate_on_assignment:
+        # the field name is taken by the property that validates assignments
+        return '_voa_' + key
+
+    return key
+
+
+def _gen_slots(cls_bases, cls_dict, type_info, attrs):
+    """Puts ``__slots__`` in the ``cls_dict`` of a class with
+    ``Attributes.slots = True``. Returns ``True`` if the class got slots for its
+    fields."""
+
+    if '__slots__' in cls_dict:
+        return False
+
+    # customized classes are not supposed to be instantiated, their __orig__
+    # is what gets instantiated instead.
+    if '__orig__' in cls_dict:
+        cls_dict['__slots__'] = ()
+        return False
+
+    # sqlalchemy instruments instances via their __dict__
+    if attrs.table_name is not None or attrs.sqla_table is not None:
+        return False
+
+    existing = set()
+    has_dict = False
+    for b in cls_bases:
+        for c in b.__mro__:
+            if c is object:
+                continue
+
+            c_slots = c.__dict__.get('__slots__', None)
+            if c_slots is None:
+                has_dict = True
+            elif isinstance(c_slots, string_types):
+                existing.add(c_slots)
+            else:
+                existing.update(c_slots)
+
+    slots = []
+    for k, v in type_info.items():
+        slot_name = _get_slot_name(k, v)
+
+        if _identifier_re.match(slot_name) is None:
+            # can't have a slot with this name, fall back to __dict__
+            if has_dict:
+                continue
+            slot_name = '__dict__'
+            has_dict = True
+
+        else:
+            # field declarations would shadow the slot descriptors
+            cls_dict.pop(k, None)
+
+        if not (slot_name in existing):
+            existing.add(slot_name)
+            slots.append(slot_name)
+
+    cls_dict['__slots__'] = tuple(slots)
+
+    return True
+
+
+def _has_custom_init(cls):
+    for c in cls.__mro__:
+        if c is ComplexModelBase:
+            break
+
+        init = c.__dict__.get('__init__', None)
+        if init is not None and not getattr(init, '_is_slots_init', False):
+            return True
+
+    return False
+
+
+def _get_member_defaults(cls):
+    """Returns ``(defaults, factories)`` where ``defaults`` is a tuple of
+    ``(key, default_value)`` pairs and ``factories`` is a tuple of
+    ``(key, default_factory)`` pairs for members of ``cls`` that
+    ``_init_member`` would initialize."""
+
+    defaults = []
+    factories = []
+
+    for k, v in cls.get_flat_type_info(cls).items():
+        cls_getattr_ret = getattr(cls, k, None)
+        if isinstance(cls_getattr_ret, property) and cls_getattr_ret.fset is None:
+            continue  # we skip read-only properties
+
+        attr = v.Attributes
+        def_fac = attr.default_factory
+        if def_fac is not None:
+            if six.PY2 and hasattr(def_fac, 'im_func'):
+                def_fac = def_fac.im_func
+            factories.append((k, def_fac))
+
+        else:
+            defaults.append((k, attr.default))
+
+    return tuple(defaults), tuple(factories)
+
+
+def _gen_slots_init(cls):
+    """Returns an ``__init__`` for a class with slots that only assigns
+    default values computed here and keyword arguments. Returns ``None`` when
+    there is a custom ``__init__`` in the class hierarchy."""
+
+    if _has_custom_init(cls):
+        return None
+
+    defaults, factories = _get_member_defaults(cls)
+    settable = frozenset(k for k, v in cls.get_flat_type_info(cls).items()
+                                                  if not v.Attributes.read_only)
+
+    def __init__(self, *args, **kwargs):
+        # positional arguments are for XmlData and subclasses have their own
+        # fields. the generic initializer handles both.
+        if len(args) > 0 or self.__class__ is not cls:
+            ComplexModelBase.__init__(self, *args, **kwargs)
+            return
+
+        for k, v in defaults:
+            setattr(self, k, v)
+
+        for k, f in factories:
+            setattr(self, k, f())
+
+        for k, v in kwargs.items():
+            if not (k in settable):
+                continue
+
+            try:
+                setattr(self, k, v)
+            except AttributeError as e:
+                logger.exception(e)
+                raise AttributeError("can't set %r attribute %s to %r" %
+                                                               (cls, k, v))
+
+    __init__._is_slots_init = True
+
+    return __init__
+
+
+def _set_slots_init(cls):
+    if not cls.__dict__.get('_has_slots', False):
+        return
+
+    init = cls.__dict__.get('__init__', None)
+    if init is not None and not getattr(init, '_is_slots_init', False):
+        return
+
+    init = _gen_slots_init(cls)
+    if init is not None:
+        cls.__init__ = init
+
+
+def _gen_deserialization_factory(cls):
+    """Returns a function that creates an instance of ``cls`` from a dict of
+    deserialized member values without running the initializer, or ``None``
+    when ``cls`` instances must be created the regular way."""
+
+    # these must be honored
+    if _has_custom_init(cls) or cls.__new__ is not object.__new__ or \
+            cls.get_deserialization_instance.__func__ is not \
+               ComplexModelBase.get_deserialization_instance.__func__:
+        return None
+
+    # customized classes are not instantiated, sqlalchemy objects are
+    # initialized by sqlalchemy.
+    if cls.__orig__ is not None or hasattr(cls, '_sa_class_manager'):
+        return None
+
+    defaults, factories = _get_member_defaults(cls)
+    new = object.__new__
+
+    def _deserialization_factory(values):
+        inst = new(cls)
+
+        for k, v in defaults:
+            if not (k in values):
+                setattr(inst, k, v)
+
+        for k, f in factories:
+            if not (k in values):
+                setattr(inst, k, f())
+
+        inst._safe_set_values(values)
+
+        return inst
+
+    return _deserialization_factory
+
+
+def _update_flat_type_info(cls):
+    """(Re)computes the flat type info of ``cls`` and the tables derived from
+    it."""
+
+    fti = _get_flat_type_info(cls, TypeInfo())
+
+    inc_keys = []
+    for k, v in fti.items():
+        # placeholders like SelfReference don't have attributes
+        attrs = getattr(v, 'Attributes', None)
+        if attrs is None or not attrs.exc:
+            inc_keys.append(k)
+
+    cls._flat_type_info = fti
+    cls._flat_keys = tuple(fti.keys())
+    cls._flat_inc_keys = tuple(inc_keys)
+    cls._flat_attr_keys = tuple(fti.attrs.keys())
+
+    type_info = cls.__dict__.get('_type_info', None)
+    if isinstance(type_info, TypeInfo):
+        type_info._owner = ref(cls)
+
+
+def _on_members_changed(cls):
+    """Updates the generated methods and tables of ``cls`` and its subclasses
+    after a change in the members of ``cls``."""
+
+    # classes whose tables are not computed yet are still being built by
+    # the metaclass, which computes them when it's done.
+    if cls.__dict__.get('_flat_type_info') is None:
+        return
+
+    for c in chain((cls,), cls.get_subclasses()):
+        _update_generated_methods(c)
+
+
+def _update_generated_methods(cls):
+    """(Re)generates the methods and tables that depend on the members of
+    ``cls``. Must be called every time the members of ``cls`` change."""
+
+    _update_flat_type_info(cls)
+    _set_slots_init(cls)
+
+    cls._deserialization_factory = staticmethod(
+                                            _gen_deserialization_factory(cls))
+
+
+def _gen_voa_property(k, v, slot_name):
+    """Returns a property that validates values assigned to the ``k`` field of
+    type ``v``. The value is stored in ``slot_name`` or in the instance dict
+    when it's ``None``."""
+
+    def _check(val):
+        if not (val is None or isinstance(val, v.Value)):
+            raise ValueError("Invalid value %r, "
+                             "should be an instance of %r" % (val, v.Value))
+
+    if slot_name is None:
+        def _get_prop(self):
+            return self.__dict__[k]
+
+        def _set_prop(self, val):
+            _check(val)
+            self.__dict__[k] = val
+
+    else:
+        def _get_prop(self):
+            return getattr(self, slot_name)
+
+        def _set_prop(self, val):
+            _check(val)
+            setattr(self, slot_name, val)
+
+    return property(_get_prop, _set_prop)
+
+
+# assigning these class attributes changes the members of a class
+_MEMBER_ATTRS = frozenset(('_type_info', '_type_info_alt', '__extends__'))
+
+
 class ComplexModelMeta(with_metaclass(Prepareable, type(ModelBase))):
     """This metaclass sets ``_type_info``, ``__type_name__`` and ``__extends__``
     which are going to be used for (de)serialization and schema generation.
@@ -670,6 +976,16 @@ class ComplexModelMeta(with_metaclass(Prepareable, type(ModelBase))):
         _sanitize_type_info(cls_name, _type_info, _type_info_alt)
         _sanitize_sqlalchemy_parameters(cls_dict, attrs)
 
+        # these are computed by _update_flat_type_info() and must not be
+        # inherited.
+        cls_dict['_flat_type_info'] = None
+        cls_dict['_flat_keys'] = None
+        cls_dict['_flat_inc_keys'] = None
+        cls_dict['_flat_attr_keys'] = None
+
+        cls_dict['_has_slots'] = bool(attrs.slots) and \
+                          _gen_slots(cls_bases, cls_dict, _type_info, attrs)
+
         return super(ComplexModelMeta, cls).__new__(cls,
                                                   cls_name, cls_bases, cls_dict)
 
@@ -723,21 +1039,16 @@ class ComplexModelMeta(with_metaclass(Prepareable, type(ModelBase))):
         self._type_info.keys()[:] = new_type_info
 
         # install checkers for validation on assignment
+        has_slots = self.__dict__.get('_has_slots', False)
         for k, v in self._type_info.items():
             if not v.Attributes.validate_on_assignment:
                 continue
 
-            def _get_prop(self):
-                return self.__dict__[k]
-
-            def _set_prop(self, val):
-                if not (val is None or isinstance(val, v.Value)):
-                    raise ValueError("Invalid value %r, "
-                                 "should be an instance of %r" % (val, v.Value))
-
-                self.__dict__[k] = val
+            slot_name = None
+            if has_slots:
+                slot_name = _get_slot_name(k, v)
 
-            setattr(self, k, property(_get_prop, _set_prop))
+            setattr(self, k, _gen_voa_property(k, v, slot_name))
 
         # process member rpc methods
         methods = _gen_methods(self, cls_dict)
@@ -764,6 +1075,8 @@ class ComplexModelMeta(with_metaclass(Prepareable, type(ModelBase))):
 
             gen_sqla_info(self, cls_bases)
 
+        _update_generated_methods(self)
+
         super(ComplexModelMeta, self).__init__(cls_name, cls_bases, cls_dict)
 
     #
@@ -778,6 +1091,12 @@ class ComplexModelMeta(with_metaclass(Prepareable, type(ModelBase))):
     def __prepare__(mcs, name, bases, **kwds):
         return odict()
 
+    def __setattr__(self, key, value):
+        super(ComplexModelMeta, self).__setattr__(key, value)
+
+        if key in _MEMBER_ATTRS:
+            _on_members_changed(self)
+
 
 _is_array = lambda v: issubclass(v, Array) or (v.Attributes.max_occurs > 1)
 
@@ -788,6 +1107,25 @@ class ComplexModelBase(ModelBase):
     """
 
     __mixin__ = False
+    __slots__ = ()
+
+    _has_slots = False
+    _deserialization_factory = None
+
+    _flat_type_info = None
+    """Cache of the return value of :func:`get_flat_type_info`. Maintained
+    by the metaclass, don't modify."""
+
+    _flat_keys = None
+    """Tuple of member names in the flat type info."""
+
+    _flat_inc_keys = None
+    """Tuple of names of members in the flat type info that are not excluded
+    with ``exc=True``."""
+
+    _flat_attr_keys = None
+    """Tuple of names of members in the flat type info that are
+    :class:`XmlAttribute` instances."""
 
     class Attributes(ModelBase.Attributes):
         """ComplexModel-specific attributes"""
@@ -875,6 +1213,20 @@ class ComplexModelBase(ModelBase):
         flag. When a str/bytes/unicode value, uses that value as key wrapper
         object name."""
 
+        slots = False
+        """When ``True``, instances keep their field values in ``__slots__``
+        instead of a per-instance ``__dict__`` and get an ``__init__`` with
+        default values looked up once, at class creation. This makes instances
+        smaller and faster to create, which matters when e.g. a response has a
+        lot of small objects.
+
+        Subclasses inherit this setting. It's ignored for classes that are
+        mapped to SQLAlchemy tables. Field declarations are removed from the
+        class namespace (use ``_type_info`` instead of ``SomeClass.some_field``)
+        and fields can't be added later with :func:`append_field` or
+        :func:`insert_field`.
+        """
+
         _variants = None
         _xml_tag_body_as = None
         _delayed_child_attrs = None
@@ -907,9 +1259,15 @@ class ComplexModelBase(ModelBase):
                                 "with XmlData field. You must use keyword "
                                 "arguments in any other case.")
 
+        inst_dict = getattr(self, '__dict__', None)
         for k, v in fti.items():
             attr = v.Attributes
-            if not k in self.__dict__:
+            if inst_dict is None:
+                is_set = hasattr(self, k)
+            else:
+                is_set = k in inst_dict
+
+            if not is_set:
                 _init_member(self, k, v, attr)
 
             if k in kwargs:
@@ -930,10 +1288,15 @@ class ComplexModelBase(ModelBase):
         return retval
 
     def __repr__(self):
+        inst_dict = getattr(self, '__dict__', None)
+        if inst_dict is None or self._has_slots:
+            get = lambda k: getattr(self, k, None)
+        else:
+            get = inst_dict.get
+
         return "%s(%s)" % (self.get_type_name(), ', '.join(
-               ['%s=%r' % (k, self.__dict__.get(k))
-                    for k in self.__class__.get_flat_type_info(self.__class__)
-                    if self.__dict__.get(k, None) is not None]))
+               ['%s=%r' % (k, get(k)) for k in self.__class__._flat_keys
+                                                      if get(k) is not None]))
 
     def _safe_set(self, key, value, t, attrs):
         if attrs.read_only:
@@ -948,6 +1311,19 @@ class ComplexModelBase(ModelBase):
 
         return True
 
+    def _safe_set_values(self, values):
+        """Assigns the values in the given ``{member_name: value}`` dict in one
+        go. Values are assumed to be deserialized and validated, and read-only
+        members must already be left out."""
+
+        for k, v in values.items():
+            try:
+                setattr(self, k, v)
+            except AttributeError as e:
+                logger.exception(e)
+                raise AttributeError("can't set %r attribute %s to %r" %
+                                                   (self.__class__, k, v))
+
     @classmethod
     def get_identifiers(cls):
         for k, v in cls.get_flat_type_info(cls).items():
@@ -966,7 +1342,7 @@ class ComplexModelBase(ModelBase):
         """
 
         return dict((
-            (k, getattr(self, k)) for k in self.get_flat_type_info(self.__class__)
+            (k, getattr(self, k)) for k in self.__class__._flat_keys
             if getattr(self, k) is not None
         ))
 
@@ -990,7 +1366,7 @@ class ComplexModelBase(ModelBase):
         # (as the members are declared and passed around as sequences of
         # arguments, unlike dictionaries in a regular class definition).
         if isinstance(value, list) or isinstance(value, tuple):
-            keys = cls.get_flat_type_info(cls).keys()
+            keys = cls._flat_keys
 
             if not len(value) <= len(keys):
                 logger.error("\n\tcls: %r" "\n\tvalue: %r" "\n\tkeys: %r",
@@ -1034,6 +1410,31 @@ class ComplexModelBase(ModelBase):
             return cls()
         return cls.__orig__()
 
+    @classmethod
+    def get_deserialization_instance_from_dict(cls, ctx, values):
+        """Returns a native object that has the member values in the given
+        ``{member_name: value}`` dict and default values for the rest. The
+        values must be deserialized and validated, and read-only members must
+        already be left out.
+
+        Unless :func:`get_deserialization_instance` or ``__init__`` is
+        overridden, the instance is built without running the initializer, so
+        members that are in ``values`` are never set to their defaults.
+        """
+
+        if cls.__orig__ is not None:
+            return cls.__orig__.get_deserialization_instance_from_dict(ctx,
+                                                                         values)
+
+        factory = cls._deserialization_factory
+        if factory is not None:
+            return factory(values)
+
+        inst = cls.get_deserialization_instance(ctx)
+        inst._safe_set_values(values)
+
+        return inst
+
     @classmethod
     @memoize_id
     def get_subclasses(cls):
@@ -1046,15 +1447,23 @@ class ComplexModelBase(ModelBase):
         return retval
 
     @staticmethod
-    @memoize_ignore_none
     def get_flat_type_info(cls):
         """Returns a _type_info dict that includes members from all base
         classes.
 
         It's called a "flat" dict because it flattens all members from the
         inheritance hierarchy into one dict.
+
+        The return value is computed when the class is created and recomputed
+        every time the members of the class or its parents change. It must
+        not be modified.
         """
-        return _get_flat_type_info(cls, TypeInfo())
+
+        retval = cls._flat_type_info
+        if retval is None:
+            # the class is still being built
+            return _get_flat_type_info(cls, TypeInfo())
+        return retval
 
     @classmethod
     def get_orig(cls):
@@ -1266,9 +1675,8 @@ class ComplexModelBase(ModelBase):
 
         # we could be smarter, but customize is supposed to be called only
         # during daemon initialization, so it's not really necessary.
-        ComplexModelBase.get_subclasses.memo.clear()
-        ComplexModelBase.get_flat_type_info.memo.clear()
-        ComplexModelBase.get_simple_type_info_with_prot.memo.clear()
+        ComplexModelBase.get_subclasses.reset()
+        ComplexModelBase.get_simple_type_info_with_prot.reset()
 
         return retval
 
@@ -1282,9 +1690,16 @@ class ComplexModelBase(ModelBase):
             # _variants is only for the root class.
             retval.Attributes._variants = None
 
+    @classmethod
+    def _check_no_slots(cls, field_name):
+        if cls.__dict__.get('_has_slots', False):
+            raise TypeError("Can't add field %r to %r because its instances "
+                                              "have slots" % (field_name, cls))
+
     @classmethod
     def _append_field_impl(cls, field_name, field_type):
         assert isinstance(field_name, string_types)
+        cls._check_no_slots(field_name)
 
         dcaa = cls.Attributes._delayed_child_attrs_all
         if dcaa is not None:
@@ -1296,10 +1711,10 @@ class ComplexModelBase(ModelBase):
             if d_cust is not None:
                 field_type = field_type.customize(**d_cust)
 
+        # cls is notified about the change, see _on_members_changed()
         cls._type_info[field_name] = field_type
 
-        ComplexModelBase.get_flat_type_info.memo.clear()
-        ComplexModelBase.get_simple_type_info_with_prot.memo.clear()
+        ComplexModelBase.get_simple_type_info_with_prot.reset()
 
     @classmethod
     def _append_to_variants(cls, field_name, field_type):
@@ -1322,6 +1737,7 @@ class ComplexModelBase(ModelBase):
     def _insert_field_impl(cls, index, field_name, field_type):
         assert isinstance(index, int)
         assert isinstance(field_name, string_types)
+        cls._check_no_slots(field_name)
 
         dcaa = cls.Attributes._delayed_child_attrs_all
         if dcaa is not None:
@@ -1333,10 +1749,10 @@ class ComplexModelBase(ModelBase):
                 d_cust = dca.pop(field_name)
                 field_type = field_type.customize(**d_cust)
 
+        # cls is notified about the change, see _on_members_changed()
         cls._type_info.insert(index, (field_name, field_type))
 
-        ComplexModelBase.get_flat_type_info.memo.clear()
-        ComplexModelBase.get_simple_type_info_with_prot.memo.clear()
+        ComplexModelBase.get_simple_type_info_with_prot.reset()
 
     @classmethod
     def insert_field(cls, index, field_name, field_type):
@@ -1353,10 +1769,10 @@ class ComplexModelBase(ModelBase):
     def _replace_field_impl(cls, field_name, field_type):
         assert isinstance(field_name, string_types)
 
+        # cls is notified about the change, see _on_members_changed()
         cls._type_info[field_name] = field_type
 
-        ComplexModelBase.get_flat_type_info.memo.clear()
-        ComplexModelBase.get_simple_type_info_with_prot.memo.clear()
+        ComplexModelBase.get_simple_type_info_with_prot.reset()
 
     @classmethod
     def _replace_field(cls, field_name, field_type):
@@ -1409,6 +1825,8 @@ class ComplexModel(ComplexModelBase):
     (see :class:``spyne.model.ModelBase``).
     """
 
+    __slots__ = ()
+
 
 @add_metaclass(ComplexModelMeta)
 class Array(ComplexModelBase):
@@ -1419,8 +1837,17 @@ class Array(ComplexModelBase):
     class Attributes(ComplexModelBase.Attributes):
         _wrapper = True
 
+        native = None
+        """When not ``None``, incoming arrays of :class:`Integer` or
+        :class:`Double` values are deserialized to an ``array.array``
+        (``'array'``) or a NumPy array (``'numpy'``) instead of a list. Null
+        values are not allowed in such arrays."""
+
     def __new__(cls, serializer, member_name=None, wrapped=True, **kwargs):
         if not wrapped:
+            if kwargs.get('native', None) is not None:
+                raise ValueError("Native arrays must be wrapped")
+
             if serializer.Attributes.max_occurs == 1:
                 kwargs['max_occurs'] = 'unbounded'
 
@@ -1443,6 +1870,9 @@ class Array(ComplexModelBase):
         if tn is not None:
             retval.__type_name__ = tn
 
+        # fail early on invalid native array configurations
+        retval.get_native_typecode()
+
         return retval
 
     @classmethod
@@ -1532,6 +1962,49 @@ class Array(ComplexModelBase):
     def get_inner_type(cls):
         return next(iter(cls._type_info.values()))
 
+    @classmethod
+    def get_native_typecode(cls):
+        """Returns the :mod:`array` typecode, which is also a valid NumPy
+        dtype, for storing the values of this array when its ``native``
+        attribute is set. Returns ``None`` otherwise."""
+
+        native = cls.Attributes.native
+        if native is None:
+            return None
+
+        if not (native in NATIVE_ARRAY_TYPES):
+            raise ValueError("native=%r is not one of %r" %
+                                                   (native, NATIVE_ARRAY_TYPES))
+
+        serializer = cls.get_inner_type()
+        if issubclass(serializer, Double):
+            return 'd'
+
+        if not issubclass(serializer, Integer):
+            raise ValueError("Only arrays of Integer or Double values can "
+                                             "be native, not %r" % serializer)
+
+        max_bound = getattr(serializer.Attributes, 'max_bound', None)
+        if issubclass(serializer, UnsignedInteger):
+            typecodes = _UNSIGNED_TYPECODES
+        else:
+            typecodes = _SIGNED_TYPECODES
+
+        if max_bound is not None:
+            for typecode, bound in typecodes:
+                if max_bound <= bound:
+                    return typecode
+
+        return typecodes[-1][0]
+
+
+NATIVE_ARRAY_TYPES = ('array', 'numpy')
+
+_SIGNED_TYPECODES = (('b', 2 ** 7 - 1), ('h', 2 ** 15 - 1),
+                                      ('i', 2 ** 31 - 1), ('q', 2 ** 63 - 1))
+_UNSIGNED_TYPECODES = (('B', 2 ** 8 - 1), ('H', 2 ** 16 - 1),
+                                      ('I', 2 ** 32 - 1), ('Q', 2 ** 64 - 1))
+
 
 class Iterable(Array):
     """This class generates a ``ComplexModel`` child that has one attribute that
@@ -0,0 +1,150 @@
+
+#
+# spyne - Copyright (C) Spyne contributors.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301
+#
+
+"""The ``spyne.protocol._attrcache`` module contains the per-protocol cache of
+class attributes that backs :func:`ProtocolMixin.get_cls_attrs`."""
+
+import logging
+logger = logging.getLogger(__name__)
+
+from weakref import ref
+
+from spyne.util import DefaultAttrDict
+
+
+META_ATTR = ['nullable', 'default_factory']
+
+
+def get_reachable_classes(classes):
+    """Returns a list of the given classes and everything reachable from them
+    through member, array and attribute types."""
+
+    from spyne.model import ComplexModelBase, XmlAttribute
+
+    retval = []
+    seen = set()
+    queue = list(classes)
+
+    while len(queue) > 0:
+        cls = queue.pop()
+        if cls is None or id(cls) in seen:
+            continue
+        seen.add(id(cls))
+
+        if not hasattr(cls, 'Attributes'):
+            continue
+
+        retval.append(cls)
+
+        if issubclass(cls, XmlAttribute):
+            queue.append(cls.type)
+
+        elif issubclass(cls, ComplexModelBase):
+            queue.extend(cls._type_info.values())
+
+            extends = getattr(cls, '__extends__', None)
+            if extends is not None:
+                queue.append(extends)
+
+    return retval
+
+
+class AttrCache(object):
+    """Maps classes to the merged attribute dicts a protocol sees for them.
+
+    Entries are keyed on ``id(cls)`` so that a lookup is one plain dict hit.
+    Entries are evicted by a weakref callback when their class is garbage
+    collected, so dynamically customized classes don't leak and ids can't
+    alias.
+
+    Hits are only counted when stats are enabled via
+    :func:`ProtocolMixin.enable_attrcache_stats`, misses and prewarmed entries
+    are always counted.
+    """
+
+    def __init__(self):
+        self.data = {}
+        self.refs = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.prewarmed = 0
+
+    def __len__(self):
+        return len(self.data)
+
+    def __contains__(self, cls):
+        return id(cls) in self.data
+
+    def build(self, prot, cls):
+        """Computes, stores and returns the attribute dict of ``cls`` as seen
+        by ``prot``."""
+
+        retval = DefaultAttrDict([
+                (k, getattr(cls.Attributes, k))
+                        for k in dir(cls.Attributes) + META_ATTR
+                                                     if not k.startswith('__')])
+
+        if cls.Attributes.prot_attrs:
+            cls_attrs = cls.Attributes.prot_attrs.get(prot.__class__, {})
+            retval.update(cls_attrs)
+
+            inst_attrs = cls.Attributes.prot_attrs.get(prot, {})
+            retval.update(inst_attrs)
+
+        key = id(cls)
+        data = self.data
+
+        def _evict(_, key=key):
+            data.pop(key, None)
+            self.refs.pop(key, None)
+
+        self.refs[key] = ref(cls, _evict)
+        data[key] = retval
+
+        return retval
+
+    def miss(self, prot, cls):
+        self.misses += 1
+        return self.build(prot, cls)
+
+    def prewarm(self, prot, classes):
+        """Builds entries for the given classes and everything reachable from
+        them through member, array and attribute types."""
+
+        classes = get_reachable_classes(classes)
+        for cls in classes:
+            if not (id(cls) in self.data):
+                self.build(prot, cls)
+                self.prewarmed += 1
+
+        logger.debug("%r: prewarmed attribute cache with %d classes",
+                                                           prot, len(classes))
+
+    def clear(self):
+        self.data.clear()
+        self.refs.clear()
+
+    def get_stats(self):
+        return dict(
+            size=len(self.data),
+            hits=self.hits,
+            misses=self.misses,
+            prewarmed=self.prewarmed,
+        )
@@ -29,7 +29,9 @@ from spyne import ProtocolContext, EventManager
 from spyne.const import DEFAULT_LOCALE
 from spyne.model import Array
 from spyne.error import ResourceNotFoundError
-from spyne.util import DefaultAttrDict
+from spyne.protocol._attrcache import AttrCache, META_ATTR, \
+    get_reachable_classes
+from spyne.util.cdict import cdict
 from six import string_types
 
 
@@ -57,6 +59,9 @@ class ProtocolMixin(object):
 
     def __init__(self, app=None, mime_type=None, ignore_wrappers=None,
                                     binary_encoding=None, string_encoding=None):
+        self._attrcache = AttrCache()
+        self._sortcache = WeakKeyDictionary()
+
         self.__app = None
         self.set_app(app)
 
@@ -73,9 +78,6 @@ class ProtocolMixin(object):
         if mime_type is not None:
             self.mime_type = mime_type
 
-        self._attrcache = WeakKeyDictionary()
-        self._sortcache = WeakKeyDictionary()
-
     def _cast(self, cls_attrs, inst):
         if cls_attrs.parser is not None:
             return cls_attrs.parser(inst)
@@ -177,6 +179,71 @@ class ProtocolMixin(object):
                                    "to: %r" % self.__app
         self.__app = value
 
+        if value is not None:
+            self.prewarm_attrcache()
+
+    def _get_interface_classes(self):
+        interface = getattr(self.__app, 'interface', None)
+        if interface is None:
+            return None
+        return interface.classes.values()
+
+    def prewarm_attrcache(self, classes=None):
+        """Fills the attribute cache for the given classes and every class
+        reachable from them. Defaults to all classes in the interface of the
+        parent application. Called by :func:`set_app`.
+        """
+
+        if classes is None:
+            classes = self._get_interface_classes()
+            if classes is None:
+                return
+
+        self._attrcache.prewarm(self, classes)
+
+    def finalize_handlers(self, classes=None):
+        """Precomputes the entries for the given classes and every class
+        reachable from them in the handler tables of this protocol instance
+        and makes the tables immutable. Defaults to all classes in the
+        interface of the parent application. Called by
+        :func:`spyne.application.Application.reinitialize` when the first
+        server transport is created for the application, so handlers can
+        still be customized after the protocol is constructed.
+
+        Classes that are not known at this point (e.g. polymorphic subclasses
+        or customizations created at runtime) are still resolved on first
+        lookup, without modifying the tables.
+        """
+
+        if classes is None:
+            classes = self._get_interface_classes()
+            if classes is None:
+                return
+
+        classes = get_reachable_classes(classes)
+
+        for v in list(self.__dict__.values()):
+            if isinstance(v, cdict):
+                v.freeze(classes)
+
+    def get_attrcache_stats(self):
+        """Returns a dict with ``size``, ``hits``, ``misses`` and ``prewarmed``
+        keys describing the state of the attribute cache of this protocol
+        instance. ``hits`` is only counted after
+        :func:`enable_attrcache_stats` is called."""
+
+        return self._attrcache.get_stats()
+
+    def enable_attrcache_stats(self):
+        """Start counting attribute cache hits. This makes every
+        :func:`get_cls_attrs` call a bit more expensive, so it's off by default.
+        """
+
+        self.get_cls_attrs = self._get_cls_attrs_counted
+
+    def disable_attrcache_stats(self):
+        self.__dict__.pop('get_cls_attrs', None)
+
     @staticmethod
     def issubclass(sub, cls):
         suborig = getattr(sub, '__orig__', None)
@@ -185,25 +252,16 @@ class ProtocolMixin(object):
                           cls if clsorig is None else clsorig)
 
     def get_cls_attrs(self, cls):
-        logger.debug("%r attrcache size: %d", self, len(self._attrcache))
-        attr = self._attrcache.get(cls, None)
-        if attr is not None:
-            return attr
-
-        self._attrcache[cls] = attr = DefaultAttrDict([
-                (k, getattr(cls.Attributes, k))
-                        for k in dir(cls.Attributes) + META_ATTR
-                                                     if not k.startswith('__')])
-
-        if cls.Attributes.prot_attrs:
-            cls_attrs = cls.Attributes.prot_attrs.get(self.__class__, {})
-            # logger.debug("%r cls attr %r", cls, cls_attrs)
-            attr.update(cls_attrs)
-
-            inst_attrs = cls.Attributes.prot_attrs.get(self, {})
-            # logger.debug("%r inst attr %r", cls, cls_attrs)
-            attr.update(inst_attrs)
+        attr = self._attrcache.data.get(id(cls), None)
+        if attr is None:
+            return self._attrcache.miss(self, cls)
+        return attr
 
+    def _get_cls_attrs_counted(self, cls):
+        attr = self._attrcache.data.get(id(cls), None)
+        if attr is None:
+            return self._attrcache.miss(self, cls)
+        self._attrcache.hits += 1
         return attr
 
     def get_context(self, parent, transport):
@@ -414,5 +472,3 @@ class ProtocolMixin(object):
 
         return items
 
-
-META_ATTR = ['nullable', 'default_factory']
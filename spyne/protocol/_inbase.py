@@ -26,6 +26,7 @@ import re
 import pytz
 import uuid
 
+from array import array
 from math import modf
 from time import strptime, mktime
 from datetime import timedelta, time, datetime, date
@@ -40,6 +41,11 @@ except ImportError:
     etree = None
     html = None
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from spyne.protocol._base import ProtocolMixin
 from spyne.model import ModelBase, XmlAttribute, Array, Null, \
     ByteArray, File, ComplexModelBase, AnyXml, AnyHtml, Unicode, String, \
@@ -580,6 +586,83 @@ class InProtocolBase(ProtocolMixin):
 
         return retval
 
+    def native_array_from_list(self, cls, values):
+        """Returns the given list of deserialized values as an instance of the
+        native array type that the given :class:`Array` subclass requests via
+        its ``native`` attribute."""
+
+        typecode = cls.get_native_typecode()
+
+        if None in values:
+            raise ValidationError(None, "Native arrays can't contain nulls")
+
+        try:
+            if cls.Attributes.native == 'numpy':
+                if numpy is None:
+                    raise ImportError("NumPy is needed for native='numpy'")
+                return numpy.array(values, dtype=typecode)
+
+            return array(typecode, values)
+
+        except (OverflowError, TypeError, ValueError) as e:
+            raise ValidationError(values, "%%r: %r" % e)
+
+    def native_array_from_numbers(self, cls, values):
+        """Deserializes a sequence of numbers that come from a document that
+        has native number types (e.g. json) to a native array in one go.
+
+        Returns ``None`` when the values need to go through the regular
+        deserializer one by one. As the values are not validated, it's the
+        caller's responsibility to do so when needed."""
+
+        serializer = cls.get_inner_type()
+        if self.get_cls_attrs(serializer).parser is not None:
+            return None
+
+        if issubclass(serializer, Double):
+            types = _DOUBLE_TYPES
+        else:
+            types = _INTEGER_TYPES
+
+        if not (set(map(type, values)) <= types):
+            return None
+
+        return self.native_array_from_list(cls, values)
+
+    def native_array_from_strings(self, cls, values):
+        """Deserializes a list of strings to a native array in one go.
+
+        Returns ``None`` when the values need to go through the regular
+        deserializer one by one. As the values are not validated, it's the
+        caller's responsibility to do so when needed."""
+
+        serializer = cls.get_inner_type()
+        cls_attrs = self.get_cls_attrs(serializer)
+        if cls_attrs.parser is not None:
+            return None
+
+        handler = self._from_unicode_handlers[serializer]
+        handler = getattr(handler, '__func__', handler)
+        if handler is _DOUBLE_FROM_BYTES:
+            native_type = float
+
+        elif handler is _INTEGER_FROM_BYTES:
+            native_type = int
+            max_str_len = cls_attrs.max_str_len
+            if max_str_len is not None and len(values) > 0 and \
+                                     max(map(len, values)) > max_str_len:
+                return None
+
+        else:
+            return None
+
+        try:
+            values = list(map(native_type, values))
+        except (TypeError, ValueError) as e:
+            raise ValidationError(values, "%%r: %r" % e)
+
+        return self.native_array_from_list(cls, values)
+
     def xmlattribute_from_bytes(self, cls, value):
         return self.from_bytes(cls.type, value)
 
@@ -716,3 +799,12 @@ def _file_to_iter(f):
 
     finally:
         f.close()
+
+
+_DOUBLE_TYPES = frozenset(six.integer_types + (float,))
+_INTEGER_TYPES = frozenset(six.integer_types)
+
+_DOUBLE_FROM_BYTES = getattr(InProtocolBase.double_from_bytes, '__func__',
+                                             InProtocolBase.double_from_bytes)
+_INTEGER_FROM_BYTES = getattr(InProtocolBase.integer_from_bytes, '__func__',
+                                             InProtocolBase.integer_from_bytes)
@@ -0,0 +1,313 @@
+#
+# spyne - Copyright (C) Spyne contributors.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301
+#
+
+"""The ``spyne.protocol._jsonbackend`` module contains wrappers around the json
+libraries that :class:`spyne.protocol.json.JsonDocument` can use. The standard
+library (or ``simplejson``, when it's installed) is always available, ``orjson``
+and ``ujson`` are used only when installed."""
+
+from __future__ import absolute_import
+
+import logging
+logger = logging.getLogger(__name__)
+
+from uuid import UUID
+from datetime import date, datetime
+
+try:
+    import simplejson as json
+    from simplejson.decoder import JSONDecodeError
+except ImportError:
+    import json
+    JSONDecodeError = ValueError
+
+try:
+    from datetime import timezone
+    _utc = timezone.utc
+except ImportError:  # Python 2
+    _utc = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+def _iterable_default(o):
+    # the same fallback as JsonEncoder: if it can't be serialized, it's
+    # possibly a generator.
+    try:
+        return list(o)
+    except TypeError:
+        raise TypeError("%r is not JSON serializable" % (o,))
+
+
+class JsonBackend(object):
+    """Base class for json libraries. ``kwargs`` are the keyword arguments that
+    were passed to the ``JsonDocument`` constructor. Backends that don't use
+    the standard library translate the ones they can and ignore the rest."""
+
+    name = None
+
+    accepts_bytes = False
+    """Whether ``loads()`` can be passed utf-8 encoded buffers as-is."""
+
+    decode_errors = (ValueError,)
+    """The exceptions ``loads()`` raises for invalid documents."""
+
+    def __init__(self):
+        self.native_types = self.probe_native_types()
+        """The types that this backend serializes exactly like Spyne's default
+        ``to_unicode`` handlers would, so conversion can be skipped."""
+
+    def loads(self, s, kwargs):
+        raise NotImplementedError()
+
+    def dumps(self, o, kwargs):
+        """Returns the json document for ``o`` as a unicode string."""
+
+        raise NotImplementedError()
+
+    def dumps_bytes(self, o, kwargs, encoding):
+        """Returns the json document for ``o`` as an encoded byte string."""
+
+        return self.dumps(o, kwargs).encode(encoding)
+
+    def probe_native_types(self):
+        samples = [
+            (date, date(2001, 2, 3)),
+            (UUID, UUID(int=0x1234)),
+        ]
+
+        if _utc is not None:
+            samples.append((datetime, datetime(2001, 2, 3, 4, 5, 6, 7)))
+            samples.append((datetime, datetime(2001, 2, 3, 4, 5, 6,
+                                                                 tzinfo=_utc)))
+
+        retval = set()
+        failed = set()
+        for cls, value in samples:
+            if isinstance(value, UUID):
+                expected = str(value)
+            else:
+                expected = value.isoformat()
+
+            try:
+                ok = json.loads(self.dumps([value], {})) == [expected]
+            except Exception:
+                ok = False
+
+            if ok:
+                retval.add(cls)
+            else:
+                failed.add(cls)
+
+        return frozenset(retval - failed)
+
+    def __repr__(self):
+        return "%s()" % (self.__class__.__name__,)
+
+
+class StdlibJsonBackend(JsonBackend):
+    """Uses ``simplejson`` when it's installed, the ``json`` module from the
+    standard library otherwise. All keyword arguments are supported."""
+
+    name = 'json'
+    decode_errors = (JSONDecodeError,)
+
+    def loads(self, s, kwargs):
+        return json.loads(s, **kwargs)
+
+    def dumps(self, o, kwargs):
+        return json.dumps(o, **kwargs)
+
+    def probe_native_types(self):
+        return frozenset()
+
+
+class OrjsonBackend(JsonBackend):
+    """Uses ``orjson``. Only the ``indent`` and ``sort_keys`` keyword arguments
+    are supported. Output is always compact and not ascii-escaped.
+
+    orjson can only indent by 2 spaces and can't serialize integers that don't
+    fit in 64 bits, so documents with any other indent value or with such
+    integers are serialized by the standard library instead, with all keyword
+    arguments honored."""
+
+    name = 'orjson'
+    accepts_bytes = True
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("orjson is not installed")
+
+        self.decode_errors = (orjson.JSONDecodeError,)
+
+        super(OrjsonBackend, self).__init__()
+
+    @staticmethod
+    def _get_option(kwargs):
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get('sort_keys', False):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent', None) is not None:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    @staticmethod
+    def _dumps_fallback(o, kwargs, converted):
+        # iterables that orjson already consumed can't be iterated again, so
+        # their contents are looked up by id.
+        def _default(obj):
+            retval = converted.get(id(obj), None)
+            if retval is not None:
+                return retval[1]
+            return _iterable_default(obj)
+
+        return json.dumps(o, **dict(kwargs, default=_default))
+
+    def _dumps(self, o, kwargs):
+        converted = {}
+
+        indent = kwargs.get('indent', None)
+        if indent is not None and indent != 2:
+            return self._dumps_fallback(o, kwargs, converted)
+
+        def _default(obj):
+            retval = _iterable_default(obj)
+            converted[id(obj)] = (obj, retval)
+            return retval
+
+        try:
+            return orjson.dumps(o, default=_default,
+                                                option=self._get_option(kwargs))
+
+        except TypeError as e:
+            logger.debug("orjson can't serialize %r (%s), falling back to %r",
+                                                    type(o), e, json.__name__)
+            return self._dumps_fallback(o, kwargs, converted)
+
+    def loads(self, s, kwargs):
+        return orjson.loads(s)
+
+    def dumps(self, o, kwargs):
+        retval = self._dumps(o, kwargs)
+        if isinstance(retval, bytes):
+            return retval.decode('utf8')
+        return retval
+
+    def dumps_bytes(self, o, kwargs, encoding):
+        retval = self._dumps(o, kwargs)
+        if not isinstance(retval, bytes):
+            return retval.encode(encoding)
+
+        if encoding.lower().replace('-', '').replace('_', '') == 'utf8':
+            return retval
+
+        return retval.decode('utf8').encode(encoding)
+
+
+class UjsonBackend(JsonBackend):
+    """Uses ``ujson``. The ``indent``, ``sort_keys`` and ``ensure_ascii``
+    keyword arguments are supported."""
+
+    name = 'ujson'
+    accepts_bytes = True
+
+    def __init__(self):
+        if ujson is None:
+            raise ImportError("ujson is not installed")
+
+        self.decode_errors = (ValueError,)
+
+        super(UjsonBackend, self).__init__()
+
+    @staticmethod
+    def _get_kwargs(kwargs):
+        retval = dict(escape_forward_slashes=False,
+                                                  default=_iterable_default)
+
+        for k in ('indent', 'sort_keys', 'ensure_ascii'):
+            v = kwargs.get(k, None)
+            if v is not None:
+                retval[k] = v
+
+        return retval
+
+    def loads(self, s, kwargs):
+        if isinstance(s, (bytearray, memoryview)):
+            s = bytes(s)
+        return ujson.loads(s)
+
+    def dumps(self, o, kwargs):
+        return ujson.dumps(o, **self._get_kwargs(kwargs))
+
+
+JSON_BACKENDS = (
+    ('orjson', OrjsonBackend),
+    ('ujson', UjsonBackend),
+    ('json', StdlibJsonBackend),
+)
+"""Known backends, fastest first."""
+
+_backends = {}
+
+
+def get_json_backend(backend=None):
+    """Returns a :class:`JsonBackend` instance.
+
+    :param backend: ``None`` or ``'json'`` for the standard library, ``'auto'``
+        for the fastest backend that's installed, the name of a backend or a
+        :class:`JsonBackend` instance.
+    """
+
+    if isinstance(backend, JsonBackend):
+        return backend
+
+    if backend is None:
+        backend = 'json'
+
+    retval = _backends.get(backend, None)
+    if retval is not None:
+        return retval
+
+    if backend == 'auto':
+        for name, cls in JSON_BACKENDS:
+            try:
+                retval = get_json_backend(name)
+            except ImportError:
+                continue
+            break
+
+    else:
+        for name, cls in JSON_BACKENDS:
+            if name == backend:
+                retval = cls()
+                break
+        else:
+            raise ValueError("Unknown json backend %r" % (backend,))
+
+    logger.debug("Using json backend %r for %r", retval, backend)
+
+    _backends[backend] = retval
+    return retval
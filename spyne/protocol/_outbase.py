@@ -149,6 +149,36 @@ class OutProtocolBase(ProtocolMixin):
             ComplexModelBase: self.complex_model_to_bytes_iterable,
         })
 
+        # Maps the functions of the scalar to_bytes and to_unicode handlers to
+        # functions that take a class and return a callable that serializes a
+        # whole sequence of values of that class, or None when the class
+        # attributes require going through the scalar handler. As the keys are
+        # the functions that are defined here, the bulk handlers are not used
+        # when a subclass overrides a scalar handler. See get_bulk_handler.
+        self._bulk_handlers = {
+            _func(OutProtocolBase.integer_to_bytes): self.integer_to_bytes_bulk,
+            _func(OutProtocolBase.integer_to_unicode):
+                                                   self.integer_to_unicode_bulk,
+            _func(OutProtocolBase.double_to_bytes): self.double_to_bytes_bulk,
+            _func(OutProtocolBase.double_to_unicode):
+                                                    self.double_to_unicode_bulk,
+            _func(OutProtocolBase.decimal_to_bytes): self.decimal_to_bytes_bulk,
+            _func(OutProtocolBase.decimal_to_unicode):
+                                                   self.decimal_to_unicode_bulk,
+            _func(OutProtocolBase.boolean_to_bytes): self.boolean_to_bytes_bulk,
+            _func(OutProtocolBase.boolean_to_unicode):
+                                                   self.boolean_to_unicode_bulk,
+            _func(OutProtocolBase.datetime_to_bytes):
+                                                    self.datetime_to_bytes_bulk,
+            _func(OutProtocolBase.datetime_to_unicode):
+                                                  self.datetime_to_unicode_bulk,
+            _func(OutProtocolBase.date_to_bytes): self.date_to_bytes_bulk,
+            _func(OutProtocolBase.date_to_unicode): self.date_to_unicode_bulk,
+            _func(OutProtocolBase.unicode_to_bytes): self.unicode_to_bytes_bulk,
+            _func(OutProtocolBase.unicode_to_unicode):
+                                                   self.unicode_to_unicode_bulk,
+        }
+
 
     def serialize(self, ctx, message):
         """Serializes ``ctx.out_object``.
@@ -225,6 +255,47 @@ class OutProtocolBase(ProtocolMixin):
 
         return retval
 
+    def get_bulk_handler(self, handlers, cls):
+        """Returns a callable that takes a sequence of values of ``cls`` and
+        returns a list with the result of serializing every value using the
+        given handler table (e.g. ``self._to_unicode_handlers``), or ``None``
+        when values of ``cls`` can't be serialized in bulk.
+
+        The sequence can be anything that supports ``len()`` and iteration,
+        like a ``list``, an ``array.array`` or a NumPy array. ``None`` values
+        are passed through. It's the caller's responsibility to apply
+        ``sanitizer``, ``out_type`` and friends."""
+
+        handler = handlers.get(cls, None)
+        if handler is None:
+            return None
+
+        bulk = self._bulk_handlers.get(_func(handler), None)
+        if bulk is None:
+            return None
+
+        return bulk(cls)
+
+    def to_bytes_bulk(self, cls, values):
+        """Returns a list with the results of :func:`to_bytes` for every value
+        in the given sequence, or ``None`` when ``cls`` can't be serialized in
+        bulk. See :func:`get_bulk_handler`."""
+
+        handler = self.get_bulk_handler(self._to_bytes_handlers, cls)
+        if handler is None:
+            return None
+        return handler(values)
+
+    def to_unicode_bulk(self, cls, values):
+        """Returns a list with the results of :func:`to_unicode` for every
+        value in the given sequence, or ``None`` when ``cls`` can't be
+        serialized in bulk. See :func:`get_bulk_handler`."""
+
+        handler = self.get_bulk_handler(self._to_unicode_handlers, cls)
+        if handler is None:
+            return None
+        return handler(values)
+
     def to_bytes_iterable(self, cls, value):
         if value is None:
             return []
@@ -300,6 +371,38 @@ class OutProtocolBase(ProtocolMixin):
 
         return retval
 
+    def unicode_to_bytes_bulk(self, cls):
+        cls_attrs = self.get_cls_attrs(cls)
+        if cls_attrs.str_format is not None or cls_attrs.format is not None:
+            return None
+
+        encoding = cls_attrs.encoding
+        if encoding is None:
+            encoding = self.default_string_encoding
+        if encoding is None:
+            return None
+
+        def _unicode_bulk(values):
+            values = _to_list(values)
+            if set(map(type, values)) <= _UNICODE_TYPES:
+                return _map_not_none(lambda v: v.encode(encoding), values)
+            return [self.to_bytes(cls, v) for v in values]
+
+        return _unicode_bulk
+
+    def unicode_to_unicode_bulk(self, cls):
+        cls_attrs = self.get_cls_attrs(cls)
+        if cls_attrs.str_format is not None or cls_attrs.format is not None:
+            return None
+
+        def _unicode_bulk(values):
+            values = _to_list(values)
+            if set(map(type, values)) <= _UNICODE_TYPES:
+                return values
+            return [self.to_unicode(cls, v) for v in values]
+
+        return _unicode_bulk
+
     def any_uri_to_unicode(self, cls, value, **_):
         return self.unicode_to_unicode(cls, value, **_)
 
@@ -368,6 +471,41 @@ class OutProtocolBase(ProtocolMixin):
 
         return str(value)
 
+    def _get_number_format(self, cls_attrs, default):
+        if cls_attrs.str_format is not None:
+            return cls_attrs.str_format.format
+        elif cls_attrs.format is not None:
+            return cls_attrs.format.__mod__
+        return default
+
+    def _gen_number_bulk(self, cls, types, check, default):
+        fmt = self._get_number_format(self.get_cls_attrs(cls), default)
+
+        def _number_bulk(values):
+            values = _to_list(values)
+            _sanity_check(values, types, check)
+            return _map_not_none(fmt, values)
+
+        return _number_bulk
+
+    def decimal_to_bytes_bulk(self, cls):
+        return _encode_bulk(self.decimal_to_unicode_bulk(cls), 'utf8')
+
+    def decimal_to_unicode_bulk(self, cls):
+        return self._gen_number_bulk(cls, _DECIMAL_TYPES, D, str)
+
+    def double_to_bytes_bulk(self, cls):
+        return _encode_bulk(self.double_to_unicode_bulk(cls), 'utf8')
+
+    def double_to_unicode_bulk(self, cls):
+        return self._gen_number_bulk(cls, _DOUBLE_TYPES, float, repr)
+
+    def integer_to_bytes_bulk(self, cls):
+        return _encode_bulk(self.integer_to_unicode_bulk(cls), 'utf8')
+
+    def integer_to_unicode_bulk(self, cls):
+        return self._gen_number_bulk(cls, _INTEGER_TYPES, int, str)
+
     def time_to_bytes(self, cls, value, **kwargs):
         return self.time_to_unicode(cls, value, **kwargs)
 
@@ -406,6 +544,57 @@ class OutProtocolBase(ProtocolMixin):
 
         return _datetime_smap[sa](cls, val)
 
+    def date_to_bytes_bulk(self, cls):
+        return _encode_bulk(self.date_to_unicode_bulk(cls), 'utf8')
+
+    def date_to_unicode_bulk(self, cls):
+        cls_attrs = self.get_cls_attrs(cls)
+
+        sa = cls_attrs.serialize_as
+        if not (sa is None or sa in (str, 'str')):
+            return None
+
+        if not (cls_attrs.date_format is None and
+                        cls_attrs.str_format is None and cls_attrs.format is None):
+            return None
+
+        def _isoformat(val):
+            if isinstance(val, datetime):
+                val = val.date()
+            return val.isoformat()
+
+        return lambda values: _map_not_none(_isoformat, _to_list(values))
+
+    def datetime_to_bytes_bulk(self, cls):
+        return _encode_bulk(self.datetime_to_unicode_bulk(cls), 'ascii')
+
+    def datetime_to_unicode_bulk(self, cls):
+        cls_attrs = self.get_cls_attrs(cls)
+
+        sa = cls_attrs.serialize_as
+        if not (sa is None or sa in (six.text_type, str, 'str')):
+            return None
+
+        if not (self._get_datetime_format(cls_attrs) is None and
+                                     cls_attrs.string_format is None and
+                                     cls_attrs.str_format is None and
+                                     cls_attrs.interp_format is None):
+            return None
+
+        as_timezone = cls_attrs.as_timezone
+        keep_timezone = cls_attrs.timezone
+
+        def _isoformat(value):
+            if as_timezone is not None and value.tzinfo is not None:
+                value = value.astimezone(as_timezone)
+
+            if not keep_timezone:
+                value = value.replace(tzinfo=None)
+
+            return value.isoformat()
+
+        return lambda values: _map_not_none(_isoformat, _to_list(values))
+
     def duration_to_bytes(self, cls, value, **_):
         return self.duration_to_unicode(cls, value, **_).encode("utf8")
 
@@ -454,6 +643,14 @@ class OutProtocolBase(ProtocolMixin):
 
         return ''.join(retval)
 
+    def boolean_to_bytes_bulk(self, cls):
+        return lambda values: _map_not_none(_BOOL_BYTES.__getitem__,
+                                                  _to_list(values), bool)
+
+    def boolean_to_unicode_bulk(self, cls):
+        return lambda values: _map_not_none(_BOOL_UNICODE.__getitem__,
+                                                  _to_list(values), bool)
+
     def boolean_to_bytes(self, cls, value, **_):
         return str(bool(value)).lower().encode('ascii')
 
@@ -777,6 +974,74 @@ class OutProtocolBase(ProtocolMixin):
         return s
 
 
+def _func(handler):
+    """Returns the function behind the given (possibly bound) method."""
+
+    return getattr(handler, '__func__', handler)
+
+
+def _to_list(values):
+    """Returns the given sequence as a list of native Python objects. NumPy
+    arrays and ``array.array`` instances are converted in one go by their
+    ``tolist()`` methods."""
+
+    if isinstance(values, list):
+        return values
+
+    tolist = getattr(values, 'tolist', None)
+    if tolist is not None:
+        return tolist()
+
+    return list(values)
+
+
+def _map_not_none(func, values, check=None):
+    """Returns ``[func(v) for v in values]``, leaving ``None`` values as they
+    are. When given, ``check`` is applied to each value before ``func``."""
+
+    if check is not None:
+        if None in values:
+            return [None if v is None else func(check(v)) for v in values]
+        return [func(check(v)) for v in values]
+
+    if None in values:
+        return [None if v is None else func(v) for v in values]
+    return list(map(func, values))
+
+
+def _sanity_check(values, types, check):
+    """Calls ``check`` on every non-``None`` value unless the types of all
+    values are in ``types``, in which case it would be pointless."""
+
+    for t in set(map(type, values)):
+        if not (t in types):
+            for v in values:
+                if v is not None:
+                    check(v)
+            return
+
+
+def _encode_bulk(bulk, encoding):
+    if bulk is None:
+        return None
+
+    def _encoded_bulk(values):
+        return _map_not_none(lambda v: v.encode(encoding), bulk(values))
+
+    return _encoded_bulk
+
+
+_NONE_TYPE = type(None)
+_INTEGER_TYPES = frozenset(six.integer_types + (bool, _NONE_TYPE))
+_DOUBLE_TYPES = frozenset(six.integer_types + (float, bool, _NONE_TYPE))
+_DECIMAL_TYPES = frozenset(six.integer_types + (D, bool, _NONE_TYPE))
+
+_UNICODE_TYPES = frozenset((six.text_type, _NONE_TYPE))
+
+_BOOL_BYTES = {True: b'true', False: b'false'}
+_BOOL_UNICODE = {True: u'true', False: u'false'}
+
+
 _uuid_serialize = {
     None: str,
     str: str,
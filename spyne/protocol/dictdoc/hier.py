@@ -40,6 +40,52 @@ from spyne.model import ByteArray, File, Fault, ComplexModelBase, Array, Any, \
 from spyne.protocol.dictdoc import DictDocument
 
 
+class LazyArray(object):
+    """Stands for an array in an outgoing document whose items are only
+    generated when the document is written. See
+    :attr:`HierDictDocument.stream_output`."""
+
+    __slots__ = ('items',)
+
+    def __init__(self, items):
+        self.items = items
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __repr__(self):
+        return "%s(%r)" % (self.__class__.__name__, self.items)
+
+
+class LazyDict(object):
+    """Stands for a dict in an outgoing document that has :class:`LazyArray`
+    instances somewhere inside it."""
+
+    __slots__ = ('dict',)
+
+    def __init__(self, d):
+        self.dict = d
+
+    def items(self):
+        return self.dict.items()
+
+    def values(self):
+        return self.dict.values()
+
+    def __repr__(self):
+        return "%s(%r)" % (self.__class__.__name__, self.dict)
+
+
+_LAZY_TYPES = (LazyArray, LazyDict)
+
+
+def _has_lazy(values):
+    for v in values:
+        if isinstance(v, _LAZY_TYPES):
+            return True
+    return False
+
+
 class HierDictDocument(DictDocument):
     """This protocol contains logic for protocols that serialize and deserialize
     hierarchical dictionaries. Examples include: Json, MessagePack and Yaml.
@@ -50,6 +96,14 @@ class HierDictDocument(DictDocument):
     VALID_UNICODE_SOURCES = (six.text_type, six.binary_type, memoryview,
                                                                 mmap, bytearray)
 
+    stream_output = False
+    """When ``True``, arrays whose values are not lists or tuples (e.g.
+    generators) are put in the outgoing document as :class:`LazyArray`
+    instances instead of being consumed during serialization. Containers with
+    lazy values in them are wrapped in :class:`LazyArray` or :class:`LazyDict`
+    instances as well, everything else is left as-is. Only protocols whose
+    ``create_out_string()`` knows how to write those can set this."""
+
     from_serstr = DictDocument.from_unicode
     to_serstr = DictDocument.to_unicode
 
@@ -257,10 +311,22 @@ class HierDictDocument(DictDocument):
             if not isinstance(doc, AbcIterable):
                 raise ValidationError(doc)
 
+            native = cls.Attributes.native is not None
+            if native and validator is not self.SOFT_VALIDATION \
+                                           and isinstance(doc, (list, tuple)):
+                retval = self.native_array_from_numbers(cls, doc)
+                if retval is not None:
+                    return retval
+
+                retval = []
+
             for i, child in enumerate(doc):
                 retval.append(self._from_dict_value(ctx, i, serializer, child,
                                                                      validator))
 
+            if native:
+                return self.native_array_from_list(cls, retval)
+
             return retval
 
         cls_attrs = self.get_cls_attrs(cls)
@@ -296,8 +362,6 @@ class HierDictDocument(DictDocument):
                                                             cls.get_type_name())
                 cls = subcls
 
-        inst = cls.get_deserialization_instance(ctx)
-
         # get all class attributes, including the ones coming from
         # parent classes.
         flat_type_info = cls.get_flat_type_info(cls)
@@ -308,6 +372,9 @@ class HierDictDocument(DictDocument):
         # this is for validating cls.Attributes.{min,max}_occurs
         frequencies = defaultdict(int)
 
+        # deserialized member values, to be assigned in one go
+        values = {}
+
         try:
             items = doc.items()
         except AttributeError:
@@ -342,7 +409,7 @@ class HierDictDocument(DictDocument):
 
             mo = member_attrs.max_occurs
             if mo > 1:
-                subinst = getattr(inst, k, None)
+                subinst = values.get(k, None)
                 if subinst is None:
                     subinst = []
 
@@ -353,7 +420,8 @@ class HierDictDocument(DictDocument):
             else:
                 subinst = self._from_dict_value(ctx, k, member, v, validator)
 
-            inst._safe_set(k, subinst, member, member_attrs)
+            if not member_attrs.read_only:
+                values[k] = subinst
 
             frequencies[k] += 1
 
@@ -361,7 +429,7 @@ class HierDictDocument(DictDocument):
         if validator is self.SOFT_VALIDATION and attrs.validate_freq:
             self._check_freq_dict(cls, frequencies, flat_type_info)
 
-        return inst
+        return cls.get_deserialization_instance_from_dict(ctx, values)
 
     def _object_to_doc(self, cls, inst, tags=None):
         if inst is None:
@@ -414,6 +482,16 @@ class HierDictDocument(DictDocument):
         # transform the results into a dict:
         if cls.Attributes.max_occurs > 1:
             if inst is not None:
+                if self.stream_output and not isinstance(inst, (list, tuple)):
+                    return LazyArray(self._gen_array_doc(cls, inst, tags,
+                                                             cls_orig or cls))
+
+                if cls_orig is None and (isinstance(inst, (list, tuple))
+                                                  or hasattr(inst, 'tolist')):
+                    retval = self._array_to_doc_bulk(cls, inst, tags)
+                    if retval is not None:
+                        return retval
+
                 retval = []
 
                 for subinst in inst:
@@ -431,12 +509,136 @@ class HierDictDocument(DictDocument):
                     retval.append(self._to_dict_value(cls, subinst, tags,
                                                       cls_orig=cls_orig or cls))
 
+                if self.stream_output and _has_lazy(retval):
+                    retval = LazyArray(retval)
+
         else:
             retval = self._to_dict_value(cls, inst, tags,
                                                        cls_orig=cls_orig or cls)
 
         return retval
 
+    def get_serstr_bulk_handler(self, cls):
+        """Returns the bulk counterpart of :func:`to_serstr` for the given
+        class, or ``None``. See :func:`get_bulk_handler`."""
+
+        return self.get_bulk_handler(self._to_unicode_handlers, cls)
+
+    def _array_to_doc_bulk(self, cls, inst, tags):
+        """Serializes arrays of primitives or of flat ComplexModel instances
+        column by column using the bulk handlers of the protocol. Returns
+        ``None`` when the array needs to go through the regular,
+        item-by-item code path."""
+
+        if self.polymorphic:
+            return None
+
+        cls_attrs = self.get_cls_attrs(cls)
+        if cls_attrs.sanitizer is not None:
+            return None
+
+        if issubclass(cls, ComplexModelBase):
+            return self._complex_array_to_doc_bulk(cls, inst, tags)
+
+        if issubclass(cls, (ByteArray, Uuid, File, Any, AnyDict)):
+            return None
+
+        handler = self.get_serstr_bulk_handler(cls)
+        if handler is None:
+            return None
+
+        return handler(inst)
+
+    def _get_bulk_members(self, cls):
+        """Returns a list of ``(key, sub_name, min_occurs, default, handler)``
+        tuples for the members of the given class, or ``None`` if there's a
+        member that can't be serialized in bulk."""
+
+        retval = []
+        for k, v in self.sort_fields(cls):
+            subattr = self.get_cls_attrs(v)
+            if subattr.exc:
+                continue
+
+            if (issubclass(v, ComplexModelBase) or subattr.max_occurs > 1
+                                        or subattr.out_type is not None
+                                        or subattr.type is not None
+                                        or subattr.sanitizer is not None
+                                        or issubclass(v, (ByteArray, Uuid,
+                                                    File, Any, AnyDict))):
+                return None
+
+            handler = self.get_serstr_bulk_handler(v)
+            if handler is None:
+                return None
+
+            sub_name = subattr.sub_name
+            if sub_name is None:
+                sub_name = k
+
+            retval.append((k, sub_name, subattr.min_occurs, subattr.default,
+                                                                       handler))
+
+        return retval
+
+    def _complex_array_to_doc_bulk(self, cls, inst, tags):
+        if issubclass(cls, Array) or self.key_encoding is not None:
+            return None
+
+        cls_attrs = self.get_cls_attrs(cls)
+        if cls_attrs.simple_field is not None:
+            return None
+
+        if not ((self.ignore_wrappers or cls_attrs.not_wrapped)
+                                              and not bool(cls_attrs.wrapper)):
+            return None
+
+        complex_as = self.get_complex_as(cls_attrs)
+        if complex_as is list or cls_attrs.serialize_as is list:
+            return None
+
+        inst_cls = cls.__orig__ or cls
+        for subinst in inst:
+            if type(subinst) is not inst_cls or id(subinst) in tags:
+                return None
+
+        members = self._get_bulk_members(cls)
+        if members is None:
+            return None
+
+        columns = []
+        for k, sub_name, min_o, default, handler in members:
+            try:
+                column = [getattr(i, k, None) for i in inst]
+
+            # to guard against e.g. sqlalchemy throwing NoSuchColumnError
+            except Exception:
+                return None
+
+            if default is not None:
+                column = [default if v is None else v for v in column]
+
+            columns.append((sub_name, min_o > 0, handler(column)))
+
+        retval = []
+        for i in range(len(inst)):
+            retval.append(complex_as((sub_name, column[i])
+                                    for sub_name, required, column in columns
+                                       if required or column[i] is not None))
+
+        return retval
+
+    def _gen_array_doc(self, cls, inst, tags, cls_orig):
+        for subinst in inst:
+            # part of the array is possibly written already, so we can't throw
+            # the whole thing away like _object_to_doc does.
+            if id(subinst) in tags:
+                logger.debug("Skipping already serialized instance %d",
+                                                                   id(subinst))
+                continue
+
+            yield self._to_dict_value(cls, subinst, tags, cls_orig=cls_orig)
+
     def _get_member_pairs(self, cls, inst, tags):
         old_len = len(tags)
         tags = tags | {id(inst)}
@@ -529,7 +731,11 @@ class HierDictDocument(DictDocument):
         complex_as = self.get_complex_as(cls_attr)
         if complex_as is list or \
                          getattr(cls.Attributes, 'serialize_as', False) is list:
-            return list(self._complex_to_list(cls, inst, tags))
+            retval = list(self._complex_to_list(cls, inst, tags))
+            if self.stream_output and _has_lazy(retval):
+                retval = LazyArray(retval)
+            return retval
+
         return self._complex_to_dict(cls, inst, tags)
 
     def _complex_to_dict(self, cls, inst, tags):
@@ -542,29 +748,36 @@ class HierDictDocument(DictDocument):
 
             if (self.ignore_wrappers or cls_attr.not_wrapped) \
                                                  and not bool(cls_attr.wrapper):
-                return d
+                retval = d
 
             else:
                 if isinstance(cls_attr.wrapper,
                                               (six.text_type, six.binary_type)):
-                    return {cls_attr.wrapper: d}
+                    retval = {cls_attr.wrapper: d}
                 else:
-                    return {cls.get_type_name(): d}
+                    retval = {cls.get_type_name(): d}
         else:
             d = complex_as( (k.encode(self.key_encoding), v) for k, v in
                                        self._get_member_pairs(cls, inst, tags) )
 
             if (self.ignore_wrappers or cls_attr.not_wrapped) \
                                                  and not bool(cls_attr.wrapper):
-                return d
+                retval = d
 
             else:
                 if isinstance(cls_attr.wrapper, six.text_type):
-                    return {cls_attr.wrapper.encode(self.key_encoding): d}
+                    retval = {cls_attr.wrapper.encode(self.key_encoding): d}
                 elif isinstance(cls_attr.wrapper, six.binary_type):
-                    return {cls_attr.wrapper: d}
+                    retval = {cls_attr.wrapper: d}
                 else:
-                    return {cls.get_type_name().encode(self.key_encoding): d}
+                    retval = {cls.get_type_name().encode(self.key_encoding): d}
+
+        if self.stream_output and _has_lazy(d.values()):
+            if retval is d:
+                return LazyDict(d)
+            return LazyDict(dict((k, LazyDict(v)) for k, v in retval.items()))
+
+        return retval
 
     def _complex_to_list(self, cls, inst, tags):
         inst = cls.get_serialization_instance(inst)
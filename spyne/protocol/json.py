@@ -44,11 +44,16 @@ is always "from outside to inside" whereas ``object_pairs_hook`` is passed
 
 from __future__ import absolute_import
 
+import codecs
 import logging
 logger = logging.getLogger(__name__)
 
+from uuid import UUID
+from datetime import date, datetime
+from weakref import WeakKeyDictionary
 from itertools import chain
 from spyne.util import six
+from spyne.util import join_in_string
 
 
 try:
@@ -68,8 +73,12 @@ from spyne.model.primitive import DateTime
 from spyne.model.primitive import Double
 from spyne.model.primitive import Integer
 from spyne.model.primitive import Boolean
+from spyne.model.primitive import Uuid
 from spyne.model.fault import Fault
 from spyne.protocol.dictdoc import HierDictDocument
+from spyne.protocol.dictdoc.hier import LazyArray, LazyDict
+from spyne.protocol._jsonbackend import JsonBackend, get_json_backend
+from spyne.protocol._outbase import _func, _to_list
 
 
 # TODO: use this as default
@@ -91,11 +100,24 @@ NON_NUMBER_TYPES = tuple({list, dict, six.text_type, six.binary_type})
 
 class JsonDocument(HierDictDocument):
     """An implementation of the json protocol that uses simplejson package when
-    available, json package otherwise.
+    available, json package otherwise, unless another backend is requested.
 
     :param ignore_wrappers: Does not serialize wrapper objects.
     :param complex_as: One of (list, dict). When list, the complex objects are
         serialized to a list of values instead of a dict of key/value pairs.
+    :param stream_output: When ``True``, arrays that are returned as generators
+        (e.g. by functions returning an ``Iterable``) are written item by item
+        as they are produced, instead of being buffered in full before the
+        response is written. The output is the same as when they are
+        buffered, ``indent`` and ``sort_keys`` arguments included.
+    :param backend: The json library to use. One of ``None`` (the default,
+        same as ``'json'``), ``'auto'``, ``'orjson'``, ``'ujson'`` or a
+        :class:`spyne.protocol._jsonbackend.JsonBackend` instance. ``'auto'``
+        picks the fastest one that's installed. Values of types that the
+        backend serializes natively (e.g. datetimes with orjson) are passed to
+        it as-is unless their type has custom formatting options. Note that
+        backends other than ``'json'`` support only some of the keyword
+        arguments of ``json.dumps()``.
     """
 
     mime_type = 'application/json'
@@ -109,12 +131,16 @@ class JsonDocument(HierDictDocument):
     # flags used just for tests
     _decimal_as_string = True
 
+    stream_buffer_size = 16 * 1024
+    """Chunks of streamed output are joined until they are at least this many
+    characters long."""
+
     def __init__(self, app=None, validator=None, mime_type=None,
                         ignore_uncap=False,
                         # DictDocument specific
                         ignore_wrappers=True, complex_as=dict, ordered=False,
                         default_string_encoding=None, polymorphic=False,
-                        **kwargs):
+                        stream_output=False, backend=None, **kwargs):
 
         super(JsonDocument, self).__init__(app, validator, mime_type, ignore_uncap,
                                ignore_wrappers, complex_as, ordered, polymorphic)
@@ -131,12 +157,65 @@ class JsonDocument(HierDictDocument):
         self._to_unicode_handlers[Boolean] = self._ret
         self._to_unicode_handlers[Integer] = self._ret
 
+        self._bulk_handlers[_func(JsonDocument._ret)] = self._ret_bulk
+
         self.default_string_encoding = default_string_encoding
+        self.stream_output = stream_output
         self.kwargs = kwargs
 
+        self.backend = get_json_backend(backend)
+        for cls, native_type, is_plain in (
+                        (DateTime, datetime, self._is_plain_datetime),
+                        (Date, date, self._is_plain_date),
+                        (Uuid, UUID, self._is_plain_uuid),
+                    ):
+            if native_type in self.backend.native_types:
+                self._to_unicode_handlers[cls] = self._gen_native_handler(
+                          self._to_unicode_handlers[cls], native_type, is_plain)
+
     def _ret(self, cls, value):
         return value
 
+    def _ret_bulk(self, cls):
+        return _to_list
+
+    def _gen_native_handler(self, handler, native_type, is_plain):
+        """Returns a ``to_unicode`` handler that leaves values of the given
+        type to the json backend, unless the class has formatting options that
+        only the given handler knows about."""
+
+        plain = WeakKeyDictionary()
+
+        def _native_handler(cls, value, *args, **kwargs):
+            if type(value) is native_type:
+                retval = plain.get(cls, None)
+                if retval is None:
+                    retval = plain[cls] = is_plain(self.get_cls_attrs(cls))
+                if retval:
+                    return value
+
+            return handler(cls, value, *args, **kwargs)
+
+        return _native_handler
+
+    def _is_plain_datetime(self, cls_attrs):
+        return cls_attrs.as_timezone is None \
+            and cls_attrs.timezone \
+            and cls_attrs.serialize_as is None \
+            and self._get_datetime_format(cls_attrs) is None \
+            and cls_attrs.string_format is None \
+            and cls_attrs.str_format is None \
+            and cls_attrs.interp_format is None
+
+    def _is_plain_date(self, cls_attrs):
+        return cls_attrs.serialize_as is None \
+            and cls_attrs.date_format is None \
+            and cls_attrs.str_format is None \
+            and cls_attrs.format is None
+
+    def _is_plain_uuid(self, cls_attrs):
+        return cls_attrs.serialize_as in (None, str, 'str')
+
     def _ret_number(self, cls, value):
         if isinstance(value, NON_NUMBER_TYPES):
             raise ValidationError(value)
@@ -170,28 +249,151 @@ class JsonDocument(HierDictDocument):
     def create_in_document(self, ctx, in_string_encoding=None):
         """Sets ``ctx.in_document``  using ``ctx.in_string``."""
 
+        backend = self.backend
         try:
-            in_string = b''.join(ctx.in_string)
+            in_string = join_in_string(ctx.in_string)
             if not isinstance(in_string, six.text_type):
                 if in_string_encoding is None:
                     in_string_encoding = self.default_string_encoding
-                if in_string_encoding is not None:
-                    in_string = in_string.decode(in_string_encoding)
-            ctx.in_document = json.loads(in_string, **self.kwargs)
 
-        except JSONDecodeError as e:
+                if backend.accepts_bytes and (in_string_encoding is None or
+                            codecs.lookup(in_string_encoding).name == 'utf-8'):
+                    pass
+
+                elif in_string_encoding is not None:
+                    in_string = codecs.decode(in_string, in_string_encoding)
+
+                elif isinstance(in_string, memoryview):
+                    in_string = in_string.tobytes()
+
+            ctx.in_document = backend.loads(in_string, self.kwargs)
+
+        except backend.decode_errors as e:
             raise Fault('Client.JsonDecodeError', repr(e))
 
     def create_out_string(self, ctx, out_string_encoding='utf8'):
         """Sets ``ctx.out_string`` using ``ctx.out_document``."""
+
+        if self.stream_output:
+            ctx.out_string = self._gen_out_string(ctx.out_document,
+                                                            out_string_encoding)
+            return
+
+        backend = self.backend
         if out_string_encoding is None:
-            ctx.out_string = (json.dumps(o, **self.kwargs)
+            ctx.out_string = (backend.dumps(o, self.kwargs)
                                                       for o in ctx.out_document)
         else:
             ctx.out_string = (
-                json.dumps(o, **self.kwargs).encode(out_string_encoding)
+                backend.dumps_bytes(o, self.kwargs, out_string_encoding)
                                                       for o in ctx.out_document)
 
+    def _gen_out_string(self, out_document, out_string_encoding):
+        buf = []
+        buf_len = 0
+        for o in out_document:
+            for chunk in self._gen_json_chunks(o):
+                buf.append(chunk)
+                buf_len += len(chunk)
+
+                if buf_len >= self.stream_buffer_size:
+                    retval = ''.join(buf)
+                    if out_string_encoding is not None:
+                        retval = retval.encode(out_string_encoding)
+                    yield retval
+
+                    buf = []
+                    buf_len = 0
+
+        if len(buf) > 0:
+            retval = ''.join(buf)
+            if out_string_encoding is not None:
+                retval = retval.encode(out_string_encoding)
+            yield retval
+
+    def _gen_json_chunks(self, o, depth=0):
+        """Yields json fragments for the given document. Anything that's not a
+        :class:`LazyArray` or a :class:`LazyDict` is serialized in one go.
+        The ``indent`` and ``sort_keys`` arguments are honored the way
+        ``json.dumps()`` does."""
+
+        if isinstance(o, LazyDict):
+            item_separator, key_separator = self._get_separators()
+
+            items = []
+            for k, v in o.items():
+                if isinstance(k, six.binary_type):
+                    k = k.decode('utf8')
+                elif not isinstance(k, six.string_types):
+                    k = six.text_type(k)
+                items.append((k, v))
+
+            if self.kwargs.get('sort_keys', False):
+                items.sort(key=lambda kv: kv[0])
+
+            yield '{'
+            for i, (k, v) in enumerate(items):
+                if i > 0:
+                    yield item_separator
+                yield self._get_newline(depth + 1)
+
+                yield self.backend.dumps(k, self.kwargs)
+                yield key_separator
+
+                for chunk in self._gen_json_chunks(v, depth + 1):
+                    yield chunk
+
+            if len(items) > 0:
+                yield self._get_newline(depth)
+            yield '}'
+
+        elif isinstance(o, LazyArray):
+            item_separator, _ = self._get_separators()
+
+            empty = True
+            yield '['
+            for v in o:
+                if not empty:
+                    yield item_separator
+                yield self._get_newline(depth + 1)
+                empty = False
+
+                for chunk in self._gen_json_chunks(v, depth + 1):
+                    yield chunk
+
+            if not empty:
+                yield self._get_newline(depth)
+            yield ']'
+
+        else:
+            retval = self.backend.dumps(o, self.kwargs)
+            if depth > 0 and self._get_indent() is not None:
+                # newlines can only appear between json tokens, never inside
+                # strings.
+                retval = retval.replace('\n', self._get_newline(depth))
+            yield retval
+
+    def _get_indent(self):
+        indent = self.kwargs.get('indent', None)
+        if indent is not None and not isinstance(indent, six.string_types):
+            indent = ' ' * indent
+        return indent
+
+    def _get_newline(self, depth):
+        indent = self._get_indent()
+        if indent is None:
+            return ''
+        return '\n' + indent * depth
+
+    def _get_separators(self):
+        separators = self.kwargs.get('separators', None)
+        if separators is None:
+            if self.kwargs.get('indent', None) is not None:
+                separators = (',', ': ')
+            else:
+                separators = (', ', ': ')
+        return separators
+
 
 # Continuation of http://stackoverflow.com/a/24184379/1520211
 class HybridHttpJsonDocument(JsonDocument):
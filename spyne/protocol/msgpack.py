@@ -33,11 +33,13 @@ import msgpack
 
 from spyne import ValidationError
 from spyne.util import six
+from spyne.util import join_in_string
 from spyne.model.fault import Fault
 from spyne.model.primitive import Double
 from spyne.model.primitive import Boolean
 from spyne.model.primitive import Integer
 from spyne.protocol.dictdoc import HierDictDocument
+from spyne.protocol._outbase import _func, _to_list
 
 
 class MessagePackDecodeError(Fault):
@@ -120,9 +122,31 @@ class MessagePackDocument(HierDictDocument):
         self._to_unicode_handlers[Boolean] = self._ret_bool
         self._to_unicode_handlers[Integer] = self.integer_to_bytes
 
+        for handler in (MessagePackDocument._ret_number,
+                   MessagePackDocument._ret_bool,
+                   MessagePackDocument.integer_to_bytes):
+            self._bulk_handlers[_func(handler)] = \
+                                             self._gen_elementwise_bulk(handler)
+
     def _ret(self, _, value):
         return value
 
+    def get_serstr_bulk_handler(self, cls):
+        return self.get_bulk_handler(self._to_bytes_handlers, cls)
+
+    def _gen_elementwise_bulk(self, handler):
+        """Returns a bulk handler generator that calls the given scalar handler
+        for every value. This still saves the per-value handler lookups and
+        turns NumPy arrays to lists of values msgpack can serialize."""
+
+        def _gen_bulk(cls):
+            def _bulk(values):
+                return [None if v is None else handler(self, cls, v)
+                                                       for v in _to_list(values)]
+            return _bulk
+
+        return _gen_bulk
+
     def _ret_number(self, _, value):
         if isinstance(value, NON_NUMBER_TYPES):
             raise ValidationError(value)
@@ -162,7 +186,8 @@ class MessagePackDocument(HierDictDocument):
 
         else:
             try:
-                ctx.in_document = msgpack.unpackb(b''.join(ctx.in_string))
+                ctx.in_document = msgpack.unpackb(
+                                                 join_in_string(ctx.in_string))
             except ValueError as e:
                 raise MessagePackDecodeError(' '.join(e.args))
 
@@ -218,7 +243,7 @@ class MessagePackRpc(MessagePackDocument):
 
         # TODO: Use feed api
         try:
-            ctx.in_document = msgpack.unpackb(b''.join(ctx.in_string),
+            ctx.in_document = msgpack.unpackb(join_in_string(ctx.in_string),
                                                          **self.kwargs_unpacker)
 
 
@@ -39,8 +39,7 @@ logger = logging.getLogger(__name__)
 logger_invalid = logging.getLogger(__name__ + ".invalid")
 
 import cgi
-
-from itertools import chain
+import codecs
 
 import spyne.const.xml as ns
 
@@ -50,6 +49,7 @@ from lxml.etree import XMLParser
 
 from spyne import BODY_STYLE_WRAPPED
 from spyne.util import six
+from spyne.util import join_in_string
 from spyne.const.xml import DEFAULT_NS
 from spyne.const.http import HTTP_405, HTTP_500
 from spyne.error import RequestNotAllowed
@@ -92,15 +92,10 @@ def _from_soap(in_envelope_xml, xmlids=None, **kwargs):
 
 
 def _parse_xml_string(xml_string, parser, charset=None):
-    xml_string = iter(xml_string)
-    chunk = next(xml_string)
-    if isinstance(chunk, six.binary_type):
-        string = b''.join(chain( (chunk,), xml_string ))
-    else:
-        string = ''.join(chain( (chunk,), xml_string ))
+    string = join_in_string(xml_string)
 
     if charset:
-        string = string.decode(charset)
+        string = codecs.decode(string, charset)
 
     try:
         try:
@@ -200,10 +195,36 @@ class Soap11(XmlDocument):
             content_type = cgi.parse_header(content_type)
             ctx.in_string = collapse_swa(ctx, content_type, self.ns_soap_env)
 
+        if self.is_streaming_input():
+            # href resolution needs the whole document, so it's not supported
+            # when streaming.
+            ctx.in_document = self.create_in_stream(ctx, charset), {}
+            return
+
         ctx.in_document = _parse_xml_string(ctx.in_string,
                                             XMLParser(**self.parser_kwargs),
                                                                         charset)
 
+    def create_in_stream(self, ctx, charset=None):
+        """Reads the soap header and the start tag of the first element in the
+        soap body, which is where the method arguments are streamed from."""
+
+        envelope = super(Soap11, self).create_in_stream(ctx, charset)
+        if envelope.tag != '{%s}Envelope' % self.ns_soap_env:
+            return envelope
+
+        stream = ctx.protocol.xml_stream
+        body_tag = '{%s}Body' % self.ns_soap_env
+        for child in stream.iter_children():
+            if child.tag == body_tag:
+                for _ in stream.iter_children():
+                    break
+                break
+
+            stream.complete()
+
+        return envelope
+
     def decompose_incoming_envelope(self, ctx, message=XmlDocument.REQUEST):
         envelope_xml, xmlids = ctx.in_document
         header_document, body_document = _from_soap(envelope_xml, xmlids,
@@ -233,6 +254,7 @@ class Soap11(XmlDocument):
         self.event_manager.fire_event('before_deserialize', ctx)
 
         if ctx.in_body_doc.tag == "{%s}Fault" % self.ns_soap_env:
+            self.finish_in_stream(ctx)
             ctx.in_object = None
             ctx.in_error = self.from_element(ctx, Fault, ctx.in_body_doc)
 
@@ -269,8 +291,8 @@ class Soap11(XmlDocument):
             if ctx.in_body_doc is None:
                 ctx.in_object = [None] * len(body_class._type_info)
             else:
-                ctx.in_object = self.from_element(ctx, body_class,
-                                                                ctx.in_body_doc)
+                ctx.in_object = self.message_from_element(ctx, body_class,
+                                                       ctx.in_body_doc, message)
 
         self.event_manager.fire_event('after_deserialize', ctx)
 
@@ -35,6 +35,8 @@ logger = logging.getLogger('spyne.protocol.xml')
 logger_invalid = logging.getLogger('spyne.protocol.xml.invalid')
 
 from inspect import isgenerator
+from weakref import WeakKeyDictionary
+from collections import deque
 from collections import defaultdict
 
 from lxml import etree
@@ -45,7 +47,7 @@ from lxml.etree import XMLParser
 
 from spyne import BODY_STYLE_WRAPPED
 
-from spyne.util import Break, coroutine
+from spyne.util import Break, coroutine, join_in_string
 from six import text_type, string_types
 from spyne.util.cdict import cdict
 from spyne.util.etreeconv import etree_to_dict, dict_to_etree,\
@@ -67,6 +69,7 @@ from spyne.model.binary import BINARY_ENCODING_BASE64
 from spyne.model.enum import EnumBase
 
 from spyne.protocol import ProtocolBase
+from spyne.protocol._outbase import _func
 
 from spyne.util import six
 
@@ -76,7 +79,8 @@ else:
     STR_TYPES = (str, bytes)
 
 
-NIL_ATTR = {XSI('nil'): 'true'}
+XSI_NIL = XSI('nil')
+NIL_ATTR = {XSI_NIL: 'true'}
 XSI_TYPE = XSI('type')
 
 
@@ -93,6 +97,117 @@ def _gen_tagname(ns, name):
     return name
 
 
+def _iter_slices(chunks, size):
+    """Splits large buffers into ``bytes`` objects of at most ``size`` bytes so
+    that the parser never sees more than ``size`` bytes at once."""
+
+    for chunk in chunks:
+        if isinstance(chunk, six.text_type) or \
+                  (isinstance(chunk, six.binary_type) and len(chunk) <= size):
+            yield chunk
+            continue
+
+        view = memoryview(chunk)
+        for i in range(0, len(view), size):
+            yield view[i:i + size].tobytes()
+
+
+class XmlPullStream(object):
+    """Incrementally parses an iterable of xml fragments using lxml's
+    ``XMLPullParser``. The tree is built only as far as it has been read.
+
+    :param chunks: An iterable of byte strings or buffers, like
+        ``ctx.in_string``.
+    :param parser_kwargs: Keyword arguments for the ``XMLPullParser``.
+    :param chunk_size: The maximum number of bytes fed to the parser at once.
+    """
+
+    def __init__(self, chunks, parser_kwargs, chunk_size=64 * 1024):
+        self.parser = etree.XMLPullParser(events=('start', 'end'),
+                                                                **parser_kwargs)
+        self.chunks = _iter_slices(chunks, chunk_size)
+        self.events = deque()
+        self.depth = 0
+        self.done = False
+
+    def next_event(self):
+        """Returns the next ``(event, element)`` pair or ``None`` when the
+        document has ended."""
+
+        while len(self.events) == 0:
+            if self.done:
+                return None
+
+            chunk = next(self.chunks, None)
+            try:
+                if chunk is None:
+                    self.done = True
+                    self.parser.close()
+                else:
+                    self.parser.feed(chunk)
+
+            except XMLSyntaxError as e:
+                logger_invalid.error("%r in streamed document", e)
+                raise Fault('Client.XMLSyntaxError', str(e))
+
+            self.events.extend(self.parser.read_events())
+
+        event, elt = retval = self.events.popleft()
+        if event == 'start':
+            self.depth += 1
+        else:
+            self.depth -= 1
+
+        return retval
+
+    def skip_to(self, depth):
+        """Reads events until all elements deeper than ``depth`` have ended."""
+
+        while self.depth > depth:
+            if self.next_event() is None:
+                break
+
+    def complete(self):
+        """Reads the element whose start tag was read last until its end."""
+
+        self.skip_to(self.depth - 1)
+
+    def finish(self):
+        """Reads the rest of the document."""
+
+        self.skip_to(0)
+        while self.next_event() is not None:
+            pass
+
+    def iter_children(self):
+        """Yields the children of the element whose start tag was read last as
+        soon as their start tags are read. Children that are not read until
+        their end by the consumer are skipped."""
+
+        depth = self.depth
+        while True:
+            self.skip_to(depth)
+
+            retval = self.next_event()
+            if retval is None:
+                return
+
+            event, elt = retval
+            if event == 'end':
+                return
+
+            yield elt
+
+    @staticmethod
+    def discard(elt):
+        """Removes an element that's been fully read from the tree, so that
+        memory use does not grow with the size of the document."""
+
+        parent = elt.getparent()
+        if parent is not None:
+            parent.remove(elt)
+
+
 class SchemaValidationError(Fault):
     """Raised when the input stream could not be validated by the Xml Schema."""
 
@@ -207,6 +322,15 @@ class XmlDocument(SubXmlBase):
 
         Defaults to ``True``.
 
+    :param stream_input: When ``True``, incoming documents are parsed
+        incrementally. Arguments of wrapped requests are deserialized as soon
+        as their elements are read and are dropped from the tree afterwards.
+        When the last argument is an ``Iterable``, the service function gets a
+        generator that parses its items on demand. Ignored when schema
+        validation is enabled as it needs the whole document.
+
+        Defaults to ``False``.
+
     The following are passed straight to the ``XMLParser()`` instance from
     lxml. Docs are also plagiarized from the lxml documentation. Please note
     that some of the defaults are different to make parsing safer by default.
@@ -283,6 +407,10 @@ class XmlDocument(SubXmlBase):
     ns_soap_env = NS_SOAP11_ENV
     ns_soap_enc = NS_SOAP11_ENC
 
+    stream_chunk_size = 64 * 1024
+    """The maximum number of bytes fed to the parser at once when
+    ``stream_input`` is enabled."""
+
     def __init__(self, app=None, validator=None,
                 replace_null_with_default=True,
                 xml_declaration=True,
@@ -302,6 +430,7 @@ class XmlDocument(SubXmlBase):
                 binary_encoding=None,
                 parse_xsi_type=True,
                 polymorphic=False,
+                stream_input=False,
             ):
 
         super(XmlDocument, self).__init__(app, validator,
@@ -320,6 +449,10 @@ class XmlDocument(SubXmlBase):
         self.polymorphic = polymorphic
         self.pretty_print = pretty_print
         self.parse_xsi_type = parse_xsi_type
+        self.stream_input = stream_input
+
+        self._member_plans = WeakKeyDictionary()
+        self._member_tag_maps = WeakKeyDictionary()
 
         self.serialization_handlers = cdict({
             Any: self.any_to_parent,
@@ -406,6 +539,10 @@ class XmlDocument(SubXmlBase):
     def set_app(self, value):
         ProtocolBase.set_app(self, value)
 
+        # namespaces are finalized by the interface, so plans compiled before
+        # this point could be stale.
+        self._member_plans = WeakKeyDictionary()
+        self._member_tag_maps = WeakKeyDictionary()
         self.validation_schema = None
 
         if self.validator is self.SCHEMA_VALIDATION and value is not None:
@@ -422,11 +559,38 @@ class XmlDocument(SubXmlBase):
             raise SchemaValidationError(error_text.encode('ascii',
                                                            'xmlcharrefreplace'))
 
+    def is_streaming_input(self):
+        return self.stream_input and \
+                                    self.validator is not self.SCHEMA_VALIDATION
+
+    def create_in_stream(self, ctx, charset=None):
+        """Starts parsing ``ctx.in_string`` incrementally and returns the root
+        element as soon as its start tag is read. The :class:`XmlPullStream`
+        instance is stored in ``ctx.protocol.xml_stream``."""
+
+        parser_kwargs = self.parser_kwargs
+        if charset is not None and parser_kwargs['encoding'] is None:
+            parser_kwargs = dict(parser_kwargs, encoding=charset)
+
+        stream = XmlPullStream(ctx.in_string, parser_kwargs,
+                                                         self.stream_chunk_size)
+        ctx.protocol.xml_stream = stream
+
+        retval = stream.next_event()
+        if retval is None:
+            raise Fault('Client.XMLSyntaxError', "Document is empty")
+
+        return retval[1]
+
     def create_in_document(self, ctx, charset=None):
         """Uses the iterable of string fragments in ``ctx.in_string`` to set
         ``ctx.in_document``."""
 
-        string = b''.join(ctx.in_string)
+        if self.is_streaming_input():
+            ctx.in_document = self.create_in_stream(ctx, charset)
+            return
+
+        string = join_in_string(ctx.in_string)
         try:
             try:
                 ctx.in_document = etree.fromstring(string,
@@ -550,7 +714,8 @@ class XmlDocument(SubXmlBase):
         if ctx.in_body_doc is None:
             ctx.in_object = [None] * len(body_class._type_info)
         else:
-            ctx.in_object = self.from_element(ctx, body_class, ctx.in_body_doc)
+            ctx.in_object = self.message_from_element(ctx, body_class,
+                                                       ctx.in_body_doc, message)
 
         if logger.level == logging.DEBUG and message is self.REQUEST:
             line_header = '%sRequest%s' % (LIGHT_GREEN, END_COLOR)
@@ -564,6 +729,118 @@ class XmlDocument(SubXmlBase):
 
         self.event_manager.fire_event('after_deserialize', ctx)
 
+    def message_from_element(self, ctx, cls, element, message):
+        """Deserializes the message element. When the document is being
+        streamed, arguments of wrapped requests are read one by one."""
+
+        stream = getattr(ctx.protocol, 'xml_stream', None)
+        if stream is None:
+            return self.from_element(ctx, cls, element)
+
+        if message is not self.REQUEST or \
+                             ctx.descriptor.body_style is not BODY_STYLE_WRAPPED:
+            self.finish_in_stream(ctx)
+            return self.from_element(ctx, cls, element)
+
+        # the stream can only be consumed once.
+        ctx.protocol.xml_stream = None
+
+        return self.message_from_stream(ctx, cls, stream)
+
+    def finish_in_stream(self, ctx):
+        """Reads the rest of the incoming document, if it's being streamed."""
+
+        stream = getattr(ctx.protocol, 'xml_stream', None)
+        if stream is not None:
+            ctx.protocol.xml_stream = None
+            stream.finish()
+
+    def message_from_stream(self, ctx, cls, stream):
+        """Reads the children of the message element from the given
+        :class:`XmlPullStream`. Arguments are dropped from the tree as soon as
+        they are deserialized. If the last argument is an ``Iterable``, it's
+        set to a generator that reads the rest of the document on demand."""
+
+        inst = cls.get_deserialization_instance(ctx)
+
+        flat_type_info = cls.get_flat_type_info(cls)
+        tag_map = self.get_member_tag_map(cls)
+
+        last_key = None
+        for key, member in flat_type_info.items():
+            if not issubclass(member, XmlAttribute):
+                last_key = key
+
+        soft = self.validator is self.SOFT_VALIDATION
+        if soft:
+            frequencies = defaultdict(int)
+
+        streamed_key = None
+        for c in stream.iter_children():
+            entry = tag_map.get(c.tag, None)
+            if entry is None:
+                entry = self._resolve_member_tag(cls, flat_type_info, c.tag)
+                if entry is None:
+                    stream.complete()
+                    stream.discard(c)
+                    continue
+
+            key, member, member_attrs, handler, is_array = entry
+            if soft:
+                frequencies[key] += 1
+
+            if key == last_key and not is_array and \
+                                                   issubclass(member, Iterable):
+                # the rest of the document is parsed by the generator.
+                if not c.get(XSI_NIL):
+                    streamed_key = key
+                    inst._safe_set(key, self._iterable_from_stream(ctx, member,
+                                            stream, c), member, member_attrs)
+                    break
+
+            stream.complete()
+            value = self.from_element(ctx, member, c)
+            stream.discard(c)
+
+            if is_array:
+                values = getattr(inst, key, None)
+                if values is None:
+                    values = []
+
+                values.append(value)
+                value = values
+
+            inst._safe_set(key, value, member, member_attrs)
+
+        if soft:
+            for key, c in flat_type_info.items():
+                if key == streamed_key:
+                    continue
+
+                val = frequencies.get(key, 0)
+                attr = self.get_cls_attrs(c)
+                if val < attr.min_occurs or val > attr.max_occurs:
+                    raise Fault('Client.ValidationError', '%r member does not '
+                                         'respect frequency constraints.' % key)
+
+        if streamed_key is None:
+            stream.finish()
+
+        return inst
+
+    def _iterable_from_stream(self, ctx, cls, stream, element):
+        (serializer,) = cls._type_info.values()
+
+        for child in stream.iter_children():
+            stream.complete()
+            value = self.from_element(ctx, serializer, child)
+            stream.discard(child)
+
+            yield value
+
+        stream.discard(element)
+        stream.finish()
+
     def serialize(self, ctx, message):
         """Uses ``ctx.out_object``, ``ctx.out_header`` or ``ctx.out_error`` to
         set ``ctx.out_body_doc``, ``ctx.out_header_doc`` and
@@ -722,7 +999,6 @@ class XmlDocument(SubXmlBase):
             else:
                 parent.set(name, self.to_unicode(cls.type, inst))
 
-    @coroutine
     def gen_members_parent(self, ctx, cls, inst, parent, tag_name, subelts,
                                                                       add_type):
         attrib = {}
@@ -739,12 +1015,25 @@ class XmlDocument(SubXmlBase):
         if isinstance(parent, etree._Element):
             elt = etree.SubElement(parent, tag_name, attrib=attrib)
             elt.extend(subelts)
-            ret = self._get_members_etree(ctx, cls, inst, elt)
 
+            # this is either None or a running coroutine that the caller needs
+            # to keep feeding.
+            return self._get_members_etree(ctx, cls, inst, elt)
+
+        return self._gen_members_xmlfile(ctx, cls, inst, parent, tag_name,
+                                                                subelts, attrib)
+
+    @coroutine
+    def _gen_members_xmlfile(self, ctx, cls, inst, parent, tag_name, subelts,
+                                                                        attrib):
+        with parent.element(tag_name, attrib=attrib):
+            for e in subelts:
+                parent.write(e)
+            ret = self._get_members_etree(ctx, cls, inst, parent)
             if isgenerator(ret):
                 try:
                     while True:
-                        y = (yield) # may throw Break
+                        y = (yield)
                         ret.send(y)
 
                 except Break:
@@ -753,65 +1042,205 @@ class XmlDocument(SubXmlBase):
                     except StopIteration:
                         pass
 
-        else:
-            with parent.element(tag_name, attrib=attrib):
-                for e in subelts:
-                    parent.write(e)
-                ret = self._get_members_etree(ctx, cls, inst, parent)
-                if isgenerator(ret):
-                    try:
-                        while True:
-                            y = (yield)
-                            ret.send(y)
+    def get_member_plan(self, cls):
+        """Returns the compiled serialization plan for the members of the given
+        ComplexModel subclass, including the ones inherited via
+        ``__extends__``.
 
-                    except Break:
-                        try:
-                            ret.throw(Break())
-                        except StopIteration:
-                            pass
+        The plan is a tuple of ``(key, member_cls, member_cls_attrs, handler,
+        sub_ns, sub_name, is_array, is_required)`` tuples, in serialization
+        order. Excluded members are left out. ``handler`` is ``None`` when the
+        member has to go through the generic :func:`to_parent` because of
+        polymorphism or a sub-protocol.
+
+        Plans are cached per class unless a namespace in the class hierarchy
+        is still unresolved. They're recompiled once the members of the class
+        change, e.g. via :func:`ComplexModelBase.append_field`.
+        """
+
+        fti = getattr(cls, '_flat_type_info', None)
+
+        cached = self._member_plans.get(cls, None)
+        if cached is not None and cached[0] is fti:
+            return cached[1]
+
+        retval, cacheable = self._compile_member_plan(cls)
+        if cacheable:
+            self._member_plans[cls] = (fti, retval)
+
+        return retval
+
+    def _compile_member_plan(self, cls):
+        retval = []
+        cacheable = True
+
+        parent_cls = getattr(cls, '__extends__', None)
+        if parent_cls is not None:
+            parent_plan, cacheable = self._compile_member_plan(parent_cls)
+            retval.extend(parent_plan)
+
+        ns = cls.get_namespace()
+        if ns is None:
+            cacheable = False
+
+        for k, v in cls._type_info.items():
+            sub_cls_attrs = self.get_cls_attrs(v)
+            if sub_cls_attrs.exc:
+                continue
+
+            sub_ns = v.Attributes.sub_ns
+            if sub_ns is None:
+                sub_ns = ns
+
+            sub_name = v.Attributes.sub_name
+            if sub_name is None:
+                sub_name = k
+
+            handler = None
+            subprot = sub_cls_attrs.prot
+            if not self.polymorphic and not (subprot is not None and
+                                               isinstance(subprot, SubXmlBase)):
+                handler = self.serialization_handlers[v]
+
+            retval.append((k, v, sub_cls_attrs, handler, sub_ns, sub_name,
+                        v.Attributes.max_occurs > 1, v.Attributes.min_occurs > 0))
+
+        return tuple(retval), cacheable
+
+    def _member_to_parent(self, ctx, cls, cls_attrs, handler, inst, parent, ns,
+                                                                          name):
+        if handler is None:
+            return self.to_parent(ctx, cls, inst, parent, ns, name)
+
+        if inst is None:
+            inst = cls_attrs.default
+
+        if inst is None:
+            return self.null_to_parent(ctx, cls, inst, parent, ns, name)
+
+        return handler(ctx, cls, inst, parent, ns, name, add_type=False)
+
+    def _array_to_parent_bulk(self, ctx, cls, cls_attrs, inst, parent, ns,
+                                                                          name):
+        """Serializes an array of primitives using the bulk counterpart of
+        :func:`to_unicode`. Returns ``False`` without touching ``parent`` when
+        that's not possible."""
+
+        if not isinstance(inst, (list, tuple)) and \
+                                                 not hasattr(inst, 'tolist'):
+            return False
+
+        bulk = self.get_bulk_handler(self._to_unicode_handlers, cls)
+        if bulk is None:
+            return False
+
+        tag = _gen_tagname(ns, name)
+        for text in bulk(inst):
+            if text is None:
+                self._member_to_parent(ctx, cls, cls_attrs,
+                                self.modelbase_to_parent, None, parent, ns, name)
+            else:
+                elt = E(tag)
+                elt.text = text
+                _append(parent, elt)
+
+        return True
 
-    @coroutine
     def _get_members_etree(self, ctx, cls, inst, parent):
-        try:
-            parent_cls = getattr(cls, '__extends__', None)
+        """Serializes the members of ``inst`` to ``parent`` by running the
+        compiled member plan of ``cls`` in a plain loop.
+
+        Returns ``None`` when everything was serialized in one go. Once a member
+        turns out to be pushed (a :class:`PushBase` value or a child returning a
+        coroutine), the rest of the members are handed over to a coroutine
+        which is returned to the caller.
+        """
 
-            if not (parent_cls is None):
-                ret = self._get_members_etree(ctx, parent_cls, inst, parent)
+        plan = self.get_member_plan(cls)
+        member_to_parent = self._member_to_parent
+
+        for i, (k, v, attrs, handler, sub_ns, sub_name, is_array,
+                                                  is_required) in enumerate(plan):
+            try:
+                subvalue = getattr(inst, k, None)
+            except:  # e.g. SqlAlchemy could throw NoSuchColumnError
+                subvalue = None
+
+            if subvalue is not None and is_array:
+                if isinstance(subvalue, PushBase):
+                    return self._get_members_etree_push(ctx, plan, i, inst,
+                                                               parent, None, None)
+
+                if handler is not None and _func(handler) is \
+                                                       _MODELBASE_TO_PARENT and \
+                             self._array_to_parent_bulk(ctx, v, attrs, subvalue,
+                                                      parent, sub_ns, sub_name):
+                    continue
+
+                subvalues = iter(subvalue)
+                for sv in subvalues:
+                    ret = member_to_parent(ctx, v, attrs, handler, sv, parent,
+                                                                sub_ns, sub_name)
+                    if ret is not None:
+                        return self._get_members_etree_push(ctx, plan, i, inst,
+                                                           parent, ret, subvalues)
+
+            # Don't include empty values for
+            # non-nillable optional attributes.
+            elif subvalue is not None or is_required:
+                ret = member_to_parent(ctx, v, attrs, handler, subvalue, parent,
+                                                                sub_ns, sub_name)
                 if ret is not None:
+                    return self._get_members_etree_push(ctx, plan, i + 1, inst,
+                                                                parent, ret, None)
+
+    @coroutine
+    def _get_members_etree_push(self, ctx, plan, start, inst, parent, pending,
+                                                                   subvalues):
+        """Serializes ``plan[start:]`` as a coroutine. ``pending`` is a running
+        child coroutine that needs to be finished first and ``subvalues`` is
+        the rest of the values of the array member at ``plan[start]``, if any.
+        """
+
+        try:
+            if pending is not None:
+                try:
+                    while True:
+                        sv2 = (yield)  # may throw Break
+                        pending.send(sv2)
+
+                except Break:
                     try:
-                        while True:
-                            sv2 = (yield) # may throw Break
-                            ret.send(sv2)
+                        pending.throw(Break())
+                    except StopIteration:
+                        pass
 
-                    except Break:
+            if subvalues is not None:
+                k, v, _, _, sub_ns, sub_name, _, _ = plan[start]
+                for sv in subvalues:
+                    ret = self.to_parent(ctx, v, sv, parent, sub_ns, sub_name)
+                    if ret is not None:
                         try:
-                            ret.throw(Break())
-                        except StopIteration:
-                            pass
+                            while True:
+                                sv2 = (yield)  # may throw Break
+                                ret.send(sv2)
 
-            for k, v in cls._type_info.items():
-                sub_cls_attrs = self.get_cls_attrs(v)
-                if sub_cls_attrs.exc:
-                    continue
+                        except Break:
+                            try:
+                                ret.throw(Break())
+                            except StopIteration:
+                                pass
+
+                start += 1
 
+            for k, v, _, _, sub_ns, sub_name, is_array, is_required in \
+                                                                   plan[start:]:
                 try:
                     subvalue = getattr(inst, k, None)
                 except:  # e.g. SqlAlchemy could throw NoSuchColumnError
                     subvalue = None
 
-                # This is a tight loop, so enable this only when necessary.
-                # logger.debug("get %r(%r) from %r: %r" % (k, v, inst, subvalue))
-
-                sub_ns = v.Attributes.sub_ns
-                if sub_ns is None:
-                    sub_ns = cls.get_namespace()
-
-                sub_name = v.Attributes.sub_name
-                if sub_name is None:
-                    sub_name = k
-
-                mo = v.Attributes.max_occurs
-                if subvalue is not None and mo > 1:
+                if subvalue is not None and is_array:
                     if isinstance(subvalue, PushBase):
                         while True:
                             sv = (yield)
@@ -848,7 +1277,7 @@ class XmlDocument(SubXmlBase):
 
                 # Don't include empty values for
                 # non-nillable optional attributes.
-                elif subvalue is not None or v.Attributes.min_occurs > 0:
+                elif subvalue is not None or is_required:
                     ret = self.to_parent(ctx, v, subvalue, parent, sub_ns,
                                                                        sub_name)
                     if ret is not None:
@@ -954,15 +1383,99 @@ class XmlDocument(SubXmlBase):
 
         _append(parent, elt)
 
-    def complex_from_element(self, ctx, cls, elt):
-        inst = cls.get_deserialization_instance(ctx)
+    def get_member_tag_map(self, cls):
+        """Returns the compiled deserialization table for the members of the
+        given ComplexModel subclass, including the ones inherited via
+        ``__extends__``.
+
+        The table maps fully qualified tag names in Clark notation (and bare
+        member names, for unqualified documents) to ``(key, member_cls,
+        member_cls_attrs, handler, is_array)`` tuples.
+
+        Tables are cached per class unless a namespace in the class hierarchy
+        is still unresolved. Like member plans, they're recompiled once the
+        members of the class change.
+        """
+
+        fti = getattr(cls, '_flat_type_info', None)
+
+        cached = self._member_tag_maps.get(cls, None)
+        if cached is not None and cached[0] is fti:
+            return cached[1]
+
+        retval, cacheable = self._compile_member_tag_map(cls)
+        if cacheable:
+            self._member_tag_maps[cls] = (fti, retval)
+
+        return retval
+
+    def _compile_member_tag_map(self, cls):
+        retval = {}
+        cacheable = True
+
+        parent_cls = getattr(cls, '__extends__', None)
+        if parent_cls is not None:
+            parent_map, cacheable = self._compile_member_tag_map(parent_cls)
+            retval.update(parent_map)
+
+        ns = cls.get_namespace()
+        if ns is None:
+            cacheable = False
+
+        for k, v in cls._type_info.items():
+            attrs = self.get_cls_attrs(v)
+
+            sub_ns = v.Attributes.sub_ns
+            if sub_ns is None:
+                sub_ns = ns
+
+            sub_name = v.Attributes.sub_name
+            if sub_name is None:
+                sub_name = k
+
+            entry = (k, v, attrs, self.deserialization_handlers[v],
+                                                            attrs.max_occurs > 1)
+
+            retval[_gen_tagname(sub_ns, sub_name)] = entry
+            retval.setdefault(k, entry)
+
+        return retval, cacheable
+
+    def _resolve_member_tag(self, cls, flat_type_info, tag):
+        """The slow path of member lookup for tags that are not in the
+        compiled tag map, e.g. members in unexpected namespaces."""
+
+        key = tag.split('}', 1)[-1]
+
+        member = flat_type_info.get(key, None)
+        if member is None:
+            member, key = cls._type_info_alt.get(key, (None, key))
+            if member is None:
+                member, key = cls._type_info_alt.get(tag, (None, key))
+                if member is None:
+                    return None
+
+        attrs = self.get_cls_attrs(member)
+        return key, member, attrs, None, attrs.max_occurs > 1
 
+    def complex_from_element(self, ctx, cls, elt):
         flat_type_info = cls.get_flat_type_info(cls)
+        tag_map = self.get_member_tag_map(cls)
 
         # this is for validating cls.Attributes.{min,max}_occurs
-        frequencies = defaultdict(int)
+        soft = self.validator is self.SOFT_VALIDATION
+        if soft:
+            frequencies = defaultdict(int)
+
+        parse_xsi_type = self.parse_xsi_type
+        has_attrs = len(flat_type_info.attrs) > 0 or \
+                                                   len(cls._type_info_alt) > 0
+
         cls_attrs = self.get_cls_attrs(cls)
 
+        # deserialized member values, to be assigned in one go
+        values = {}
+
         if cls_attrs._xml_tag_body_as is not None:
             for xtba_key, xtba_type in cls_attrs._xml_tag_body_as:
                 xtba_attrs = self.get_cls_attrs(xtba_type.type)
@@ -972,37 +1485,44 @@ class XmlDocument(SubXmlBase):
                 else:
                     value = self.from_unicode(xtba_type.type, elt.text)
 
-                inst._safe_set(xtba_key, value, xtba_type.type, xtba_attrs)
+                if not xtba_attrs.read_only:
+                    values[xtba_key] = value
 
         # parse input to set incoming data to related attributes.
         for c in elt:
             if isinstance(c, etree._Comment):
                 continue
 
-            key = c.tag.split('}', 1)[-1]
-            frequencies[key] += 1
+            entry = tag_map.get(c.tag, None)
+            if entry is None:
+                entry = self._resolve_member_tag(cls, flat_type_info, c.tag)
+                if entry is None:
+                    continue
 
-            member = flat_type_info.get(key, None)
-            if member is None:
-                member, key = cls._type_info_alt.get(key, (None, key))
-                if member is None:
-                    member, key = cls._type_info_alt.get(c.tag, (None, key))
-                    if member is None:
-                        continue
+            key, member, member_attrs, handler, is_array = entry
+            if soft:
+                frequencies[key] += 1
+
+            # elements with xsi:nil or xsi:type go through the generic path.
+            if handler is None or c.get(XSI_NIL) or \
+                                  (parse_xsi_type and c.get(XSI_TYPE) is not None):
+                value = self.from_element(ctx, member, c)
+            else:
+                value = handler(ctx, member, c)
 
-            member_attrs = self.get_cls_attrs(member)
-            mo = member_attrs.max_occurs
-            if mo > 1:
-                value = getattr(inst, key, None)
-                if value is None:
-                    value = []
+            if is_array:
+                array = values.get(key, None)
+                if array is None:
+                    array = []
 
-                value.append(self.from_element(ctx, member, c))
+                array.append(value)
+                value = array
 
-            else:
-                value = self.from_element(ctx, member, c)
+            if not member_attrs.read_only:
+                values[key] = value
 
-            inst._safe_set(key, value, member, member_attrs)
+            if not has_attrs:
+                continue
 
             for key, value_str in c.attrib.items():
                 submember = flat_type_info.get(key, None)
@@ -1015,7 +1535,7 @@ class XmlDocument(SubXmlBase):
                 submember_attrs = self.get_cls_attrs(submember)
                 mo = submember_attrs.max_occurs
                 if mo > 1:
-                    value = getattr(inst, key, None)
+                    value = values.get(key, None)
                     if value is None:
                         value = []
 
@@ -1024,7 +1544,8 @@ class XmlDocument(SubXmlBase):
                 else:
                     value = self.from_unicode(submember.type, value_str)
 
-                inst._safe_set(key, value, submember.type, submember_attrs)
+                if not submember_attrs.read_only:
+                    values[key] = value
 
         for key, value_str in elt.attrib.items():
             member = flat_type_info.get(key, None)
@@ -1043,9 +1564,10 @@ class XmlDocument(SubXmlBase):
                 value = self.from_unicode(member.type, value_str)
 
             member_attrs = self.get_cls_attrs(member.type)
-            inst._safe_set(key, value, member.type, member_attrs)
+            if not member_attrs.read_only:
+                values[key] = value
 
-        if self.validator is self.SOFT_VALIDATION:
+        if soft:
             for key, c in flat_type_info.items():
                 val = frequencies.get(key, 0)
                 attr = self.get_cls_attrs(c)
@@ -1053,9 +1575,12 @@ class XmlDocument(SubXmlBase):
                     raise Fault('Client.ValidationError', '%r member does not '
                                          'respect frequency constraints.' % key)
 
-        return inst
+        return cls.get_deserialization_instance_from_dict(ctx, values)
 
     def array_from_element(self, ctx, cls, element):
+        if cls.Attributes.native is not None:
+            return self._native_array_from_element(ctx, cls, element)
+
         retval = [ ]
         (serializer,) = cls._type_info.values()
 
@@ -1064,6 +1589,24 @@ class XmlDocument(SubXmlBase):
 
         return retval
 
+    def _native_array_from_element(self, ctx, cls, element):
+        children = element.getchildren()
+
+        if self.validator is not self.SOFT_VALIDATION:
+            # children with attributes (e.g. xsi:nil or xsi:type) need to go
+            # through from_element()
+            texts = [None if len(child.attrib) > 0 else child.text
+                                                         for child in children]
+            if not (None in texts):
+                retval = self.native_array_from_strings(cls, texts)
+                if retval is not None:
+                    return retval
+
+        serializer = cls.get_inner_type()
+        return self.native_array_from_list(cls,
+                  [self.from_element(ctx, serializer, child)
+                                                        for child in children])
+
     def iterable_from_element(self, ctx, cls, element):
         (serializer,) = cls._type_info.values()
 
@@ -1158,3 +1701,6 @@ class XmlDocument(SubXmlBase):
             raise ValidationError(retval)
 
         return retval
+
+
+_MODELBASE_TO_PARENT = _func(XmlDocument.modelbase_to_parent)
@@ -25,11 +25,13 @@ Initially released in 2.10.0-rc.
 
 from __future__ import absolute_import
 
+import codecs
 import logging
 logger = logging.getLogger(__name__)
 
 from spyne import ValidationError
 from spyne.util import six
+from spyne.util import join_in_string
 from spyne.model.binary import BINARY_ENCODING_BASE64
 from spyne.model.primitive import Boolean
 from spyne.model.primitive import Integer
@@ -154,10 +156,9 @@ class YamlDocument(HierDictDocument):
             in_string_encoding = 'UTF-8'
 
         try:
-            try:
-                s = b''.join(ctx.in_string).decode(in_string_encoding)
-            except TypeError:
-                s = ''.join(ctx.in_string)
+            s = join_in_string(ctx.in_string)
+            if not isinstance(s, six.text_type):
+                s = codecs.decode(s, in_string_encoding)
 
             ctx.in_document = yaml.load(s, **self.in_kwargs)
 
@@ -42,6 +42,12 @@ class ServerBase(object):
     """The transport type, which is a URI string to its definition by
     convention."""
 
+    native_coroutines = False
+    """When ``True``, the transport awaits the coroutines that are returned by
+    ``async def`` service methods itself. Otherwise, they are run to completion
+    in a shared event loop thread by :func:`spyne.Application.process_request`.
+    """
+
     def __init__(self, app):
         self.app = app
         self.app.transport = self.transport  # FIXME: this is weird
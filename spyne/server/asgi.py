@@ -0,0 +1,971 @@
+
+#
+# spyne - Copyright (C) Spyne contributors.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301
+#
+
+"""A server that uses http as transport via asgi, to be run by asyncio-based
+servers like uvicorn or hypercorn. It doesn't contain any server logic.
+
+This module requires Python 3.
+"""
+
+
+import logging
+logger = logging.getLogger(__name__)
+
+import asyncio
+import threading
+
+from io import BytesIO
+from inspect import isawaitable, isgenerator
+from itertools import chain
+from functools import partial
+from collections.abc import Iterator
+
+from spyne import Redirect
+from spyne.application import logger_server
+from spyne.application import get_fault_string_from_exception
+from spyne.auxproc import process_contexts
+from spyne.error import RequestTooLongError
+from spyne.model import Fault, PushBase, Iterable
+from spyne.protocol.http import HttpRpc
+from spyne.server.http import HttpBase
+from spyne.server.http import _get_single_class
+from spyne.server.wsgi import WsgiApplication
+from spyne.server.wsgi import WsgiMethodContext
+from spyne.server.wsgi import WsgiTransportContext
+from spyne.server.wsgi import _gen_http_headers
+from spyne.server.wsgi import _get_charset
+from spyne.server.wsgi import _reconstruct_url
+
+from spyne.const.http import HTTP_200
+from spyne.const.http import HTTP_304
+from spyne.const.http import HTTP_404
+from spyne.const.http import HTTP_500
+
+try:
+    from spyne.protocol.soap.mime import apply_mtom
+except ImportError as _import_error_1:
+    _local_import_error_1 = _import_error_1  # python 3 workaround
+    def apply_mtom(*args, **kwargs):
+        raise _local_import_error_1
+
+
+class _ClientDisconnected(Exception):
+    pass
+
+
+def _gen_environ(scope):
+    """Builds a PEP-3333 style environment from the given asgi connection
+    scope so that the request can be handled like the wsgi transport does."""
+
+    root_path = scope.get('root_path', '')
+    path = scope['path']
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+
+    retval = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': root_path,
+        'PATH_INFO': path,
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin1'),
+        'SERVER_PROTOCOL': 'HTTP/%s' % scope.get('http_version', '1.1'),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'asgi.scope': scope,
+    }
+
+    server = scope.get('server', None)
+    if server is None:
+        server = ('localhost', 80)
+    retval['SERVER_NAME'] = server[0]
+    retval['SERVER_PORT'] = str(server[1])
+
+    client = scope.get('client', None)
+    if client is not None:
+        retval['REMOTE_ADDR'] = client[0]
+        retval['REMOTE_PORT'] = str(client[1])
+
+    for k, v in scope.get('headers', ()):
+        k = k.decode('latin1').upper().replace('-', '_')
+        v = v.decode('latin1')
+
+        if k not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            k = 'HTTP_' + k
+
+        if k in retval:
+            v = retval[k] + ',' + v
+        retval[k] = v
+
+    return retval
+
+
+def _gen_asgi_headers(headers):
+    retval = []
+
+    for k, v in _gen_http_headers(headers):
+        if not isinstance(k, bytes):
+            k = k.encode('latin1')
+        if not isinstance(v, bytes):
+            v = str(v).encode('latin1')
+        retval.append((k, v))
+
+    return retval
+
+
+def _get_awaitable(p_ctx):
+    """Returns the awaitable the user function returned, along with whether it
+    was wrapped in a list by :func:`spyne.Application.process_request`."""
+
+    oobj = p_ctx.out_object
+    if isawaitable(oobj):
+        return oobj, False
+
+    if isinstance(oobj, (list, tuple)) and len(oobj) == 1 \
+                                                     and isawaitable(oobj[0]):
+        return oobj[0], True
+
+    return None, False
+
+
+def _next_chunks(iterator, length):
+    """Returns the next chunks from the given iterator whose total length is
+    at least ``length`` bytes. Returns an empty list when the iterator is
+    exhausted."""
+
+    retval = []
+    num_bytes = 0
+
+    for chunk in iterator:
+        retval.append(chunk)
+        num_bytes += len(chunk)
+
+        if num_bytes >= length:
+            break
+
+    return retval
+
+
+async def _wait_disconnect(receive):
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return
+
+
+class AsgiPushStream(object):
+    """Buffers the data that's serialized by pushers until it's sent to the
+    client and applies backpressure to them. It's set as ``ctx.out_stream``
+    when the response is pushed and as the ``flow_control`` attribute of
+    :class:`spyne.model.PushBase` instances that run in the event loop.
+
+    Pushers that run in the thread pool are blocked in :func:`write` until
+    the buffer is drained below ``max_buffer_length`` bytes.
+    """
+
+    def __init__(self, loop, max_buffer_length=64 * 1024):
+        self.loop = loop
+        self.thread = threading.current_thread()
+        self.max_buffer_length = max_buffer_length
+
+        self.buffer = []
+        self.length = 0
+        self.finished = False
+        self.stopped = False
+
+        self._data_ready = None
+        self._waiting = []
+
+    def write(self, data):
+        if not data:
+            return
+
+        if threading.current_thread() is not self.thread:
+            asyncio.run_coroutine_threadsafe(
+                               self._write_threadsafe(data), self.loop).result()
+            return
+
+        if self.stopped:
+            return
+
+        self.buffer.append(data)
+        self.length += len(data)
+        self._wake()
+
+    async def _write_threadsafe(self, data):
+        self.write(data)
+
+        retval = self.when_writable()
+        if retval is not None:
+            await retval
+
+    def finish(self):
+        if threading.current_thread() is not self.thread:
+            self.loop.call_soon_threadsafe(self.finish)
+            return
+
+        self.finished = True
+        self._wake()
+
+    def stop(self):
+        """Called when the client goes away. Data that's written afterwards is
+        discarded and the pushers that wait for the buffer to be drained get
+        an exception."""
+
+        if self.stopped:
+            return
+
+        self.stopped = True
+        self.buffer = []
+        self.length = 0
+
+        waiting, self._waiting = self._waiting, []
+        for f in waiting:
+            if not f.done():
+                f.set_exception(Exception("Client disconnected"))
+
+        self._wake()
+
+    def when_writable(self):
+        """Returns ``None`` when the buffer can take more data, an asyncio
+        ``Future`` that's done when it can otherwise."""
+
+        if self.stopped:
+            retval = self.loop.create_future()
+            retval.set_exception(Exception("Client disconnected"))
+            return retval
+
+        if self.length < self.max_buffer_length:
+            return None
+
+        retval = self.loop.create_future()
+        self._waiting.append(retval)
+        return retval
+
+    def feed(self, pusher, insts):
+        """Appends instances from ``insts`` to ``pusher`` until either the
+        iterable is exhausted, in which case ``None`` is returned, or the
+        buffer is full, in which case an asyncio ``Future`` that's done after
+        the rest of the instances are appended is returned. ``insts`` can also
+        be an asynchronous iterable."""
+
+        if hasattr(insts, '__aiter__'):
+            return asyncio.ensure_future(self._feed_async(pusher, insts))
+
+        insts = iter(insts)
+
+        while not self.stopped and self.length < self.max_buffer_length:
+            try:
+                inst = next(insts)
+            except StopIteration:
+                return None
+
+            pusher.append(inst)
+
+        return asyncio.ensure_future(self._feed(pusher, insts))
+
+    async def _feed(self, pusher, insts):
+        for inst in insts:
+            retval = self.when_writable()
+            if retval is not None:
+                await retval
+
+            pusher.append(inst)
+
+    async def _feed_async(self, pusher, insts):
+        async for inst in insts:
+            retval = self.when_writable()
+            if retval is not None:
+                await retval
+
+            pusher.append(inst)
+
+    async def drain(self, write):
+        """Passes the buffered data to the ``write`` coroutine function until
+        the stream is finished or stopped."""
+
+        while True:
+            if len(self.buffer) > 0:
+                data = b''.join(self.buffer)
+                self.buffer = []
+                self.length = 0
+
+                waiting, self._waiting = self._waiting, []
+                for f in waiting:
+                    if not f.done():
+                        f.set_result(None)
+
+                await write(data)
+                continue
+
+            if self.finished or self.stopped:
+                return
+
+            self._data_ready = self.loop.create_future()
+            await self._data_ready
+            self._data_ready = None
+
+    def _wake(self):
+        if self._data_ready is not None and not self._data_ready.done():
+            self._data_ready.set_result(None)
+
+
+class AsgiTransportContext(WsgiTransportContext):
+    """The class that is used in the transport attribute of the
+    :class:`AsgiMethodContext` class.
+
+    The request is exposed as a PEP-3333 style environment in the ``req`` and
+    ``req_env`` attributes, just like it's done by the wsgi transport."""
+
+    def __init__(self, parent, transport, req_env, content_type):
+        super(AsgiTransportContext, self).__init__(parent, transport,
+                                                          req_env, content_type)
+
+        self.scope = req_env['asgi.scope']
+        """ASGI connection scope"""
+
+
+class AsgiMethodContext(WsgiMethodContext):
+    """The ASGI-Specific method context. ASGI-Specific information is stored in
+    the transport attribute using the :class:`AsgiTransportContext` class.
+    """
+
+    TransportContext = None
+    HttpTransportContext = AsgiTransportContext
+
+
+class AsgiApplication(HttpBase):
+    """An `ASGI <https://asgi.readthedocs.io>`_ (version 3) compliant
+    application class. ::
+
+        asgi_app = AsgiApplication(application)
+
+        # e.g. uvicorn.run(asgi_app)
+
+    Service methods defined as coroutine functions (``async def``) are awaited
+    in the event loop. Other service methods are assumed to be blocking, so
+    they are called and their return values are serialized in the thread pool
+    given as ``executor``. The event loop's default executor is used when it's
+    ``None``.
+
+    :class:`spyne.model.PushBase` instances are pushed to the client at its
+    own pace. At most ``max_push_buffer_length`` bytes are buffered, pushers
+    are paused afterwards. See :func:`spyne.model.PushBase.feed`.
+
+    Service methods that return an :class:`spyne.model.Iterable` can return
+    asynchronous iterators. When ``push_iterables`` is ``True``, they are
+    pushed to the client as above, as well as the iterators returned by
+    blocking service methods. This needs an output protocol that can
+    serialize incrementally, like the ones that are based on
+    :class:`spyne.protocol.cloth.XmlCloth`. Otherwise, asynchronous iterators
+    are exhausted before serialization starts.
+
+    With ``compress=True``, responses are compressed depending on the
+    ``Accept-Encoding`` header of the request, like it's done by
+    :class:`spyne.server.wsgi.WsgiApplication`. Pushed responses are sent
+    uncompressed.
+
+    Supported events:
+        * ``wsdl``
+            Called right before the wsdl data is returned to the client.
+
+        * ``wsdl_exception``
+            Called right after an exception is thrown during wsdl generation.
+            The exception object is stored in ctx.transport.wsdl_error
+            attribute.
+
+        * ``asgi_call``
+            Called first when the incoming http request is identified as a rpc
+            request.
+
+        * ``asgi_return``
+            Called right before the response is started.
+
+        * ``asgi_exception``
+            Called right before returning the exception to the client.
+
+        * ``asgi_close``
+            Called after the whole data has been returned to the client. It's
+            called both from success and error cases.
+    """
+
+    native_coroutines = True
+
+    def __init__(self, app, chunked=True, max_content_length=2 * 1024 * 1024,
+                     block_length=8 * 1024, executor=None, push_iterables=False,
+                          max_push_buffer_length=64 * 1024, compress=False):
+        super(AsgiApplication, self).__init__(app, chunked, max_content_length,
+                                                 block_length, compress=compress)
+
+        self.executor = executor
+        self.push_iterables = push_iterables
+        self.max_push_buffer_length = max_push_buffer_length
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.handle_lifespan(receive, send)
+
+        if scope['type'] != 'http':
+            raise ValueError("Unsupported connection type %r" % scope['type'])
+
+        req_env = _gen_environ(scope)
+
+        try:
+            if self.is_wsdl_request(req_env):
+                # Format the url for location
+                url = _reconstruct_url(req_env, query_string=False) \
+                                                            .split('.wsdl')[0]
+                return await self.handle_wsdl_request(req_env, send, url)
+
+            return await self.handle_rpc(req_env, receive, send)
+
+        except _ClientDisconnected:
+            logger.debug("Client disconnected from %r", scope['path'])
+
+    async def handle_lifespan(self, receive, send):
+        while True:
+            message = await receive()
+
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def handle_wsdl_request(self, req_env, send, url):
+        ctx = AsgiMethodContext(self, req_env, 'text/xml; charset=utf-8')
+
+        if self.doc.wsdl11 is None:
+            await self._send_response(send, HTTP_404,
+                                          ctx.transport.resp_headers, [HTTP_404])
+            return
+
+        doc = self.find_wsdl_document()
+        if doc is None:
+            # building the document takes a while, so it's done in the thread
+            # pool.
+            loop = asyncio.get_event_loop()
+
+            try:
+                doc = await loop.run_in_executor(self.executor,
+                                                   self.get_wsdl_document, url)
+
+            except Exception as e:
+                logger.exception(e)
+                ctx.transport.wsdl_error = e
+
+                self.event_manager.fire_event('wsdl_exception', ctx)
+
+                await self._send_response(send, HTTP_500,
+                                          ctx.transport.resp_headers, [HTTP_500])
+                return
+
+        ctx.transport.wsdl = doc.data
+
+        self.event_manager.fire_event('wsdl', ctx)
+
+        if ctx.transport.wsdl is doc.data:
+            code, headers, retval = self.doc_cache.respond(doc,
+                                    req_env.get('HTTP_ACCEPT_ENCODING'),
+                                    req_env.get('HTTP_IF_NONE_MATCH'),
+                                    req_env.get('HTTP_IF_MODIFIED_SINCE'))
+            ctx.transport.resp_headers.update(headers)
+
+        else:
+            # an event handler replaced the document, so it's sent as is.
+            code, retval = HTTP_200, ctx.transport.wsdl
+            ctx.transport.resp_headers['Content-Length'] = str(len(retval))
+
+        if code == HTTP_304:
+            await self._send_response(send, code, ctx.transport.resp_headers,
+                                                                            [])
+        else:
+            await self._send_response(send, code, ctx.transport.resp_headers,
+                                                                      [retval])
+
+        ctx.close()
+
+    async def handle_error(self, p_ctx, others, error, send):
+        """Serialize errors and send them to the client.
+
+        :param p_ctx: Primary (non-aux) context.
+        :param others: List if auxiliary contexts (can be empty).
+        :param error: One of ctx.{in,out}_error.
+        :param send: See the ASGI spec for more info.
+        """
+
+        if p_ctx.transport.resp_code is None:
+            p_ctx.transport.resp_code = \
+                p_ctx.out_protocol.fault_to_http_response_code(error)
+
+        self.get_out_string(p_ctx)
+
+        # consume the generator to get the length
+        p_ctx.out_string = list(p_ctx.out_string)
+
+        self.compress_out_string(p_ctx,
+                            p_ctx.transport.req_env.get('HTTP_ACCEPT_ENCODING'))
+
+        p_ctx.transport.resp_headers['Content-Length'] = \
+                                    str(sum((len(s) for s in p_ctx.out_string)))
+        self.event_manager.fire_event('asgi_exception', p_ctx)
+
+        try:
+            process_contexts(self, others, p_ctx, error=error)
+        except Exception as e:
+            # Report but ignore any exceptions from auxiliary methods.
+            logger.exception(e)
+
+        try:
+            await self._send_response(send, p_ctx.transport.resp_code,
+                                 p_ctx.transport.resp_headers, p_ctx.out_string)
+        finally:
+            self._finalize(p_ctx)
+
+    async def handle_rpc(self, req_env, receive, send):
+        initial_ctx = AsgiMethodContext(self, req_env,
+                                                self.app.out_protocol.mime_type)
+
+        self.event_manager.fire_event('asgi_call', initial_ctx)
+
+        try:
+            initial_ctx.in_string = await self._read_body(req_env, receive)
+
+        except RequestTooLongError as e:
+            initial_ctx.in_error = initial_ctx.out_error = e
+            return await self.handle_error(initial_ctx, (), e, send)
+
+        in_string_charset = _get_charset(req_env.get('CONTENT_TYPE', None))
+
+        contexts = self.generate_contexts(initial_ctx, in_string_charset)
+        p_ctx, others = contexts[0], contexts[1:]
+
+        # TODO: rate limiting
+        p_ctx.active = True
+
+        if p_ctx.in_error:
+            return await self.handle_error(p_ctx, others, p_ctx.in_error, send)
+
+        self.get_in_object(p_ctx)
+        if p_ctx.in_error:
+            logger.error(p_ctx.in_error)
+            return await self.handle_error(p_ctx, others, p_ctx.in_error, send)
+
+        disconnected = asyncio.ensure_future(_wait_disconnect(receive))
+
+        try:
+            blocking = await self._get_out_object(p_ctx, disconnected)
+            if p_ctx.out_error:
+                return await self.handle_error(p_ctx, others, p_ctx.out_error,
+                                                                           send)
+
+            if p_ctx.transport.resp_code is None:
+                p_ctx.transport.resp_code = HTTP_200
+
+            ret = None
+            if len(p_ctx.out_object) == 1:
+                ret = self._iterable_to_push(p_ctx, p_ctx.out_object[0])
+                if isinstance(ret, PushBase):
+                    p_ctx.out_object = [ret]
+
+            if isinstance(ret, PushBase):
+                return await self._push(p_ctx, others, ret, send, disconnected)
+
+            await self._exhaust_async_iterators(p_ctx)
+
+            return await self._respond(p_ctx, others, send, blocking)
+
+        finally:
+            disconnected.cancel()
+
+    async def _read_body(self, req_env, receive):
+        length = req_env.get('CONTENT_LENGTH', '')
+        if len(length) > 0 and int(length) > self.max_content_length:
+            raise RequestTooLongError()
+
+        chunks = []
+        bytes_read = 0
+
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                raise _ClientDisconnected()
+
+            data = message.get('body', b'')
+            if len(data) > 0:
+                bytes_read += len(data)
+                if bytes_read > self.max_content_length:
+                    raise RequestTooLongError()
+
+                chunks.append(data)
+
+            if not message.get('more_body', False):
+                break
+
+        retval = b''.join(chunks)
+
+        # for parsing form data
+        req_env['wsgi.input'] = BytesIO(retval)
+        req_env['CONTENT_LENGTH'] = str(len(retval))
+
+        return [retval]
+
+    async def _get_out_object(self, p_ctx, disconnected):
+        """Calls the user function in the event loop when it's a coroutine
+        function, in the thread pool otherwise. Awaits its return value when
+        it's awaitable. Returns whether the user function is a blocking one.
+        """
+
+        blocking = not p_ctx.descriptor.is_coroutine
+
+        if blocking:
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(self.executor,
+                                         self._get_out_object_blocking, p_ctx)
+        else:
+            self.get_out_object(p_ctx)
+
+        if p_ctx.out_error is not None:
+            return blocking
+
+        awaitable, wrapped = _get_awaitable(p_ctx)
+        if awaitable is None:
+            return blocking
+
+        task = asyncio.ensure_future(awaitable)
+        await asyncio.wait([task, disconnected],
+                                         return_when=asyncio.FIRST_COMPLETED)
+
+        if not task.done():
+            # no one will be reading the response
+            task.cancel()
+            self._finalize(p_ctx)
+            raise _ClientDisconnected()
+
+        # DRY this with what's in Application.process_request
+        try:
+            ret = task.result()
+            if wrapped:
+                ret = [ret]
+            p_ctx.out_object = ret
+
+        except Redirect as e:
+            try:
+                e.do_redirect()
+
+                p_ctx.out_object = [None]
+
+                p_ctx.fire_event('method_redirect')
+
+            except Exception as e:
+                logger_server.exception(e)
+                p_ctx.out_error = Fault('Server',
+                                             get_fault_string_from_exception(e))
+
+                p_ctx.fire_event('method_redirect_exception')
+
+        except Fault as e:
+            logger.exception(e)
+
+            p_ctx.out_error = e
+
+            p_ctx.fire_event('method_exception_object')
+
+        except Exception as e:
+            logger_server.critical(e, **{'exc_info': 1})
+
+            p_ctx.out_error = Fault('Server',
+                                             get_fault_string_from_exception(e))
+
+            p_ctx.fire_event('method_exception_object')
+
+        return blocking
+
+    def _get_out_object_blocking(self, p_ctx):
+        self.get_out_object(p_ctx)
+        if p_ctx.out_error is not None:
+            return
+
+        # if the out_object is a generator function, this makes the user code
+        # run until first yield, which lets it set response headers and
+        # whatnot before the response is started. See WsgiApplication.
+        if len(p_ctx.out_object) == 1:
+            g = p_ctx.out_object[0]
+            if isgenerator(g):
+                try:
+                    first_obj = next(g)
+                except StopIteration:
+                    p_ctx.out_object = ((),)
+                else:
+                    p_ctx.out_object = (chain((first_obj,), g),)
+
+    def _iterable_to_push(self, p_ctx, ret):
+        """Turns ``ret`` into a :class:`PushBase` that feeds the instances that
+        it produces to the response at the pace of the client when it's an
+        iterator returned by a method that returns an :class:`Iterable`.
+        Returns ``ret`` untouched otherwise."""
+
+        if not self.push_iterables or isinstance(ret, PushBase):
+            return ret
+
+        is_async = hasattr(ret, '__aiter__')
+        if not (is_async or isinstance(ret, Iterator)):
+            return ret
+
+        single_class = _get_single_class(p_ctx)
+        if not (isinstance(single_class, type) and
+                                            issubclass(single_class, Iterable)):
+            return ret
+
+        if is_async:
+            return single_class.Push(lambda push: push.feed(ret))
+
+        # blocking iterators are exhausted in the thread pool.
+        loop = asyncio.get_event_loop()
+        return single_class.Push(lambda push:
+                       loop.run_in_executor(self.executor, push.extend, ret))
+
+    async def _exhaust_async_iterators(self, p_ctx):
+        oobj = p_ctx.out_object
+        if not any(hasattr(o, '__aiter__') for o in oobj):
+            return
+
+        retval = []
+        for o in oobj:
+            if hasattr(o, '__aiter__'):
+                o = [inst async for inst in o]
+            retval.append(o)
+
+        p_ctx.out_object = retval
+
+    async def _respond(self, p_ctx, others, send, blocking):
+        try:
+            if blocking:
+                loop = asyncio.get_event_loop()
+                await loop.run_in_executor(self.executor,
+                                                     self.get_out_string, p_ctx)
+            else:
+                self.get_out_string(p_ctx)
+
+        except Exception as e:
+            logger.exception(e)
+            p_ctx.out_error = Fault('Server', get_fault_string_from_exception(e))
+            return await self.handle_error(p_ctx, others, p_ctx.out_error, send)
+
+        if isinstance(p_ctx.out_protocol, HttpRpc) and \
+                                               p_ctx.out_header_doc is not None:
+            p_ctx.transport.resp_headers.update(p_ctx.out_header_doc)
+
+        if p_ctx.descriptor and p_ctx.descriptor.mtom:
+            # see WsgiApplication.handle_rpc
+            out_type_info = p_ctx.descriptor.out_message._type_info
+            if len(out_type_info) == 1:
+                p_ctx.out_object = [p_ctx.out_object]
+
+            p_ctx.transport.resp_headers, p_ctx.out_string = apply_mtom(
+                    p_ctx.transport.resp_headers, p_ctx.out_string,
+                    p_ctx.descriptor.out_message._type_info.values(),
+                    p_ctx.out_object,
+                )
+
+        self.event_manager.fire_event('asgi_return', p_ctx)
+
+        if self.chunked:
+            # the user has not set a content-length, so we delete it as the
+            # input is just an iterable.
+            if 'Content-Length' in p_ctx.transport.resp_headers:
+                del p_ctx.transport.resp_headers['Content-Length']
+        else:
+            p_ctx.out_string = [b''.join(p_ctx.out_string)]
+
+        accept_encoding = p_ctx.transport.req_env.get('HTTP_ACCEPT_ENCODING')
+        if blocking:
+            # reading the head of the response can run the serializer.
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(self.executor,
+                           self.compress_out_string, p_ctx, accept_encoding)
+        else:
+            self.compress_out_string(p_ctx, accept_encoding)
+
+        try:
+            len(p_ctx.out_string)
+
+            p_ctx.transport.resp_headers['Content-Length'] = \
+                                    str(sum([len(a) for a in p_ctx.out_string]))
+        except TypeError:
+            pass
+
+        try:
+            process_contexts(self, others, p_ctx, error=None)
+        except Exception as e:
+            # Report but ignore any exceptions from auxiliary methods.
+            logger.exception(e)
+
+        try:
+            await self._send_response(send, p_ctx.transport.resp_code,
+                                 p_ctx.transport.resp_headers, p_ctx.out_string)
+        finally:
+            self._finalize(p_ctx)
+
+    async def _push(self, p_ctx, others, pusher, send, disconnected):
+        loop = asyncio.get_event_loop()
+
+        stream = p_ctx.out_stream = AsgiPushStream(loop,
+                                                    self.max_push_buffer_length)
+        disconnected.add_done_callback(
+                                    lambda f: f.cancelled() or stream.stop())
+
+        try:
+            self.init_root_push(pusher, p_ctx, others)
+
+        except Exception as e:
+            logger.exception(e)
+
+            # the response is not started yet, so the client can still get a
+            # proper error. This happens e.g. when the output protocol can't
+            # serialize incrementally.
+            stream.stop()
+            p_ctx.out_stream = None
+            p_ctx.out_document = None
+            p_ctx.out_string = None
+            p_ctx.transport.resp_code = None
+            p_ctx.out_error = Fault('Server', get_fault_string_from_exception(e))
+            return await self.handle_error(p_ctx, others, p_ctx.out_error, send)
+
+        if 'Content-Length' in p_ctx.transport.resp_headers:
+            del p_ctx.transport.resp_headers['Content-Length']
+
+        self.event_manager.fire_event('asgi_return', p_ctx)
+
+        try:
+            await self._send_start(send, p_ctx.transport.resp_code,
+                                                   p_ctx.transport.resp_headers)
+
+            await stream.drain(partial(self._send_body, send))
+
+            if not stream.stopped:
+                await self._send_body(send, b'', more_body=False)
+
+        finally:
+            self._finalize(p_ctx)
+
+    def pusher_init(self, p_ctx, gen, _cb_push_finish, pusher, interim):
+        stream = p_ctx.out_stream
+        if pusher.orig_thread is not stream.thread:
+            # pushers that are created by blocking methods are assumed to
+            # push from blocking code as well.
+            return stream.loop.run_in_executor(self.executor,
+                                   partial(super(AsgiApplication, self)
+                                   .pusher_init, p_ctx, gen, _cb_push_finish,
+                                                            pusher, interim))
+
+        if pusher.flow_control is None:
+            pusher.flow_control = stream
+
+        return super(AsgiApplication, self).pusher_init(
+                                   p_ctx, gen, _cb_push_finish, pusher, interim)
+
+    @staticmethod
+    def set_out_document_push(ctx):
+        class _ISwearImAGenerator(object):
+            def send(self, data):
+                if not data: return
+                ctx.out_stream.write(data)
+
+        ctx.out_document = _ISwearImAGenerator()
+
+    def pusher_try_close(self, ctx, pusher, retval):
+        # the whole point of this function is to call ctx.out_stream.finish()
+        # when a *root* pusher has no more data to send. interim pushers don't
+        # have to close anything.
+        if isawaitable(retval):
+            return asyncio.ensure_future(
+                                      self._pusher_close(ctx, pusher, retval))
+
+        super(AsgiApplication, self).pusher_try_close(ctx, pusher, retval)
+
+        if not pusher.interim:
+            ctx.out_stream.finish()
+
+        return retval
+
+    async def _pusher_close(self, ctx, pusher, retval):
+        try:
+            while isawaitable(retval):
+                retval = await retval
+
+        except Exception as e:
+            logger.exception(e)
+
+        try:
+            super(AsgiApplication, self).pusher_try_close(ctx, pusher, retval)
+
+        finally:
+            if not pusher.interim:
+                ctx.out_stream.finish()
+
+    async def _send_response(self, send, resp_code, resp_headers, out_string):
+        await self._send_start(send, resp_code, resp_headers)
+
+        if isinstance(out_string, (list, tuple)):
+            for data in out_string:
+                await self._send_body(send, data)
+
+        else:
+            # the serializer can run user code, so it's pulled in the thread
+            # pool.
+            loop = asyncio.get_event_loop()
+            out_string = iter(out_string)
+
+            while True:
+                chunks = await loop.run_in_executor(self.executor,
+                                 _next_chunks, out_string, self.block_length)
+                if len(chunks) == 0:
+                    break
+
+                await self._send_body(send, b''.join(chunks))
+
+        await self._send_body(send, b'', more_body=False)
+
+    async def _send_start(self, send, resp_code, resp_headers):
+        await send({
+            'type': 'http.response.start',
+            'status': int(resp_code[:3]),
+            'headers': _gen_asgi_headers(resp_headers),
+        })
+
+    async def _send_body(self, send, data, more_body=True):
+        if isinstance(data, str):
+            data = data.encode('utf8')
+
+        if len(data) == 0 and more_body:
+            return
+
+        await send({
+            'type': 'http.response.body',
+            'body': bytes(data),
+            'more_body': more_body,
+        })
+
+    def _finalize(self, p_ctx):
+        p_ctx.close()
+        self.event_manager.fire_event('asgi_close', p_ctx)
+
+    # the request is parsed from the same kind of environment as the one the
+    # wsgi transport uses.
+    is_wsdl_request = WsgiApplication.is_wsdl_request
+    decompose_incoming_envelope = WsgiApplication.decompose_incoming_envelope
@@ -17,17 +17,26 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301
 #
 
-from collections import defaultdict
+import re
+import time
+import hashlib
+import threading
+
+from collections import defaultdict, OrderedDict
+from itertools import chain
 
 from email import utils
 from email.utils import encode_rfc2231
 from email.message import tspecials
 
 from spyne import TransportContext, MethodDescriptor, MethodContext, Redirect
+from spyne.model import ComplexModelBase
 from spyne.server import ServerBase
 from spyne.protocol.http import HttpPattern
-from spyne.const.http import gen_body_redirect, HTTP_301, HTTP_302, HTTP_303, \
-    HTTP_307
+from spyne.const.http import gen_body_redirect, HTTP_200, HTTP_301, \
+    HTTP_302, HTTP_303, HTTP_304, HTTP_307
+from spyne.util.compress import ENCODINGS, compress, compress_iter, \
+    negotiate_encoding
 
 
 class HttpRedirect(Redirect):
@@ -236,20 +245,335 @@ class HttpMethodContext(MethodContext):
     """Assigning an out protocol overrides the mime type of the transport."""
 
 
+def _get_single_class(p_ctx):
+    """Returns the class of the sole value the method returns, or ``None``."""
+
+    om = p_ctx.descriptor.out_message
+    if p_ctx.descriptor.is_out_bare():
+        return om
+
+    if issubclass(om, ComplexModelBase) and len(om._type_info) == 1:
+        retval, = om._type_info.values()
+        return retval
+
+
+# characters that end the literal prefix of a verb or address pattern.
+_PATTERN_META_RE = re.compile(r'[<>{}\[\]().*+?^$|\\]')
+_PATTERN_PLACEHOLDER_RE = re.compile(r'{[A-Za-z0-9_]+}')
+
+
+def _literal_prefix(pattern):
+    """Returns the part of the given pattern that any string it matches must
+    start with, and whether the pattern is a literal string as a whole."""
+
+    match = _PATTERN_META_RE.search(pattern)
+    if match is None:
+        return pattern, True
+
+    # alternation could make anything match.
+    if '|' in pattern:
+        return pattern[:0], False
+
+    end = match.start()
+
+    # quantifiers make the preceding character optional. "{name}" is a
+    # placeholder though, not a quantifier.
+    if pattern[end] in '?*' or (pattern[end] == '{' and
+                            _PATTERN_PLACEHOLDER_RE.match(pattern, end) is None):
+        end -= 1
+
+    return pattern[:max(end, 0)], False
+
+
+class _RouterNode(object):
+    __slots__ = ('children', 'patterns')
+
+    def __init__(self):
+        self.children = {}
+        self.patterns = []
+
+
+class HttpRouter(object):
+    """Indexes :class:`HttpPattern` instances so that only a handful of
+    candidates need to have their regexes evaluated for a given request.
+
+    Patterns are bucketed by their verb when it's a literal string, or in a
+    wildcard bucket otherwise. Inside every bucket, patterns whose address is
+    a literal string are put in a dict keyed by path, the rest are put in a
+    trie keyed by the literal path segments their address starts with.
+
+    :param patterns: A sequence of :class:`HttpPattern` instances in the order
+        they should be tried.
+    :param binary: When ``True``, keys are built for ``bytes`` verbs and paths,
+        as used by the Twisted transport.
+    """
+
+    def __init__(self, patterns, binary=False):
+        self.patterns = list(patterns)
+        self.binary = binary
+
+        if binary:
+            self.slash = b'/'
+        else:
+            self.slash = '/'
+
+        self._exact = defaultdict(lambda: defaultdict(list))
+        self._tries = defaultdict(_RouterNode)
+
+        for i, patt in enumerate(self.patterns):
+            self._add(i, patt)
+
+    def _add(self, index, patt):
+        verb = None
+        if patt.verb is not None:
+            prefix, is_literal = _literal_prefix(patt.verb)
+            if is_literal:
+                verb = prefix
+                if self.binary:
+                    verb = verb.encode(patt.VERB_ENCODING)
+
+        if patt.address is None:
+            # these are matched against the last path segment, so they are
+            # candidates for every path.
+            self._tries[verb].patterns.append(index)
+            return
+
+        prefix, is_literal = _literal_prefix(patt.address)
+        if self.binary:
+            prefix = prefix.encode(patt.URL_ENCODING)
+
+        if is_literal:
+            self._exact[verb][prefix].append(index)
+            return
+
+        node = self._tries[verb]
+        for segment in prefix.split(self.slash)[:-1]:
+            child = node.children.get(segment, None)
+            if child is None:
+                child = node.children[segment] = _RouterNode()
+            node = child
+
+        node.patterns.append(index)
+
+    def get_candidates(self, verb, path):
+        """Returns the patterns that could match the given verb and path, in
+        the order they were passed to the constructor."""
+
+        indexes = []
+
+        for key in (verb, None):
+            exact = self._exact.get(key, None)
+            if exact is not None:
+                indexes.extend(exact.get(path, ()))
+
+            node = self._tries.get(key, None)
+            if node is None:
+                continue
+
+            indexes.extend(node.patterns)
+            for segment in path.split(self.slash):
+                node = node.children.get(segment, None)
+                if node is None:
+                    break
+                indexes.extend(node.patterns)
+
+        indexes.sort()
+
+        return [self.patterns[i] for i in indexes]
+
+
+def _parse_etags(value):
+    return [etag.strip() for etag in value.split(',')]
+
+
+def _strip_weak(etag):
+    if etag.startswith('W/'):
+        return etag[2:]
+    return etag
+
+
+class CachedDocument(object):
+    """An interface document along with its compressed variants and the
+    validators that HTTP caches use to revalidate it.
+
+    :param data: The document as a bytestring.
+    :param mime_type: The value of the ``Content-Type`` header.
+    :param last_modified: The modification time of the document, in seconds
+        since the epoch. Defaults to now.
+    """
+
+    def __init__(self, data, mime_type, last_modified=None):
+        if last_modified is None:
+            last_modified = time.time()
+
+        self.data = data
+        self.mime_type = mime_type
+        self.last_modified = int(last_modified)
+        self.etag = '"%s"' % hashlib.sha1(data).hexdigest()
+
+        self._variants = {}
+        self._mtx_variants = threading.Lock()
+
+    def get_variant(self, encoding):
+        """Returns the document encoded with the given content coding along
+        with its entity tag. Every variant is compressed only once."""
+
+        if encoding is None:
+            return self.data, self.etag
+
+        retval = self._variants.get(encoding, None)
+        if retval is not None:
+            return retval
+
+        with self._mtx_variants:
+            retval = self._variants.get(encoding, None)
+            if retval is None:
+                # strong entity tags must differ between content codings.
+                etag = '"%s-%s"' % (self.etag[1:-1], encoding)
+                retval = self._variants[encoding] = \
+                                           compress(self.data, encoding), etag
+
+        return retval
+
+    def is_not_modified(self, etag, if_none_match=None,
+                                                      if_modified_since=None):
+        """Evaluates the conditional request headers against the variant with
+        the given entity tag as described in RFC 7232."""
+
+        if if_none_match is not None:
+            etags = [_strip_weak(e) for e in _parse_etags(if_none_match)]
+            return '*' in etags or etag in etags
+
+        if if_modified_since is not None:
+            since = utils.parsedate_tz(if_modified_since)
+            if since is not None:
+                return self.last_modified <= utils.mktime_tz(since)
+
+        return False
+
+
+class InterfaceDocumentCache(object):
+    """Caches interface documents and answers requests for them with
+    precompressed variants and the ``ETag`` and ``Last-Modified``
+    validators. Conditional requests for documents that didn't change are
+    answered with ``304 Not Modified``.
+
+    Documents are looked up by their contents, so the same document is
+    compressed only once no matter which url it was requested from.
+
+    :param encodings: The content codings to offer, in the order of
+        preference. ``br`` is only available when the ``brotli`` package is
+        installed.
+    :param min_length: Documents shorter than this many bytes are always
+        sent uncompressed.
+    :param max_size: Max. number of documents to keep. The least recently
+        added ones are dropped first.
+    """
+
+    def __init__(self, encodings=ENCODINGS, min_length=1024, max_size=4):
+        self.encodings = encodings
+        self.min_length = min_length
+        self.max_size = max_size
+
+        self.documents = OrderedDict()
+        self._mtx_documents = threading.Lock()
+
+    def find(self, data):
+        """Returns the :class:`CachedDocument` for the given bytestring, or
+        ``None`` when it's not in the cache."""
+
+        return self.documents.get(data, None)
+
+    def get(self, data, mime_type='text/xml; charset=utf-8'):
+        """Returns the :class:`CachedDocument` for the given bytestring. The
+        compressed variants are prepared right away when the document is
+        added to the cache."""
+
+        retval = self.documents.get(data, None)
+        if retval is not None:
+            return retval
+
+        with self._mtx_documents:
+            retval = self.documents.get(data, None)
+            if retval is None:
+                retval = CachedDocument(data, mime_type)
+
+                if len(retval.data) >= self.min_length:
+                    for encoding in self.encodings:
+                        retval.get_variant(encoding)
+
+                while len(self.documents) >= self.max_size:
+                    self.documents.popitem(last=False)
+
+                self.documents[data] = retval
+
+        return retval
+
+    def invalidate(self):
+        """Drops every document."""
+
+        with self._mtx_documents:
+            self.documents.clear()
+
+    def respond(self, doc, accept_encoding=None, if_none_match=None,
+                                                      if_modified_since=None):
+        """Picks the variant of the given document to send in response to a
+        request with the given headers.
+
+        :return: A ``(status, headers, body)`` tuple where ``status`` is
+            either ``HTTP_200`` or ``HTTP_304``, ``headers`` is a dict and
+            ``body`` is a bytestring.
+        """
+
+        encoding = None
+        if len(doc.data) >= self.min_length:
+            encoding = negotiate_encoding(accept_encoding, self.encodings)
+
+        data, etag = doc.get_variant(encoding)
+
+        headers = {
+            'Content-Type': doc.mime_type,
+            'ETag': etag,
+            'Last-Modified': utils.formatdate(doc.last_modified, usegmt=True),
+            'Vary': 'Accept-Encoding',
+        }
+
+        if doc.is_not_modified(etag, if_none_match, if_modified_since):
+            return HTTP_304, headers, b''
+
+        if encoding is not None:
+            headers['Content-Encoding'] = encoding
+        headers['Content-Length'] = str(len(data))
+
+        return HTTP_200, headers, data
+
+
 class HttpBase(ServerBase):
     transport = 'http://schemas.xmlsoap.org/soap/http'
 
     SLASH = '/'
     SLASHPER = '/%s'
 
+    compress_encodings = ENCODINGS + ('deflate',)
+    """The content codings that responses can be compressed with, in the order
+    of preference."""
+
+    compress_min_length = 1024
+    """Responses shorter than this many bytes are sent uncompressed."""
+
+    compress_level = 6
+    """The compression level for responses, from 1 (fastest) to 9
+    (smallest)."""
+
     def __init__(self, app, chunked=False,
                 max_content_length=2 * 1024 * 1024,
-                block_length=8 * 1024):
+                block_length=8 * 1024, compress=False):
         super(HttpBase, self).__init__(app)
 
         self.chunked = chunked
         self.max_content_length = max_content_length
         self.block_length = block_length
+        self.compress = compress
 
         self._http_patterns = set()
 
@@ -266,6 +590,110 @@ class HttpBase(ServerBase):
         self._http_patterns = list(reversed(sorted(self._http_patterns,
                                            key=lambda x: (x.address, x.host) )))
 
+        self._http_router = HttpRouter(self._http_patterns,
+                                   binary=isinstance(self.SLASH, bytes))
+
+        self.doc_cache = InterfaceDocumentCache()
+        """The :class:`InterfaceDocumentCache` that holds the wsdl documents
+        served by this transport."""
+
+        self._mtx_build_wsdl = threading.Lock()
+
+    def get_wsdl_document(self, url):
+        """Returns the wsdl document as a :class:`CachedDocument`. The
+        document is built only once per application, using the url of the
+        first request, unless it was built with a hard-coded url
+        beforehand."""
+
+        wsdl = self.doc.wsdl11.get_interface_document()
+        if wsdl is None:
+            with self._mtx_build_wsdl:
+                wsdl = self.doc.wsdl11.get_interface_document()
+                if wsdl is None:
+                    self.doc.wsdl11.build_interface_document(url)
+                    wsdl = self.doc.wsdl11.get_interface_document()
+
+        return self.doc_cache.get(wsdl)
+
+    def find_wsdl_document(self):
+        """Returns the wsdl document as a :class:`CachedDocument` when it's
+        ready to be served, ``None`` otherwise."""
+
+        wsdl = self.doc.wsdl11.get_interface_document()
+        if wsdl is None:
+            return None
+
+        return self.doc_cache.find(wsdl)
+
+    def compress_out_string(self, ctx, accept_encoding):
+        """Compresses ``ctx.out_string`` with the content coding that's most
+        preferred by the client, when response compression is enabled and
+        the method didn't opt out of it with ``@rpc(_compress=False)``.
+
+        A list of chunks is compressed in one go. Any other iterable is
+        compressed as it's consumed, so chunked responses stay streamed.
+        Only its head is read in advance, to see whether the response is
+        longer than :attr:`compress_min_length`.
+
+        Sets the ``Content-Encoding`` header and drops ``Content-Length``
+        when the response is compressed.
+
+        :param ctx: The primary method context.
+        :param accept_encoding: The value of the ``Accept-Encoding`` header.
+        :return: The content coding used, or ``None``.
+        """
+
+        if not self.compress:
+            return None
+
+        if ctx.descriptor is not None and not ctx.descriptor.compress:
+            return None
+
+        headers = ctx.transport.resp_headers
+        if headers.get('Content-Encoding', None) is not None:
+            return None
+
+        vary = headers.get('Vary', None)
+        if vary is None:
+            headers['Vary'] = 'Accept-Encoding'
+        elif 'accept-encoding' not in str(vary).lower():
+            headers['Vary'] = '%s, Accept-Encoding' % (vary,)
+
+        encoding = negotiate_encoding(accept_encoding, self.compress_encodings)
+        if encoding is None or ctx.out_string is None:
+            return None
+
+        out_string = ctx.out_string
+        if isinstance(out_string, (list, tuple)):
+            if sum(len(s) for s in out_string) < self.compress_min_length:
+                return None
+
+            ctx.out_string = [compress(b''.join(out_string), encoding,
+                                                          self.compress_level)]
+
+        else:
+            out_string = iter(out_string)
+
+            head = []
+            length = 0
+            for chunk in out_string:
+                head.append(chunk)
+                length += len(chunk)
+                if length >= self.compress_min_length:
+                    break
+
+            if length < self.compress_min_length:
+                ctx.out_string = head
+                return None
+
+            ctx.out_string = compress_iter(chain(head, out_string), encoding,
+                                                            self.compress_level)
+
+        headers['Content-Encoding'] = encoding
+        headers.pop('Content-Length', None)
+
+        return encoding
+
     @classmethod
     def get_patt_verb(cls, patt):
         return patt.verb_re
@@ -279,8 +707,10 @@ class HttpBase(ServerBase):
         return patt.address_re
 
     def match_pattern(self, ctx, method='', path='', host=''):
-        """Sets ctx.method_request_string if there's a match. It's O(n) which
-        means you should keep your number of patterns as low as possible.
+        """Sets ctx.method_request_string if there's a match. Patterns are
+        looked up in an :class:`HttpRouter` index first so only the ones whose
+        literal verb and path prefix fit the request get their regexes
+        evaluated. More specific patterns are still tried first.
 
         :param ctx: A MethodContext instance
         :param method: The verb in the HTTP Request (GET, POST, etc.)
@@ -293,51 +723,63 @@ class HttpBase(ServerBase):
             path = self.SLASHPER % (path,)
 
         params = defaultdict(list)
-        for patt in self._http_patterns:
+        for patt in self._http_router.get_candidates(method, path):
             assert isinstance(patt, HttpPattern)
 
-            if patt.verb is not None:
-                match = self.get_patt_verb(patt).match(method)
-                if match is None:
-                    continue
-                if not (match.span() == (0, len(method))):
-                    continue
+            patt_params = self._match_one_pattern(patt, method, path, host)
+            if patt_params is None:
+                continue
 
-                for k,v in match.groupdict().items():
-                    params[k].append(v)
+            for k, v in patt_params:
+                params[k].append(v)
 
-            if patt.host is not None:
-                match = self.get_patt_host(patt).match(host)
-                if match is None:
-                    continue
-                if not (match.span() == (0, len(host))):
-                    continue
+            d = patt.endpoint
+            assert isinstance(d, MethodDescriptor)
+            ctx.method_request_string = d.name
 
-                for k, v in match.groupdict().items():
-                    params[k].append(v)
+            break
 
-            if patt.address is None:
-                if path.split(self.SLASH)[-1] != patt.endpoint.name:
-                    continue
+        return params
 
-            else:
-                match = self.get_patt_address(patt).match(path)
-                if match is None:
-                    continue
+    def _match_one_pattern(self, patt, method, path, host):
+        """Returns a list of matched (key, value) pairs or None if the pattern
+        does not match."""
 
-                if not (match.span() == (0, len(path))):
-                    continue
+        retval = []
 
-                for k,v in match.groupdict().items():
-                    params[k].append(v)
+        if patt.verb is not None:
+            match = self.get_patt_verb(patt).match(method)
+            if match is None:
+                return None
+            if not (match.span() == (0, len(method))):
+                return None
 
-            d = patt.endpoint
-            assert isinstance(d, MethodDescriptor)
-            ctx.method_request_string = d.name
+            retval.extend(match.groupdict().items())
 
-            break
+        if patt.host is not None:
+            match = self.get_patt_host(patt).match(host)
+            if match is None:
+                return None
+            if not (match.span() == (0, len(host))):
+                return None
 
-        return params
+            retval.extend(match.groupdict().items())
+
+        if patt.address is None:
+            if path.split(self.SLASH)[-1] != patt.endpoint.name:
+                return None
+
+        else:
+            match = self.get_patt_address(patt).match(path)
+            if match is None:
+                return None
+
+            if not (match.span() == (0, len(path))):
+                return None
+
+            retval.extend(match.groupdict().items())
+
+        return retval
 
     @property
     def has_patterns(self):
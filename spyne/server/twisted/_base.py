@@ -17,8 +17,8 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301
 #
 
-from twisted.internet.defer import Deferred
-from twisted.internet.interfaces import IPullProducer
+from twisted.internet.defer import Deferred, fail
+from twisted.internet.interfaces import IPullProducer, IPushProducer
 from twisted.web.iweb import UNKNOWN_LENGTH
 
 from zope.interface import implementer
@@ -68,6 +68,80 @@ class Producer(object):
         self.deferred = None
 
 
+@implementer(IPushProducer)
+class PushProducer(object):
+    """Applies backpressure to push serialization. It's registered as a
+    streaming producer to a consumer (e.g. a Twisted web request), which
+    pauses it when its transport's write buffer goes over its high-water mark
+    and resumes it once the buffer is drained. It's meant to be set as the
+    ``flow_control`` attribute of :class:`spyne.model.PushBase` instances.
+    """
+
+    def __init__(self, consumer):
+        self.consumer = consumer
+        self.paused = False
+        self.stopped = False
+        self._waiting = []
+
+    def when_writable(self):
+        """Returns ``None`` when the consumer can take more data, a
+        ``Deferred`` that fires when it can otherwise."""
+
+        if self.stopped:
+            return fail(Exception("Consumer asked us to stop producing"))
+
+        if not self.paused:
+            return None
+
+        retval = Deferred()
+        self._waiting.append(retval)
+        return retval
+
+    def feed(self, pusher, insts):
+        """Appends instances from ``insts`` to ``pusher`` until either the
+        iterable is exhausted, in which case ``None`` is returned, or the
+        consumer asks us to pause, in which case a ``Deferred`` that fires
+        after the rest of the instances are appended is returned."""
+
+        insts = iter(insts)
+
+        retval = self.when_writable()
+        if retval is None:
+            for inst in insts:
+                pusher.append(inst)
+
+                # appending can make the transport pause us right away
+                if self.paused or self.stopped:
+                    break
+
+            else:
+                return None
+
+            retval = self.when_writable()
+
+        return retval.addCallback(lambda _: self.feed(pusher, insts))
+
+    def pauseProducing(self):
+        self.paused = True
+
+    def resumeProducing(self):
+        self.paused = False
+
+        waiting, self._waiting = self._waiting, []
+        for d in waiting:
+            d.callback(None)
+
+    def stopProducing(self):
+        if self.stopped:
+            return
+
+        self.stopped = True
+
+        waiting, self._waiting = self._waiting, []
+        for d in waiting:
+            d.errback(Exception("Consumer asked us to stop producing"))
+
+
 from spyne import Address
 _TYPE_MAP = {'TCP': Address.TCP4, 'TCP6': Address.TCP6,
              'UDP': Address.UDP4, 'UDP6': Address.UDP6}
@@ -76,7 +76,7 @@ from spyne.const.ansi_color import LIGHT_GREEN
 from spyne.const.ansi_color import END_COLOR
 from spyne.const.http import HTTP_404, HTTP_200
 
-from spyne.model import PushBase, File, ComplexModelBase
+from spyne.model import PushBase, File, ComplexModelBase, Iterable
 from spyne.model.fault import Fault
 
 from spyne.protocol.http import HttpRpc
@@ -84,11 +84,14 @@ from spyne.protocol.http import HttpRpc
 from spyne.server.http import HttpBase
 from spyne.server.http import HttpMethodContext
 from spyne.server.http import HttpTransportContext
-from spyne.server.twisted._base import Producer
+from spyne.server.http import _get_single_class
+from spyne.server.twisted._base import Producer, PushProducer
 from spyne.server.twisted import log_and_let_go
 
+from spyne.util.aio import iscoroutine, submit_coroutine
 from spyne.util.address import address_parser
 from six import text_type, string_types
+from six.moves.collections_abc import Iterator as AbcIterator
 from six.moves.urllib.parse import unquote
 
 if not six.PY2:
@@ -139,6 +142,13 @@ def _render_file(file, request):
     return NOT_DONE_YET
 
 
+def _get_header(request, name):
+    value = request.getHeader(name)
+    if isinstance(value, bytes):
+        value = value.decode('latin1')
+    return value
+
+
 def _set_response_headers(request, headers):
     retval = []
 
@@ -183,6 +193,9 @@ def _reconstruct_url(request):
         url_scheme = 'http'
 
     uri = _decode_path(request.uri)
+    if not six.PY2:
+        uri = uri.decode('utf8')
+
     return ''.join([url_scheme, "://", server_name, uri])
 
 
@@ -210,6 +223,10 @@ class _Transformer(object):
 
 
 class TwistedHttpTransportContext(HttpTransportContext):
+    push_producer = None
+    """The :class:`spyne.server.twisted._base.PushProducer` instance that's
+    registered to the request when the response is pushed."""
+
     def set_mime_type(self, what):
         if isinstance(what, text_type):
             what = what.encode('ascii', errors='replace')
@@ -249,6 +266,52 @@ class TwistedHttpMethodContext(HttpMethodContext):
     HttpTransportContext = TwistedHttpTransportContext
 
 
+def _coroutine_to_deferred(coro):
+    """Runs the given coroutine in the shared asyncio event loop and returns a
+    ``Deferred`` that fires with its return value in the reactor thread."""
+
+    retval = Deferred()
+
+    def _cb(future):
+        try:
+            result = future.result()
+        except BaseException as e:
+            reactor.callFromThread(retval.errback, Failure(e))
+        else:
+            reactor.callFromThread(retval.callback, result)
+
+    submit_coroutine(coro).add_done_callback(_cb)
+
+    return retval
+
+
+def _finish_push(ctx):
+    if ctx.transport.push_producer is not None:
+        ctx.transport.push_producer = None
+        ctx.out_stream.unregisterProducer()
+
+    return ctx.out_stream.finish()
+
+
+def _iterable_to_push(resource, p_ctx, ret):
+    """Turns ``ret`` into a :class:`PushBase` that feeds the instances that it
+    produces to the response at the pace of the client when it's an iterator
+    returned by a method that returns an :class:`Iterable`. Returns ``ret``
+    untouched otherwise."""
+
+    if not resource.http_transport.push_iterables:
+        return ret
+
+    if not isinstance(ret, AbcIterator) or isinstance(ret, PushBase):
+        return ret
+
+    single_class = _get_single_class(p_ctx)
+    if not (isclass(single_class) and issubclass(single_class, Iterable)):
+        return ret
+
+    return single_class.Push(lambda push: push.feed(ret))
+
+
 def _decode_path(fragment):
     if six.PY2:
         return unquote(fragment)
@@ -262,6 +325,10 @@ class TwistedHttpTransport(HttpBase):
 
     KEY_ENCODING = 'utf8'
 
+    # coroutines are run in the shared asyncio event loop, without blocking
+    # the reactor. see _coroutine_to_deferred.
+    native_coroutines = True
+
     @classmethod
     def get_patt_verb(cls, patt):
         return patt.verb_b_re
@@ -275,17 +342,38 @@ class TwistedHttpTransport(HttpBase):
         return patt.address_b_re
 
     def __init__(self, app, chunked=False, max_content_length=2 * 1024 * 1024,
-                                                         block_length=8 * 1024):
+                   block_length=8 * 1024, push_iterables=False, compress=False):
         super(TwistedHttpTransport, self).__init__(app, chunked=chunked,
-               max_content_length=max_content_length, block_length=block_length)
+               max_content_length=max_content_length, block_length=block_length,
+                                                             compress=compress)
 
+        self.push_iterables = push_iterables
         self.reactor_thread = None
         def _cb():
             self.reactor_thread = threading.current_thread()
 
         deferLater(reactor, 0, _cb)
 
+    def init_root_push(self, ret, p_ctx, others):
+        if not (ret in p_ctx.pusher_stack):
+            # pushed data is written to the request as soon as it's
+            # serialized, so the request needs to tell us when its transport's
+            # write buffer is full.
+            request = p_ctx.out_stream
+            producer = PushProducer(request)
+            request.registerProducer(producer, True)
+            request.notifyFinish() \
+                .addErrback(lambda _: producer.stopProducing())
+
+            p_ctx.transport.push_producer = producer
+
+        return super(TwistedHttpTransport, self) \
+                                            .init_root_push(ret, p_ctx, others)
+
     def pusher_init(self, p_ctx, gen, _cb_push_finish, pusher, interim):
+        if pusher.flow_control is None:
+            pusher.flow_control = p_ctx.transport.push_producer
+
         if pusher.orig_thread != self.reactor_thread:
             return deferToThread(super(TwistedHttpTransport, self).pusher_init,
                                    p_ctx, gen, _cb_push_finish, pusher, interim)
@@ -316,14 +404,14 @@ class TwistedHttpTransport(HttpBase):
                                           .pusher_try_close(ctx, pusher, retval)
 
                 if not pusher.interim:
-                    ctx.out_stream.finish()
+                    _finish_push(ctx)
 
                 return subretval
 
             def _cb_push_close(r):
                 def _eb_inner(f):
                     if not pusher.interim:
-                        ctx.out_stream.finish()
+                        _finish_push(ctx)
 
                     return f
 
@@ -331,7 +419,7 @@ class TwistedHttpTransport(HttpBase):
                     retval = super(TwistedHttpTransport, self) \
                                                .pusher_try_close(ctx, pusher, r)
                     if not pusher.interim:
-                        ctx.out_stream.finish()
+                        _finish_push(ctx)
 
                     return retval
 
@@ -348,7 +436,7 @@ class TwistedHttpTransport(HttpBase):
         super(TwistedHttpTransport, self).pusher_try_close(ctx, pusher, retval)
 
         if not pusher.interim:
-            retval = ctx.out_stream.finish()
+            retval = _finish_push(ctx)
 
         return retval
 
@@ -555,16 +643,30 @@ def get_twisted_child_with_default(res, path, request):
 class TwistedWebResource(Resource):
     """A server transport that exposes the application as a twisted web
     Resource.
+
+    Pushed responses are written at the pace of the client: Use
+    :func:`spyne.model.PushBase.feed` in push callbacks to stop serializing
+    when the transport's write buffer is full.
+
+    :param push_iterables: When ``True``, iterators returned by methods that
+        return an :class:`spyne.model.Iterable` are pushed to the response
+        using :func:`spyne.model.PushBase.feed` instead of being serialized in
+        full before the response is written. Only works with protocols that
+        support push serialization.
+    :param compress: When ``True``, responses are compressed depending on the
+        ``Accept-Encoding`` header of the request. See
+        :func:`spyne.server.http.HttpBase.compress_out_string`. Pushed
+        responses are sent uncompressed.
     """
 
     def __init__(self, app, chunked=False, max_content_length=2 * 1024 * 1024,
-                                           block_length=8 * 1024, prepath=None):
+                   block_length=8 * 1024, prepath=None, push_iterables=False,
+                                                                compress=False):
         Resource.__init__(self)
         self.app = app
 
         self.http_transport = TwistedHttpTransport(app, chunked,
-                                            max_content_length, block_length)
-        self._wsdl = None
+                  max_content_length, block_length, push_iterables, compress)
         self.prepath = prepath
 
     def getChildWithDefault(self, path, request):
@@ -643,7 +745,22 @@ class TwistedWebResource(Resource):
                 return self.handle_rpc_error(p_ctx, others, p_ctx.out_error,
                                                                         request)
 
-        ret = p_ctx.out_object[0]
+        # async def methods that return multiple values return a coroutine
+        # that's not wrapped in a list.
+        if iscoroutine(p_ctx.out_object):
+            ret = p_ctx.out_object
+
+        else:
+            ret = p_ctx.out_object[0]
+
+        if iscoroutine(ret):
+            ret = _coroutine_to_deferred(ret)
+
+        elif len(p_ctx.out_object) == 1:
+            ret = _iterable_to_push(self, p_ctx, ret)
+            if isinstance(ret, PushBase):
+                p_ctx.out_object = [ret]
+
         retval = NOT_DONE_YET
         if isinstance(ret, Deferred):
             ret.addCallback(_cb_deferred, request, p_ctx, others, resource=self)
@@ -679,23 +796,27 @@ class TwistedWebResource(Resource):
         if self.http_transport.doc.wsdl11 is None:
             return HTTP_404
 
-        if self._wsdl is None:
-            self._wsdl = self.http_transport.doc.wsdl11.get_interface_document()
+        try:
+            doc = self.http_transport.get_wsdl_document(url)
+            ctx.transport.wsdl = doc.data
 
-        ctx.transport.wsdl = self._wsdl
-        _set_response_headers(request, ctx.transport.resp_headers)
+            self.http_transport.event_manager.fire_event('wsdl', ctx)
 
-        try:
-            if self._wsdl is None:
-                self.http_transport.doc.wsdl11.build_interface_document(url)
-                ctx.transport.wsdl = self._wsdl = \
-                         self.http_transport.doc.wsdl11.get_interface_document()
+            if ctx.transport.wsdl is doc.data:
+                code, headers, retval = self.http_transport.doc_cache.respond(
+                                    doc, _get_header(request, b'accept-encoding'),
+                                    _get_header(request, b'if-none-match'),
+                                    _get_header(request, b'if-modified-since'))
+                ctx.transport.resp_headers.update(headers)
 
-            assert ctx.transport.wsdl is not None
+            else:
+                # an event handler replaced the document, so it's sent as is.
+                code, retval = HTTP_200, ctx.transport.wsdl
 
-            self.http_transport.event_manager.fire_event('wsdl', ctx)
+            request.setResponseCode(int(code[:3]))
+            _set_response_headers(request, ctx.transport.resp_headers)
 
-            return ctx.transport.wsdl
+            return retval
 
         except Exception as e:
             ctx.transport.wsdl_error = e
@@ -744,6 +865,11 @@ def _cb_deferred(ret, request, p_ctx, others, resource, cb=True):
     else:
         p_ctx.out_object = ret
 
+    if cb:
+        ret = _iterable_to_push(resource, p_ctx, ret)
+        if isinstance(ret, PushBase):
+            p_ctx.out_object = [ret]
+
     ### start response
     retval = NOT_DONE_YET
 
@@ -775,6 +901,15 @@ def _cb_deferred(ret, request, p_ctx, others, resource, cb=True):
         ret = resource.http_transport.get_out_string(p_ctx)
 
         if not isinstance(ret, Deferred):
+            # protocols that serialize straight to the request have already
+            # sent the headers.
+            if not request.startedWriting:
+                encoding = resource.http_transport.compress_out_string(p_ctx,
+                                      _get_header(request, b'accept-encoding'))
+                _set_response_headers(request, p_ctx.transport.resp_headers)
+                if encoding is not None:
+                    request.responseHeaders.removeHeader(b'content-length')
+
             producer = Producer(p_ctx.out_string, request)
             producer.deferred \
                 .addCallback(_cb_request_finished, request, p_ctx) \
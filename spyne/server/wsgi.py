@@ -27,11 +27,12 @@ logic.
 import logging
 logger = logging.getLogger(__name__)
 
-import cgi
-import threading
+import mmap
+import tempfile
 
 from inspect import isgenerator
 from itertools import chain
+from email.message import Message
 
 from spyne import Address, File, Fault
 from six.moves.http_cookies import SimpleCookie
@@ -48,6 +49,7 @@ from spyne.util.address import address_parser
 from spyne.const.ansi_color import LIGHT_GREEN
 from spyne.const.ansi_color import END_COLOR
 from spyne.const.http import HTTP_200
+from spyne.const.http import HTTP_304
 from spyne.const.http import HTTP_404
 from spyne.const.http import HTTP_500
 
@@ -170,6 +172,18 @@ def _gen_http_headers(headers):
     return retval
 
 
+def _get_charset(content_type):
+    """Returns the charset parameter of the given ``Content-Type`` header
+    value, or ``None``."""
+
+    if not content_type:
+        return None
+
+    msg = Message()
+    msg['Content-Type'] = content_type
+    return msg.get_param('charset', None)
+
+
 class WsgiTransportContext(HttpTransportContext):
     """The class that is used in the transport attribute of the
     :class:`WsgiMethodContext` class."""
@@ -254,6 +268,11 @@ class WsgiApplication(HttpBase):
     Wsdl from another location, which can make testing a bit difficult. Use in
     moderation.
 
+    The wsdl document is served from :attr:`doc_cache`, compressed when the
+    client accepts it, with ``ETag`` and ``Last-Modified`` headers. Requests
+    with matching ``If-None-Match`` or ``If-Modified-Since`` headers get a
+    ``304 Not Modified`` response.
+
     Supported events:
         * ``wsdl``
             Called right before the wsdl data is returned to the client.
@@ -277,18 +296,26 @@ class WsgiApplication(HttpBase):
         * ``wsgi_close``
             Called after the whole data has been returned to the client. It's
             called both from success and error cases.
+
+    When the request has a ``Content-Length`` header, its body is read into a
+    single preallocated buffer, which is passed to the protocol as-is. Bodies
+    larger than ``mmap_threshold`` bytes are read into an mmap'd temporary
+    file instead, so that they can be paged out to disk instead of swap.
+    ``None`` disables spilling to disk.
+
+    With ``compress=True``, responses are compressed with gzip, deflate or,
+    when the ``brotli`` package is installed, br, depending on the
+    ``Accept-Encoding`` header of the request. Chunked responses are
+    compressed as they're streamed. See :func:`HttpBase.compress_out_string`.
     """
 
     def __init__(self, app, chunked=True, max_content_length=2 * 1024 * 1024,
-                                                         block_length=8 * 1024):
+                                  block_length=8 * 1024, mmap_threshold=None,
+                                                                compress=False):
         super(WsgiApplication, self).__init__(app, chunked, max_content_length,
-                                                                   block_length)
-
-        self._mtx_build_interface_document = threading.Lock()
+                                                 block_length, compress=compress)
 
-        self._wsdl = None
-        if self.doc.wsdl11 is not None:
-            self._wsdl = self.doc.wsdl11.get_interface_document()
+        self.mmap_threshold = mmap_threshold
 
     def __call__(self, req_env, start_response, wsgi_url=None):
         """This method conforms to the WSGI spec for callable wsgi applications
@@ -333,46 +360,43 @@ class WsgiApplication(HttpBase):
                                   _gen_http_headers(ctx.transport.resp_headers))
             return [HTTP_404]
 
-        if self._wsdl is None:
-            self._wsdl = self.doc.wsdl11.get_interface_document()
-
-        ctx.transport.wsdl = self._wsdl
-
-        if ctx.transport.wsdl is None:
-            try:
-                self._mtx_build_interface_document.acquire()
-
-                ctx.transport.wsdl = self._wsdl
-
-                if ctx.transport.wsdl is None:
-                    self.doc.wsdl11.build_interface_document(url)
-                    ctx.transport.wsdl = self._wsdl = \
-                                        self.doc.wsdl11.get_interface_document()
+        try:
+            doc = self.get_wsdl_document(url)
 
-            except Exception as e:
-                logger.exception(e)
-                ctx.transport.wsdl_error = e
+        except Exception as e:
+            logger.exception(e)
+            ctx.transport.wsdl_error = e
 
-                self.event_manager.fire_event('wsdl_exception', ctx)
+            self.event_manager.fire_event('wsdl_exception', ctx)
 
-                start_response(HTTP_500,
+            start_response(HTTP_500,
                                   _gen_http_headers(ctx.transport.resp_headers))
 
-                return [HTTP_500]
+            return [HTTP_500]
 
-            finally:
-                self._mtx_build_interface_document.release()
+        ctx.transport.wsdl = doc.data
 
         self.event_manager.fire_event('wsdl', ctx)
 
-        ctx.transport.resp_headers['Content-Length'] = \
-                                                    str(len(ctx.transport.wsdl))
-        start_response(HTTP_200, _gen_http_headers(ctx.transport.resp_headers))
+        if ctx.transport.wsdl is doc.data:
+            code, headers, retval = self.doc_cache.respond(doc,
+                                    req_env.get('HTTP_ACCEPT_ENCODING'),
+                                    req_env.get('HTTP_IF_NONE_MATCH'),
+                                    req_env.get('HTTP_IF_MODIFIED_SINCE'))
+            ctx.transport.resp_headers.update(headers)
 
-        retval = ctx.transport.wsdl
+        else:
+            # an event handler replaced the document, so it's sent as is.
+            code, retval = HTTP_200, ctx.transport.wsdl
+            ctx.transport.resp_headers['Content-Length'] = str(len(retval))
+
+        start_response(code, _gen_http_headers(ctx.transport.resp_headers))
 
         ctx.close()
 
+        if code == HTTP_304:
+            return []
+
         return [retval]
 
     def handle_error(self, p_ctx, others, error, start_response):
@@ -393,6 +417,9 @@ class WsgiApplication(HttpBase):
         # consume the generator to get the length
         p_ctx.out_string = list(p_ctx.out_string)
 
+        self.compress_out_string(p_ctx,
+                            p_ctx.transport.req_env.get('HTTP_ACCEPT_ENCODING'))
+
         p_ctx.transport.resp_headers['Content-Length'] = \
                                     str(sum((len(s) for s in p_ctx.out_string)))
         self.event_manager.fire_event('wsgi_exception', p_ctx)
@@ -491,7 +518,9 @@ class WsgiApplication(HttpBase):
             if 'Content-Length' in p_ctx.transport.resp_headers:
                 del p_ctx.transport.resp_headers['Content-Length']
         else:
-            p_ctx.out_string = [''.join(p_ctx.out_string)]
+            p_ctx.out_string = [b''.join(p_ctx.out_string)]
+
+        self.compress_out_string(p_ctx, req_env.get('HTTP_ACCEPT_ENCODING'))
 
         try:
             len(p_ctx.out_string)
@@ -523,26 +552,30 @@ class WsgiApplication(HttpBase):
     def __reconstruct_wsgi_request(self, http_env):
         """Reconstruct http payload using information in the http header."""
 
-        content_type = http_env.get("CONTENT_TYPE")
-        charset = None
-        if content_type is not None:
-            # fyi, here's what the parse_header function returns:
-            # >>> import cgi; cgi.parse_header("text/xml; charset=utf-8")
-            # ('text/xml', {'charset': 'utf-8'})
-            content_type = cgi.parse_header(content_type)
-            charset = content_type[1].get('charset', None)
+        charset = _get_charset(http_env.get("CONTENT_TYPE"))
 
         return self.__wsgi_input_to_iterable(http_env), charset
 
     def __wsgi_input_to_iterable(self, http_env):
         istream = http_env.get('wsgi.input')
 
-        length = str(http_env.get('CONTENT_LENGTH', self.max_content_length))
+        length = http_env.get('CONTENT_LENGTH', None)
+        if length is None:
+            return self.__wsgi_input_to_chunks(istream,
+                                                        self.max_content_length)
+
+        length = str(length)
         if len(length) == 0:
             length = 0
         else:
             length = int(length)
 
+        return self.__wsgi_input_to_buffer(istream, length)
+
+    def __wsgi_input_to_chunks(self, istream, length):
+        """Used when the request length is not known in advance. Yields chunks
+        of at most ``self.block_length`` bytes."""
+
         if length > self.max_content_length:
             raise RequestTooLongError()
         bytes_read = 0
@@ -561,6 +594,56 @@ class WsgiApplication(HttpBase):
 
             yield data
 
+    def __wsgi_input_to_buffer(self, istream, length):
+        """Reads the whole request into a single buffer of ``length`` bytes
+        and yields it without copying it once more."""
+
+        if length > self.max_content_length:
+            raise RequestTooLongError()
+
+        if length == 0:
+            return
+
+        if self.mmap_threshold is not None and length > self.mmap_threshold:
+            with tempfile.TemporaryFile() as f:
+                f.truncate(length)
+                buf = mmap.mmap(f.fileno(), length)
+
+        else:
+            buf = bytearray(length)
+
+        view = memoryview(buf)
+        readinto = getattr(istream, 'readinto', None)
+        bytes_read = 0
+
+        while bytes_read < length:
+            bytes_to_read = min(self.block_length, length - bytes_read)
+            chunk = view[bytes_read:bytes_read + bytes_to_read]
+
+            if readinto is not None:
+                num_read = readinto(chunk)
+
+            else:
+                data = istream.read(bytes_to_read)
+                num_read = 0 if data is None else len(data)
+                chunk[:num_read] = data[:num_read]
+
+            if not num_read:
+                break
+
+            bytes_read += num_read
+
+        if isinstance(buf, bytearray):
+            # a bytearray can't be resized while there are views into it
+            del chunk, view
+            if bytes_read < length:
+                del buf[bytes_read:]
+
+            yield buf
+
+        else:
+            yield view[:bytes_read]
+
     def decompose_incoming_envelope(self, prot, ctx, message):
         """This function is only called by the HttpRpc protocol to have the wsgi
         environment parsed into ``ctx.in_body_doc`` and ``ctx.in_header_doc``.
@@ -17,10 +17,24 @@
 #
 
 """The ``spyne.server.zeromq`` module contains a server implementation that
-uses ZeroMQ (zmq.REP) as transport.
+uses ZeroMQ (zmq.REP) as transport, along with variants that process
+several requests at once.
 """
+
+import logging
+logger = logging.getLogger(__name__)
+
+import os
+import time
+import errno
+import shutil
+import signal
+import tempfile
 import threading
 
+from collections import deque
+from multiprocessing.pool import ThreadPool
+
 import zmq
 
 from spyne.auxproc import process_contexts
@@ -28,6 +42,14 @@ from spyne.context import MethodContext
 from spyne.server import ServerBase
 
 
+# sent by the workers of ZeroMQPreforkServer when they're ready for a request.
+_WORKER_READY = b'\x01'
+
+
+def _worker_identity(pid):
+    return str(pid).encode('ascii')
+
+
 class ZmqMethodContext(MethodContext):
     def __init__(self, app):
         super(ZmqMethodContext, self).__init__(app, MethodContext.SERVER)
@@ -67,45 +89,192 @@ class ZeroMQServer(ServerBase):
         return super(ZeroMQServer, self).generate_contexts(ctx,
                                             in_string_charset=in_string_charset)
 
-    def serve_forever(self):
-        """Runs the ZeroMQ server."""
+    def handle_request(self, in_string):
+        """Processes the given request message and returns the response
+        message."""
 
-        while True:
-            error = None
+        error = None
+
+        initial_ctx = ZmqMethodContext(self)
+        initial_ctx.in_string = [in_string]
 
-            initial_ctx = ZmqMethodContext(self)
-            initial_ctx.in_string = [self.zmq_socket.recv()]
+        contexts = self.generate_contexts(initial_ctx)
+        p_ctx, others = contexts[0], contexts[1:]
 
-            contexts = self.generate_contexts(initial_ctx)
-            p_ctx, others = contexts[0], contexts[1:]
+        # TODO: Rate limiting
+        p_ctx.active = True
 
-            # TODO: Rate limiting
-            p_ctx.active = True
+        if p_ctx.in_error:
+            p_ctx.out_object = p_ctx.in_error
+            error = p_ctx.in_error
+
+        else:
+            self.get_in_object(p_ctx)
 
             if p_ctx.in_error:
                 p_ctx.out_object = p_ctx.in_error
                 error = p_ctx.in_error
-
             else:
-                self.get_in_object(p_ctx)
-
-                if p_ctx.in_error:
-                    p_ctx.out_object = p_ctx.in_error
-                    error = p_ctx.in_error
-                else:
-                    self.get_out_object(p_ctx)
-                    if p_ctx.out_error:
-                        p_ctx.out_object = p_ctx.out_error
-                        error = p_ctx.out_error
+                self.get_out_object(p_ctx)
+                if p_ctx.out_error:
+                    p_ctx.out_object = p_ctx.out_error
+                    error = p_ctx.out_error
 
-            self.get_out_string(p_ctx)
+        self.get_out_string(p_ctx)
 
-            process_contexts(self, others, error)
+        process_contexts(self, others, p_ctx, error=error)
 
-            self.zmq_socket.send(b''.join(p_ctx.out_string))
+        try:
+            return b''.join(p_ctx.out_string)
 
+        finally:
             p_ctx.close()
 
+    def serve_forever(self):
+        """Runs the ZeroMQ server."""
+
+        while True:
+            self.zmq_socket.send(self.handle_request(self.zmq_socket.recv()))
+
+
+class ZeroMQRouterServer(ZeroMQServer):
+    """A ZeroMQ server transport that keeps many requests in flight on a
+    single ``zmq.ROUTER`` socket.
+
+    Requests are dispatched to a worker pool and responses are sent as soon
+    as they are ready, in whatever order they are finished, so one slow
+    method doesn't stall the other clients of the socket. Every response is
+    sent with the frames that preceded the request body, so ``zmq.REQ``
+    clients work as usual and ``zmq.DEALER`` clients can have many requests
+    in flight by putting a request id before the empty delimiter frame.
+
+    :param app: The :class:`spyne.Application` instance.
+    :param app_url: The url to bind the ``zmq.ROUTER`` socket to.
+    :param pool_size: The number of threads in the default worker pool.
+    :param pool: An object with the ``apply_async(func, args)`` method of
+        :class:`multiprocessing.pool.ThreadPool`, like the pool of
+        :class:`spyne.auxproc.thread.ThreadAuxProc`. Requests are processed
+        by a new ``ThreadPool(pool_size)`` when ``None``.
+    :param max_pending: Max. number of requests that are being processed at
+        the same time. New requests are left in the socket queue until one of
+        them is finished. Unlimited when ``None``.
+    """
+
+    poll_interval = 1.0
+    """Number of seconds between two checks for :func:`shutdown` calls when
+    idle."""
+
+    def __init__(self, app, app_url, pool_size=4, pool=None, max_pending=None,
+                                          wsdl_url=None, ctx=None, socket=None):
+        self._own_ctx = ctx is None and socket is None
+        if socket is None:
+            if ctx is None:
+                ctx = zmq.Context()
+
+            socket = ctx.socket(zmq.ROUTER)
+            socket.bind(app_url)
+
+        super(ZeroMQRouterServer, self).__init__(app, app_url,
+                                   wsdl_url=wsdl_url, ctx=ctx, socket=socket)
+
+        self._own_pool = pool is None
+        if self._own_pool:
+            pool = ThreadPool(pool_size)
+
+        self.pool = pool
+        self.max_pending = max_pending
+
+        self.num_pending = 0
+        """The number of requests that were dispatched to the pool but not
+        yet replied to."""
+
+        # zmq sockets are not thread-safe. the workers send the responses to
+        # the thread that runs serve_forever() over this inproc pipe.
+        self._reply_url = 'inproc://spyne-zmq-reply-%x' % id(self)
+        self._reply_socket = self.ctx.socket(zmq.PULL)
+        self._reply_socket.bind(self._reply_url)
+
+        self._worker_socket = self.ctx.socket(zmq.PUSH)
+        self._worker_socket.connect(self._reply_url)
+        self._mtx_worker_socket = threading.Lock()
+
+        self._shutdown = False
+
+    def shutdown(self):
+        """Stops accepting new requests and makes :func:`serve_forever` return
+        once the requests that are being processed are finished."""
+
+        self._shutdown = True
+
+    def process_message(self, frames):
+        """Processes a request received from the ``zmq.ROUTER`` socket in the
+        worker pool and sends the response back to the thread running
+        :func:`serve_forever`."""
+
+        envelope, in_string = frames[:-1], frames[-1]
+
+        try:
+            out_string = self.handle_request(in_string)
+
+        except Exception as e:
+            logger.exception(e)
+            # an empty envelope only tells the server loop we're done.
+            envelope, out_string = [], b''
+
+        with self._mtx_worker_socket:
+            self._worker_socket.send_multipart(envelope + [out_string])
+
+    def serve_forever(self):
+        """Runs the ZeroMQ server."""
+
+        poller = zmq.Poller()
+        poller.register(self._reply_socket, zmq.POLLIN)
+
+        accepting = False
+        poll_interval = int(self.poll_interval * 1000)
+
+        try:
+            while True:
+                can_accept = not self._shutdown and (self.max_pending is None
+                                      or self.num_pending < self.max_pending)
+
+                if can_accept and not accepting:
+                    poller.register(self.zmq_socket, zmq.POLLIN)
+                    accepting = True
+
+                elif accepting and not can_accept:
+                    poller.unregister(self.zmq_socket)
+                    accepting = False
+
+                if self._shutdown and self.num_pending <= 0:
+                    break
+
+                events = dict(poller.poll(poll_interval))
+
+                if events.get(self._reply_socket) == zmq.POLLIN:
+                    frames = self._reply_socket.recv_multipart()
+                    self.num_pending -= 1
+
+                    if len(frames) > 1:
+                        self.zmq_socket.send_multipart(frames)
+
+                if events.get(self.zmq_socket) == zmq.POLLIN:
+                    frames = self.zmq_socket.recv_multipart()
+                    self.num_pending += 1
+
+                    self.pool.apply_async(self.process_message, (frames,))
+
+        finally:
+            if self._own_pool:
+                self.pool.close()
+
+            self._worker_socket.close()
+            self._reply_socket.close()
+            self.zmq_socket.close()
+
+            if self._own_ctx:
+                self.ctx.term()
+
 
 class ZeroMQThreadPoolServer(object):
     """Create a ZeroMQ server transport with several background workers,
@@ -162,3 +331,334 @@ class ZeroMQThreadPoolServer(object):
         # We never get here...
         self.frontend.close()
         self.backend.close()
+
+
+class ZeroMQPreforkServer(object):
+    """Create a ZeroMQ server transport with several worker processes. As
+    every worker has its own interpreter, CPU-bound work like serialization is
+    spread to as many cores as there are workers.
+
+    The parent process accepts requests from clients using a ``zmq.ROUTER``
+    socket and hands each of them to an idle worker. The workers are forked
+    from it and connect to another ``zmq.ROUTER`` socket that's bound to an
+    ``ipc://`` address. They share nothing but the application definition
+    that exists at the time :func:`serve_forever` is called.
+
+    The parent process also supervises the workers: Crashed workers are
+    replaced by new ones, and the request they were processing is dropped.
+    Workers that keep crashing soon after they are started are restarted
+    with an exponentially growing delay, up to ``max_restart_delay`` seconds.
+    When :func:`shutdown` is called, or the parent gets ``SIGTERM`` or
+    ``SIGINT``, new requests are no longer accepted. Requests that are being
+    processed are given ``drain_timeout`` seconds to finish before the
+    workers are terminated.
+
+    The constructor signature is the same as that of
+    :class:`ZeroMQThreadPoolServer`. """
+
+    drain_timeout = 30
+    """Number of seconds to wait for the requests that are being processed
+    to finish on shutdown."""
+
+    poll_interval = 1.0
+    """Number of seconds between two checks for crashed workers when idle."""
+
+    min_uptime = 5.0
+    """Workers that exit sooner than this many seconds after they were
+    started are restarted after a delay."""
+
+    restart_delay = 0.1
+    """The delay before the first restart of a worker that exited too soon,
+    in seconds. It's doubled every time the worker exits too soon again."""
+
+    max_restart_delay = 30.0
+    """The max. delay before the restart of a worker, in seconds."""
+
+    def __init__(self, app, app_url, pool_size, wsdl_url=None, ctx=None,
+                                                                   socket=None):
+        if ctx and socket and ctx is not socket.context:
+            raise ValueError("ctx should be the same as socket.context")
+
+        self.app = app
+        self.app_url = app_url
+        self.pool_size = pool_size
+        self.wsdl_url = wsdl_url
+
+        if ctx:
+            self.ctx = ctx
+        elif socket:
+            self.ctx = socket.context
+        else:
+            self.ctx = zmq.Context()
+
+        if socket:
+            self.frontend = socket
+        else:
+            self.frontend = self.ctx.socket(zmq.ROUTER)
+            self.frontend.bind(app_url)
+
+        self.ipc_dir = tempfile.mkdtemp(prefix='spyne-zmq-')
+        self.backend_url = 'ipc://{dir}/{tns}.{name}'.format(dir=self.ipc_dir,
+                                            tns=self.app.tns, name=self.app.name)
+
+        self.backend = self.ctx.socket(zmq.ROUTER)
+        self.backend.bind(self.backend_url)
+
+        self.workers = {}
+        """A dict of worker pids to worker indexes."""
+
+        self.idle_workers = deque()
+        """The pids of the workers that are ready to process a request, in
+        the order they became ready."""
+
+        self.busy_workers = set()
+        """The pids of the workers that are processing a request."""
+
+        self._started = {}
+        self._restart_delays = {}
+        self._pending_restarts = {}
+
+        self._shutdown = False
+
+    @property
+    def num_pending(self):
+        """The number of requests that were sent to workers but not yet
+        replied to."""
+
+        return len(self.busy_workers)
+
+    def shutdown(self):
+        """Stops accepting new requests and makes :func:`serve_forever` return
+        once the requests that are being processed are finished. It's safe to
+        call from signal handlers."""
+
+        self._shutdown = True
+
+    def start_worker(self, i):
+        """Forks the ``i``th worker process and returns its pid."""
+
+        pid = os.fork()
+        if pid != 0:
+            logger.debug("Started worker %d with pid %d", i, pid)
+            self.workers[pid] = i
+            self._started[pid] = time.time()
+            return pid
+
+        # this is the child process.
+        retval = 0
+        try:
+            self.run_worker(i)
+
+        except BaseException as e:
+            logger.exception(e)
+            retval = 1
+
+        finally:
+            # make sure the parent's cleanup handlers don't run in the child.
+            os._exit(retval)
+
+    def run_worker(self, i):
+        """Serves requests in the ``i``th worker process. The zmq context of
+        the parent process can't be used after forking, so a new one is
+        created."""
+
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+        # Ctrl-C is sent to the whole process group. it's the parent who
+        # decides when to stop the workers.
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+        # don't outlive the supervisor if it gets killed.
+        ppid = os.getppid()
+        def _watch_parent():
+            while os.getppid() == ppid:
+                time.sleep(self.poll_interval)
+
+            logger.error("Parent process %d is gone, exiting.", ppid)
+            os._exit(1)
+
+        watcher = threading.Thread(target=_watch_parent)
+        watcher.daemon = True
+        watcher.start()
+
+        ctx = zmq.Context()
+        socket = ctx.socket(zmq.DEALER)
+        socket.setsockopt(zmq.IDENTITY, _worker_identity(os.getpid()))
+        socket.connect(self.backend_url)
+
+        worker = ZeroMQServer(self.app, self.backend_url, ctx=ctx,
+                                                                 socket=socket)
+
+        # the parent only sends requests to workers that asked for one.
+        socket.send(_WORKER_READY)
+        while True:
+            frames = socket.recv_multipart()
+            socket.send_multipart(frames[:-1] +
+                                           [worker.handle_request(frames[-1])])
+
+    def supervise(self):
+        """Reaps the worker processes that exited and replaces them unless the
+        server is shutting down. Workers that exited too soon are replaced
+        once their restart delay is over."""
+
+        now = time.time()
+
+        while len(self.workers) > 0:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except OSError as e:
+                if e.errno == errno.ECHILD:
+                    break
+                raise
+
+            if pid == 0:
+                break
+
+            i = self.workers.pop(pid, None)
+            if i is None:
+                continue
+
+            started = self._started.pop(pid)
+            if pid in self.idle_workers:
+                self.idle_workers.remove(pid)
+
+            if pid in self.busy_workers:
+                self.busy_workers.discard(pid)
+                logger.error("Worker %d with pid %d died while processing a "
+                                             "request, dropping it.", i, pid)
+
+            if self._shutdown:
+                continue
+
+            if now - started < self.min_uptime:
+                delay = self._restart_delays.get(i, None)
+                if delay is None:
+                    delay = self.restart_delay
+                else:
+                    delay = min(delay * 2, self.max_restart_delay)
+            else:
+                delay = 0
+
+            self._restart_delays[i] = delay
+            self._pending_restarts[i] = now + delay
+
+            logger.error("Worker %d with pid %d exited with status %d, "
+                      "restarting in %.1f second(s).", i, pid, status, delay)
+
+        if self._shutdown:
+            self._pending_restarts.clear()
+            return
+
+        for i, start_at in list(self._pending_restarts.items()):
+            if start_at <= now:
+                del self._pending_restarts[i]
+                self.start_worker(i)
+
+    def serve_forever(self):
+        """Runs the ZeroMQ server."""
+
+        for i in range(self.pool_size):
+            self.start_worker(i)
+
+        old_handlers = {}
+        # signal handlers can only be set from the main thread.
+        if isinstance(threading.current_thread(), threading._MainThread):
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                old_handlers[signum] = signal.signal(signum,
+                                                 lambda *_: self.shutdown())
+
+        try:
+            self._proxy()
+
+        finally:
+            for signum, handler in old_handlers.items():
+                signal.signal(signum, handler)
+
+            self._stop_workers()
+
+            self.frontend.close()
+            self.backend.close()
+            shutil.rmtree(self.ipc_dir, ignore_errors=True)
+
+    def _get_poll_timeout(self):
+        retval = self.poll_interval
+        if len(self._pending_restarts) > 0:
+            retval = min(retval,
+                        min(self._pending_restarts.values()) - time.time())
+
+        return max(0, int(retval * 1000))
+
+    def _proxy(self):
+        poller = zmq.Poller()
+        poller.register(self.backend, zmq.POLLIN)
+
+        accepting = False
+        deadline = None
+
+        while True:
+            if self._shutdown:
+                if deadline is None:
+                    logger.info("Shutting down, waiting for %d pending "
+                                          "request(s)", self.num_pending)
+                    deadline = time.time() + self.drain_timeout
+
+                if self.num_pending <= 0:
+                    break
+
+                if time.time() > deadline:
+                    logger.warning("Gave up waiting for %d pending "
+                                              "request(s)", self.num_pending)
+                    break
+
+            # requests are left in the frontend queue until a worker is free.
+            can_accept = not self._shutdown and len(self.idle_workers) > 0
+            if can_accept and not accepting:
+                poller.register(self.frontend, zmq.POLLIN)
+                accepting = True
+
+            elif accepting and not can_accept:
+                poller.unregister(self.frontend)
+                accepting = False
+
+            events = dict(poller.poll(self._get_poll_timeout()))
+
+            if events.get(self.backend) == zmq.POLLIN:
+                frames = self.backend.recv_multipart()
+                pid = int(frames[0])
+
+                if frames[1:] != [_WORKER_READY]:
+                    self.frontend.send_multipart(frames[1:])
+                    self.busy_workers.discard(pid)
+
+                if pid in self.workers:
+                    self.idle_workers.append(pid)
+
+            if events.get(self.frontend) == zmq.POLLIN:
+                pid = self.idle_workers.popleft()
+                self.busy_workers.add(pid)
+
+                self.backend.send_multipart([_worker_identity(pid)] +
+                                               self.frontend.recv_multipart())
+
+            self.supervise()
+
+    def _stop_workers(self):
+        self._shutdown = True
+
+        for pid in self.workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except OSError as e:
+                if e.errno != errno.ESRCH:
+                    raise
+
+        for pid in self.workers:
+            try:
+                os.waitpid(pid, 0)
+            except OSError as e:
+                if e.errno != errno.ECHILD:
+                    raise
+
+        self.workers.clear()
+        self.idle_workers.clear()
+        self.busy_workers.clear()
@@ -175,7 +175,9 @@ class ServiceBaseBase(object):
 
         :param ctx: The method context.
 
-        The overriding function must call this function by convention.
+        The overriding function must call this function by convention. Note
+        that the return value is a coroutine when the method is defined with
+        ``async def``, see ``ctx.descriptor.is_coroutine``.
         """
 
         if ctx.function is not None:
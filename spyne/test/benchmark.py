@@ -0,0 +1,538 @@
+#!/usr/bin/env python
+#
+# spyne - Copyright (C) Spyne contributors.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301
+#
+
+"""Benchmarks the whole request pipeline for every supported pair of input and
+output protocols. Nothing outside of Spyne's own dependencies is needed:
+requests are either passed to a :class:`spyne.server.null.NullServer` (which
+skips parsing the request) or to a :class:`spyne.server.wsgi.WsgiApplication`
+that's called in-process.
+
+Results are written as json. When a previous result file is passed as
+baseline, requests/s figures that got worse by more than the given tolerance
+are reported and the exit code is non-zero. ::
+
+    spyne_benchmark -o before.json
+    # upgrade things
+    spyne_benchmark --baseline before.json
+"""
+
+from __future__ import print_function
+
+import logging
+logger = logging.getLogger(__name__)
+
+import gc
+import sys
+import json
+import platform
+
+from io import BytesIO
+from datetime import datetime
+from argparse import ArgumentParser
+from collections import namedtuple
+
+try:
+    from time import perf_counter as _clock
+except ImportError:  # Python 2
+    from time import time as _clock
+
+try:
+    import tracemalloc
+except ImportError:  # Python 2
+    tracemalloc = None
+
+import spyne
+
+from spyne import Application, Service, srpc
+from spyne.client import RemoteProcedureBase
+from spyne.model import ComplexModel, Array, Boolean, DateTime, Double, \
+    Integer, Unicode
+from spyne.protocol.csv import Csv
+from spyne.protocol.dictdoc import HierDictDocument
+from spyne.protocol.html import HtmlCloth
+from spyne.protocol.http import HttpRpc
+from spyne.protocol.json import JsonDocument
+from spyne.protocol.soap import Soap11
+from spyne.protocol.xml import XmlDocument
+from spyne.server.null import NullServer
+from spyne.server.wsgi import WsgiApplication
+from spyne.util import six
+from spyne.util.six.moves.urllib.parse import urlencode
+
+try:
+    from spyne.protocol.msgpack import MessagePackDocument
+except ImportError:
+    MessagePackDocument = None
+
+
+TNS = 'spyne.test.benchmark'
+
+
+class BenchmarkLeaf(ComplexModel):
+    __namespace__ = TNS
+
+    i = Integer
+    f = Double
+    s = Unicode
+    b = Boolean
+    dt = DateTime
+
+
+class BenchmarkBranch(ComplexModel):
+    __namespace__ = TNS
+
+    name = Unicode
+    leaf = BenchmarkLeaf
+    leaves = Array(BenchmarkLeaf)
+
+
+class BenchmarkTree(ComplexModel):
+    __namespace__ = TNS
+
+    id = Integer
+    branch = BenchmarkBranch
+    branches = Array(BenchmarkBranch)
+
+
+class BenchmarkService(Service):
+    @srpc(Unicode, _returns=Unicode)
+    def echo_flat(s):
+        return s
+
+    @srpc(BenchmarkTree, _returns=BenchmarkTree)
+    def echo_nested(t):
+        return t
+
+    @srpc(Array(BenchmarkLeaf), _returns=Array(BenchmarkLeaf))
+    def echo_array(a):
+        return a
+
+
+def _gen_leaf(i):
+    return BenchmarkLeaf(i=i, f=i / 7.0, s=u'leaf %d' % i, b=bool(i % 2),
+                                       dt=datetime(2001, 2, 3, 4, 5, i % 60))
+
+
+def _gen_branch(i, width):
+    return BenchmarkBranch(name=u'branch %d' % i, leaf=_gen_leaf(i),
+                          leaves=[_gen_leaf(i * width + j) for j in range(width)])
+
+
+def gen_flat(size):
+    return (u'Hello World! ' * size,)
+
+
+def gen_nested(size):
+    width = max(int(size ** 0.5), 1)
+    return (BenchmarkTree(id=size, branch=_gen_branch(0, width),
+                   branches=[_gen_branch(i, width) for i in range(1, width)]),)
+
+
+def gen_array(size):
+    return ([_gen_leaf(i) for i in range(size)],)
+
+
+Shape = namedtuple('Shape', 'method gen_args default_size')
+
+SHAPES = {
+    'flat': Shape('echo_flat', gen_flat, 1),
+    'nested': Shape('echo_nested', gen_nested, 16),
+    'array': Shape('echo_array', gen_array, 1000),
+}
+"""Payload shapes. A shape has a service method, a function that generates its
+arguments for a given size and the default size."""
+
+
+Pair = namedtuple('Pair', 'in_protocol out_protocol shapes')
+
+PROTOCOLS = {
+    'soap11': Pair(Soap11, Soap11, ('flat', 'nested', 'array')),
+    'xml': Pair(XmlDocument, XmlDocument, ('flat', 'nested', 'array')),
+    'json': Pair(JsonDocument, JsonDocument, ('flat', 'nested', 'array')),
+    'msgpack': Pair(MessagePackDocument, MessagePackDocument,
+                                                ('flat', 'nested', 'array')),
+    'httprpc': Pair(HttpRpc, HttpRpc, ('flat',)),
+    'csv': Pair(HttpRpc, Csv, ('array',)),
+    'html': Pair(HttpRpc, HtmlCloth, ('flat', 'array')),
+}
+"""Protocol pairs. Output-only protocols are paired with HttpRpc, and each pair
+lists the shapes its output protocol can serialize."""
+
+TRANSPORTS = ('null', 'wsgi')
+
+
+class _RequestBuilder(RemoteProcedureBase):
+    """Serializes requests with the client side of a protocol."""
+
+    def __call__(self, *args, **kwargs):
+        self.ctx, = self.contexts
+        self.get_out_object(self.ctx, args, kwargs)
+        self.get_out_string(self.ctx)
+
+        return _join(self.ctx.out_string)
+
+    def get_out_string(self, ctx):
+        prot = ctx.out_protocol
+        prot.serialize(ctx, prot.REQUEST)
+
+        # dict documents don't have the method name in the request unless
+        # wrappers are on, which is not what servers expect by default.
+        if isinstance(prot, HierDictDocument):
+            method_name = prot.get_class_name(ctx.descriptor.in_message)
+            ctx.out_document = [{method_name: doc}
+                                                  for doc in ctx.out_document]
+
+        prot.create_out_string(ctx)
+
+
+_REQUEST_PROTOCOLS = {}
+"""Protocols to serialize requests with, when the one that parses them can't
+be used for that."""
+
+if MessagePackDocument is not None:
+    class _TextMessagePackDocument(MessagePackDocument):
+        # MessagePackDocument writes strings as bytes but expects text strings
+        # that aren't keys, like other msgpack clients send.
+        to_serstr = HierDictDocument.to_unicode
+
+    _REQUEST_PROTOCOLS[MessagePackDocument] = _TextMessagePackDocument
+
+
+def _to_unicode_eater(prot, value, cls):
+    return prot.to_unicode(cls, value)
+
+
+def gen_request(pair, shape, args):
+    """Returns the ``(http_verb, path, query_string, body)`` tuple for the
+    given request."""
+
+    if pair.in_protocol is HttpRpc:
+        prot = HttpRpc()
+        app = Application([BenchmarkService], TNS, in_protocol=prot,
+                                                          out_protocol=HttpRpc())
+
+        in_message = app.interface.service_method_map[
+                         '{%s}%s' % (TNS, shape.method)][0].in_message
+        inst = in_message.get_serialization_instance(list(args))
+
+        d = prot.object_to_simple_dict(in_message, inst,
+                                            subinst_eater=_to_unicode_eater)
+        return 'GET', '/' + shape.method, urlencode(d, doseq=True), b''
+
+    prot_cls = _REQUEST_PROTOCOLS.get(pair.in_protocol, pair.in_protocol)
+    app = Application([BenchmarkService], TNS, in_protocol=prot_cls(),
+                                                      out_protocol=prot_cls())
+
+    return 'POST', '/', '', _RequestBuilder(None, app, shape.method)(*args)
+
+
+class Result(object):
+    def __init__(self, protocol, shape, transport, size, count, timings,
+                                                    alloc_peaks, response_size):
+        timings = sorted(timings)
+
+        self.protocol = protocol
+        self.shape = shape
+        self.transport = transport
+        self.size = size
+        self.count = count
+        self.rps = count / sum(timings)
+        self.latency_ms = dict(
+            min=timings[0] * 1e3,
+            mean=sum(timings) / len(timings) * 1e3,
+            p50=_percentile(timings, 50) * 1e3,
+            p90=_percentile(timings, 90) * 1e3,
+            p99=_percentile(timings, 99) * 1e3,
+            max=timings[-1] * 1e3,
+        )
+
+        self.alloc_peak_bytes = None
+        if alloc_peaks:
+            self.alloc_peak_bytes = _percentile(sorted(alloc_peaks), 50)
+
+        self.response_size = response_size
+
+    @property
+    def key(self):
+        return '%s/%s/%s' % (self.protocol, self.shape, self.transport)
+
+    def as_dict(self):
+        return dict(
+            protocol=self.protocol,
+            in_protocol=PROTOCOLS[self.protocol].in_protocol.__name__,
+            out_protocol=PROTOCOLS[self.protocol].out_protocol.__name__,
+            shape=self.shape,
+            transport=self.transport,
+            size=self.size,
+            requests=self.count,
+            rps=self.rps,
+            latency_ms=self.latency_ms,
+            alloc_peak_bytes=self.alloc_peak_bytes,
+            response_size=self.response_size,
+        )
+
+
+def _percentile(sorted_values, pct):
+    idx = int(round((len(sorted_values) - 1) * pct / 100.0))
+    return sorted_values[idx]
+
+
+def _join(chunks):
+    return b''.join(c.encode('utf8') if isinstance(c, six.text_type) else c
+                                                               for c in chunks)
+
+
+def _gen_null_driver(app, shape, args):
+    server = NullServer(app, ostr=True)
+    method = getattr(server.service, shape.method)
+
+    def driver():
+        return _join(method(*args))
+
+    return driver
+
+
+def _gen_wsgi_driver(app, pair, shape, args):
+    server = WsgiApplication(app)
+    verb, path, qs, body = gen_request(pair, shape, args)
+
+    statuses = []
+
+    def start_response(status, headers):
+        statuses.append(status)
+
+    def driver():
+        del statuses[:]
+        retval = _join(server({
+            'CONTENT_LENGTH': str(len(body)),
+            'CONTENT_TYPE': pair.in_protocol.mime_type,
+            'PATH_INFO': path,
+            'QUERY_STRING': qs,
+            'SERVER_NAME': 'localhost',
+            'SERVER_PORT': '7000',
+            'REQUEST_METHOD': verb,
+            'wsgi.url_scheme': 'http',
+            'wsgi.input': BytesIO(body),
+        }, start_response))
+
+        status, = statuses
+        if not status.startswith('200'):
+            raise ValueError("Request failed with %r: %r" % (status, retval))
+
+        return retval
+
+    return driver
+
+
+def run_one(protocol, shape_name, transport, count=200, warmup=5, size=None,
+                                                  alloc=True, max_time=None):
+    """Runs a single benchmark and returns its :class:`Result`. When
+    ``max_time`` is given, timed requests stop after that many seconds even if
+    fewer than ``count`` requests were made."""
+
+    pair = PROTOCOLS[protocol]
+    shape = SHAPES[shape_name]
+    if size is None:
+        size = shape.default_size
+
+    args = shape.gen_args(size)
+    app = Application([BenchmarkService], TNS, in_protocol=pair.in_protocol(),
+                                             out_protocol=pair.out_protocol())
+
+    if transport == 'null':
+        driver = _gen_null_driver(app, shape, args)
+    elif transport == 'wsgi':
+        driver = _gen_wsgi_driver(app, pair, shape, args)
+    else:
+        raise ValueError("Unknown transport %r" % (transport,))
+
+    response = None
+    for _ in range(warmup):
+        response = driver()
+
+    timings = []
+    gc.collect()
+    deadline = None
+    if max_time is not None:
+        deadline = _clock() + max_time
+
+    for _ in range(count):
+        t0 = _clock()
+        response = driver()
+        t1 = _clock()
+        timings.append(t1 - t0)
+
+        if deadline is not None and t1 > deadline:
+            break
+
+    # tracemalloc slows things down considerably so allocations are measured
+    # in a separate pass.
+    alloc_peaks = []
+    if alloc and tracemalloc is not None:
+        tracemalloc.start()
+        try:
+            for _ in range(min(len(timings), 5)):
+                tracemalloc.clear_traces()
+                start, _ = tracemalloc.get_traced_memory()
+                driver()
+                _, peak = tracemalloc.get_traced_memory()
+                alloc_peaks.append(peak - start)
+        finally:
+            tracemalloc.stop()
+
+    if response is None:
+        response = driver()
+
+    return Result(protocol, shape_name, transport, size, len(timings),
+                                             timings, alloc_peaks, len(response))
+
+
+def run(protocols=None, shapes=None, transports=None, **kwargs):
+    """Runs all combinations of the given protocols, shapes and transports that
+    are supported. ``kwargs`` are passed to :func:`run_one`."""
+
+    if protocols is None:
+        protocols = sorted(PROTOCOLS)
+    if shapes is None:
+        shapes = sorted(SHAPES)
+    if transports is None:
+        transports = TRANSPORTS
+
+    retval = []
+    for protocol in protocols:
+        pair = PROTOCOLS[protocol]
+        if pair.in_protocol is None or pair.out_protocol is None:
+            logger.warning("Skipping %s: its dependencies are missing",
+                                                                       protocol)
+            continue
+
+        for shape in shapes:
+            if not (shape in pair.shapes):
+                continue
+
+            for transport in transports:
+                result = run_one(protocol, shape, transport, **kwargs)
+                logger.info("%s: %.1f req/s, p50 %.3fms, p99 %.3fms",
+                        result.key, result.rps, result.latency_ms['p50'],
+                                                    result.latency_ms['p99'])
+                retval.append(result)
+
+    return retval
+
+
+def compare(results, baseline, tolerance):
+    """Returns ``(key, old_rps, new_rps)`` tuples for results that are slower
+    than their baseline counterparts by more than ``tolerance``, which is a
+    ratio."""
+
+    old_rps = dict(('%s/%s/%s' % (r['protocol'], r['shape'], r['transport']),
+                                           r['rps']) for r in baseline['results'])
+
+    retval = []
+    for result in results:
+        old = old_rps.get(result.key, None)
+        if old is not None and result.rps < old * (1.0 - tolerance):
+            retval.append((result.key, old, result.rps))
+
+    return retval
+
+
+def get_meta():
+    return dict(
+        spyne=spyne.__version__,
+        python=platform.python_version(),
+        implementation=platform.python_implementation(),
+        platform=platform.platform(),
+        timestamp=datetime.utcnow().isoformat(),
+    )
+
+
+def main(argv=None):
+    parser = ArgumentParser(description="Benchmarks Spyne's request pipeline.")
+    parser.add_argument('-p', '--protocol', action='append',
+                        choices=sorted(PROTOCOLS), help="Protocol pair to run. "
+                                     "Can be repeated. Default: all of them.")
+    parser.add_argument('-s', '--shape', action='append',
+                        choices=sorted(SHAPES), help="Payload shape to run. "
+                                     "Can be repeated. Default: all of them.")
+    parser.add_argument('-t', '--transport', action='append',
+                        choices=TRANSPORTS, help="Transport to run. "
+                                     "Can be repeated. Default: all of them.")
+    parser.add_argument('-n', '--requests', type=int, default=200,
+                        help="Number of timed requests per benchmark.")
+    parser.add_argument('--max-time', type=float, default=5.0,
+                        help="Maximum number of seconds to spend on timed "
+                                    "requests per benchmark. 0 means no limit.")
+    parser.add_argument('-w', '--warmup', type=int, default=5,
+                        help="Number of untimed requests per benchmark.")
+    parser.add_argument('--size', type=int, default=None,
+                        help="Payload size. The default depends on the shape.")
+    parser.add_argument('--no-alloc', action='store_true',
+                        help="Don't measure memory allocations.")
+    parser.add_argument('-o', '--output', default=None,
+                        help="File to write the results to. Default: stdout.")
+    parser.add_argument('--baseline', default=None,
+                        help="Previous result file to compare against.")
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help="Allowed requests/s drop when comparing against "
+                                                "a baseline, as a ratio.")
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help="Log results as they come in.")
+
+    args = parser.parse_args(argv)
+
+    # spyne.test turns on debug logging, which would dominate the timings.
+    logging.basicConfig()
+    logging.getLogger().setLevel(logging.WARNING)
+    # NullServer logs every request
+    logging.getLogger('spyne.server.null').setLevel(logging.CRITICAL)
+    if args.verbose:
+        logger.setLevel(logging.INFO)
+
+    results = run(protocols=args.protocol, shapes=args.shape,
+                  transports=args.transport, count=args.requests,
+                  warmup=args.warmup, size=args.size, alloc=not args.no_alloc,
+                  max_time=args.max_time or None)
+
+    doc = dict(meta=get_meta(), results=[r.as_dict() for r in results])
+    data = json.dumps(doc, indent=2, sort_keys=True)
+
+    if args.output is None:
+        print(data)
+    else:
+        with open(args.output, 'w') as f:
+            f.write(data)
+
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+        regressions = compare(results, baseline, args.tolerance)
+        for key, old, new in regressions:
+            print("%s: %.1f req/s -> %.1f req/s (%+.1f%%)" %
+                        (key, old, new, (new / old - 1) * 100), file=sys.stderr)
+
+        if len(regressions) > 0:
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -17,16 +17,22 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301
 #
 
+import json
 import unittest
 
+from io import BytesIO
+
 from spyne.util import six
 from six import StringIO
 
 from spyne.protocol.soap.soap11 import Soap11
+from spyne.protocol.http import HttpRpc
+from spyne.protocol.json import JsonDocument
 from spyne.server.wsgi import WsgiApplication
 from spyne.application import Application
-from spyne.model.primitive import Unicode
-from spyne.decorator import rpc
+from spyne.model.complex import Iterable
+from spyne.model.primitive import Integer, Unicode
+from spyne.decorator import rpc, srpc
 from spyne.const.xml import WSDL11
 from spyne.service import Service
 
@@ -87,5 +93,250 @@ class Test(unittest.TestCase):
 
         assert etree.fromstring(retval).tag == WSDL11('definitions')
 
+    def _get_wsdl(self, **headers):
+        req_env = {
+            'PATH_INFO': '/',
+            'QUERY_STRING': 'wsdl',
+            'SERVER_NAME': 'localhost',
+            'SERVER_PORT': '7000',
+            'REQUEST_METHOD': 'GET',
+            'wsgi.url_scheme': 'http',
+            'wsgi.input': StringIO(),
+        }
+        req_env.update(headers)
+
+        status = []
+        def start_response(code, headers):
+            status.append((code, dict(headers)))
+
+        retval = b''.join(self.wsgi_app(req_env, start_response))
+        code, headers = status[0]
+
+        return code, headers, retval
+
+    def test_wsdl_cache(self):
+        code, headers, retval = self._get_wsdl()
+        assert code.startswith('200')
+        assert 'Content-Encoding' not in headers
+        assert int(headers['Content-Length']) == len(retval)
+        assert headers['Vary'] == 'Accept-Encoding'
+
+        etag = headers['ETag']
+
+        code, headers, retval = self._get_wsdl(HTTP_IF_NONE_MATCH=etag)
+        assert code.startswith('304')
+        assert retval == b''
+        assert headers['ETag'] == etag
+
+        code, headers, retval = self._get_wsdl(
+                               HTTP_IF_MODIFIED_SINCE=headers['Last-Modified'])
+        assert code.startswith('304')
+
+        code, headers, retval = self._get_wsdl(HTTP_IF_NONE_MATCH='"other"')
+        assert code.startswith('200')
+        assert len(retval) > 0
+
+        # the document is built only once.
+        assert len(self.wsgi_app.doc_cache.documents) == 1
+
+    def test_wsdl_cache_host(self):
+        for i in range(20):
+            code, headers, retval = self._get_wsdl(
+                                             HTTP_HOST='host%d.example.com' % i)
+            assert code.startswith('200')
+
+        # the document is cached once, no matter where it was requested from.
+        assert len(self.wsgi_app.doc_cache.documents) == 1
+
+    def test_wsdl_gzip(self):
+        import gzip
+        from io import BytesIO
+
+        _, headers, retval = self._get_wsdl()
+        etag = headers['ETag']
+
+        self.wsgi_app.doc_cache.min_length = 0
+        code, headers, gz_retval = self._get_wsdl(
+                                    HTTP_ACCEPT_ENCODING='gzip, deflate;q=0.5')
+
+        assert code.startswith('200')
+        assert headers['Content-Encoding'] == 'gzip'
+        assert headers['ETag'] != etag
+        assert int(headers['Content-Length']) == len(gz_retval)
+        assert gzip.GzipFile(fileobj=BytesIO(gz_retval)).read() == retval
+
+        code, headers, _ = self._get_wsdl(HTTP_ACCEPT_ENCODING='gzip;q=0')
+        assert 'Content-Encoding' not in headers
+
+    def test_wsdl_event_override(self):
+        def on_wsdl(ctx):
+            ctx.transport.wsdl = b'<x/>'
+
+        self.wsgi_app.event_manager.add_listener('wsdl', on_wsdl)
+
+        code, headers, retval = self._get_wsdl()
+        assert code.startswith('200')
+        assert retval == b'<x/>'
+        assert 'ETag' not in headers
+
+
+
+class TestCompress(unittest.TestCase):
+    def setUp(self):
+        class SomeService(Service):
+            @rpc(Unicode, Integer, _returns=Unicode)
+            def some_call(ctx, s, n):
+                return s * n
+
+            @rpc(Integer, _returns=Iterable(Unicode))
+            def some_iter(ctx, n):
+                for _ in range(n):
+                    yield u'x' * 100
+
+            @rpc(Unicode, Integer, _returns=Unicode, _compress=False)
+            def uncompressed_call(ctx, s, n):
+                return s * n
+
+        self.app = Application([SomeService], 'tns', in_protocol=HttpRpc(),
+                                                   out_protocol=JsonDocument())
+
+    def _call(self, wsgi_app, path, qs, **kwargs):
+        status = []
+        def start_response(code, headers):
+            status.append((code, dict(headers)))
+
+        req_env = {
+            'QUERY_STRING': qs,
+            'PATH_INFO': path,
+            'REQUEST_METHOD': 'GET',
+            'SERVER_NAME': 'localhost',
+            'SERVER_PORT': '80',
+            'wsgi.url_scheme': 'http',
+        }
+        req_env.update(kwargs)
+
+        ret = wsgi_app(req_env, start_response)
+        retval = b''.join(ret)
+
+        return status[0][0], status[0][1], retval
+
+    def test_gzip(self):
+        import gzip
+        from io import BytesIO
+
+        for chunked in (True, False):
+            wsgi_app = WsgiApplication(self.app, chunked=chunked,
+                                                                 compress=True)
+            code, headers, retval = self._call(wsgi_app, '/some_call',
+                               's=a&n=2000', HTTP_ACCEPT_ENCODING='gzip, br;q=0')
+
+            assert code.startswith('200')
+            assert headers['Content-Encoding'] == 'gzip'
+            assert headers['Vary'] == 'Accept-Encoding'
+            assert gzip.GzipFile(fileobj=BytesIO(retval)).read() == \
+                                                         b'"' + b'a' * 2000 + b'"'
+
+            if chunked:
+                # the response was compressed as it was streamed.
+                assert 'Content-Length' not in headers
+            else:
+                assert int(headers['Content-Length']) == len(retval)
+
+    def test_deflate_iter(self):
+        import zlib
+
+        wsgi_app = WsgiApplication(self.app, compress=True)
+        code, headers, retval = self._call(wsgi_app, '/some_iter', 'n=100',
+                                                HTTP_ACCEPT_ENCODING='deflate')
+
+        assert headers['Content-Encoding'] == 'deflate'
+        assert zlib.decompress(retval).count(b'x' * 100) == 100
+
+    def test_threshold(self):
+        wsgi_app = WsgiApplication(self.app, compress=True)
+
+        code, headers, retval = self._call(wsgi_app, '/some_call', 's=a&n=3',
+                                                   HTTP_ACCEPT_ENCODING='gzip')
+
+        assert 'Content-Encoding' not in headers
+        assert headers['Vary'] == 'Accept-Encoding'
+        assert retval == b'"aaa"'
+
+    def test_opt_out(self):
+        accept = dict(HTTP_ACCEPT_ENCODING='gzip')
+
+        wsgi_app = WsgiApplication(self.app, compress=True)
+        _, headers, retval = self._call(wsgi_app, '/uncompressed_call',
+                                                          's=a&n=2000', **accept)
+        assert 'Content-Encoding' not in headers
+        assert len(retval) == 2002
+
+        # compression is off by default
+        wsgi_app = WsgiApplication(self.app)
+        _, headers, retval = self._call(wsgi_app, '/some_call', 's=a&n=2000',
+                                                                       **accept)
+        assert 'Content-Encoding' not in headers
+        assert 'Vary' not in headers
+
+        # the client doesn't accept compressed responses
+        wsgi_app = WsgiApplication(self.app, compress=True)
+        _, headers, retval = self._call(wsgi_app, '/some_call', 's=a&n=2000')
+        assert 'Content-Encoding' not in headers
+        assert len(retval) == 2002
+
+
+class TestWsgiInput(unittest.TestCase):
+    def _test_wsgi_input(self, **kwargs):
+        class SomeService(Service):
+            @srpc(Unicode, _returns=Unicode)
+            def some_call(s):
+                return s
+
+        in_strings = []
+
+        class SomeJsonDocument(JsonDocument):
+            def create_in_document(self, ctx, in_string_encoding=None):
+                ctx.in_string = list(ctx.in_string)
+                in_strings.append(ctx.in_string)
+
+                super(SomeJsonDocument, self).create_in_document(ctx,
+                                                             in_string_encoding)
+
+        app = Application([SomeService], 'tns',
+                                in_protocol=SomeJsonDocument(),
+                                out_protocol=JsonDocument())
+
+        server = WsgiApplication(app, **kwargs)
+
+        body = b'{"some_call": {"s": "' + b'x' * 100 + b'"}}'
+        ret = server({
+            'CONTENT_LENGTH': str(len(body)),
+            'CONTENT_TYPE': 'application/json; charset=utf8',
+            'PATH_INFO': '/',
+            'QUERY_STRING': '',
+            'SERVER_NAME': 'localhost',
+            'SERVER_PORT': '7000',
+            'REQUEST_METHOD': 'POST',
+            'wsgi.url_scheme': 'http',
+            'wsgi.input': BytesIO(body),
+        }, lambda status, headers: None)
+
+        assert json.loads(b''.join(ret)) == 'x' * 100
+
+        in_string, = in_strings
+        buf, = in_string
+        assert bytes(buf) == body
+
+        return buf
+
+    def test_wsgi_input_buffer(self):
+        buf = self._test_wsgi_input(block_length=16)
+        assert isinstance(buf, bytearray)
+
+    def test_wsgi_input_mmap(self):
+        buf = self._test_wsgi_input(block_length=16, mmap_threshold=64)
+        assert isinstance(buf, memoryview)
+
+
 if __name__ == '__main__':
     unittest.main()
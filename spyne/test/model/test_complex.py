@@ -321,6 +321,21 @@ class TestComplex(unittest.TestCase):
     def test_array_type_name(self):
         assert Array(String, type_name='punk').__type_name__ == 'punk'
 
+    def test_array_native_typecode(self):
+        from spyne.model import Double, Integer8, UnsignedInteger32
+
+        assert Array(Integer).get_native_typecode() is None
+        assert Array(Integer, native='array').get_native_typecode() == 'q'
+        assert Array(Integer8, native='array').get_native_typecode() == 'b'
+        assert Array(UnsignedInteger32,
+                                native='numpy').get_native_typecode() == 'I'
+        assert Array(Double, native='numpy').get_native_typecode() == 'd'
+
+        self.assertRaises(ValueError, Array, Unicode, native='array')
+        self.assertRaises(ValueError, Array, Integer, native='list')
+        self.assertRaises(ValueError, Array, Integer, wrapped=False,
+                                                                native='array')
+
     def test_ctor_kwargs(self):
         class Category(ComplexModel):
             id = Integer(min_occurs=1, max_occurs=1, nillable=False)
@@ -1115,6 +1130,217 @@ class TestCustomize(unittest.TestCase):
                     "have conflicting names.")
 
 
+class TestSlots(unittest.TestCase):
+    def test_slots(self):
+        class C(ComplexModel):
+            class Attributes(ComplexModel.Attributes):
+                slots = True
+
+            i = Integer(default=5)
+            s = Unicode
+            a = Array(Integer, default_factory=list)
+
+        c = C(s='x')
+        assert not hasattr(c, '__dict__')
+        assert C.__slots__ == ('i', 's', 'a')
+        assert c.i == 5
+        assert c.s == 'x'
+        assert c.a == []
+        assert c.a is not C().a
+        assert repr(c) == "C(i=5, s='x', a=[])"
+
+        self.assertRaises(AttributeError, setattr, c, 'x', 1)
+        self.assertRaises(TypeError, C.append_field, 'x', Integer)
+
+    def test_slots_subclass(self):
+        class C(ComplexModel):
+            class Attributes(ComplexModel.Attributes):
+                slots = True
+
+            i = Integer
+
+        class D(C):
+            s = Unicode(default='x')
+
+        class E(D):
+            class Attributes(D.Attributes):
+                slots = False
+
+            f = Float
+
+        assert D.__slots__ == ('s',)
+
+        d = D(i=1)
+        assert not hasattr(d, '__dict__')
+        assert (d.i, d.s) == (1, 'x')
+
+        e = E(f=1.5)
+        assert hasattr(e, '__dict__')
+        assert (e.i, e.s, e.f) == (None, 'x', 1.5)
+        E.append_field('g', Integer)
+
+    def test_slots_voa(self):
+        class C(ComplexModel):
+            class Attributes(ComplexModel.Attributes):
+                slots = True
+
+            i = Integer(voa=True)
+
+        c = C(i=5)
+        assert c.i == 5
+        try:
+            c.i = 'a'
+        except ValueError:
+            pass
+        else:
+            raise Exception('must fail with ValueError')
+
+    def test_slots_xml(self):
+        from spyne.util.xml import get_object_as_xml, get_xml_as_object
+
+        class C(ComplexModel):
+            class Attributes(ComplexModel.Attributes):
+                slots = True
+
+            i = Integer
+            s = Array(Unicode)
+            c = SelfReference
+
+        c = C(i=1, s=['a', 'b'], c=C(i=2))
+        c2 = get_xml_as_object(get_object_as_xml(c, C), C)
+        assert (c2.i, c2.s, c2.c.i, c2.c.c) == (1, ['a', 'b'], 2, None)
+
+
+class TestDeserializationFactory(unittest.TestCase):
+    def test_factory(self):
+        from spyne.util.xml import get_object_as_xml, get_xml_as_object
+
+        calls = []
+        def fac():
+            calls.append(1)
+            return []
+
+        class C(ComplexModel):
+            i = Integer(default=5)
+            s = Unicode
+            a = Array(Integer, default_factory=fac)
+
+        assert C._deserialization_factory is not None
+
+        c = C.get_deserialization_instance_from_dict(None, {'s': 'x'})
+        assert (c.i, c.s, c.a) == (5, 'x', [])
+        assert len(calls) == 1
+
+        c = C.get_deserialization_instance_from_dict(None, {'a': [1]})
+        assert (c.i, c.s, c.a) == (5, None, [1])
+        assert len(calls) == 1
+
+        c = get_xml_as_object(get_object_as_xml(C(i=1, a=[2, 3]), C), C)
+        assert (c.i, c.s, c.a) == (1, None, [2, 3])
+
+    def test_factory_fallback(self):
+        class C(ComplexModel):
+            i = Integer
+
+            def __init__(self, *args, **kwargs):
+                super(C, self).__init__(*args, **kwargs)
+                self.initialized = True
+
+        class D(C):
+            s = Unicode
+
+        class E(ComplexModel):
+            i = Integer
+
+            @classmethod
+            def get_deserialization_instance(cls, ctx):
+                retval = cls()
+                retval.ctx = ctx
+                return retval
+
+        assert C._deserialization_factory is None
+        assert D._deserialization_factory is None
+        assert E._deserialization_factory is None
+
+        d = D.get_deserialization_instance_from_dict(None, {'s': 'x'})
+        assert (d.i, d.s, d.initialized) == (None, 'x', True)
+
+        e = E.get_deserialization_instance_from_dict('ctx', {'i': 1})
+        assert (e.i, e.ctx) == (1, 'ctx')
+
+    def test_factory_customized(self):
+        class C(ComplexModel):
+            i = Integer(default=5)
+
+        D = C.customize(nillable=False)
+
+        d = D.get_deserialization_instance_from_dict(None, {})
+        assert type(d) is C
+        assert d.i == 5
+
+    def test_factory_append_field(self):
+        class C(ComplexModel):
+            i = Integer
+
+        class D(C):
+            pass
+
+        C.append_field('s', Unicode(default='x'))
+
+        c = C.get_deserialization_instance_from_dict(None, {'i': 1})
+        d = D.get_deserialization_instance_from_dict(None, {})
+        assert (c.i, c.s) == (1, 'x')
+        assert (d.i, d.s) == (None, 'x')
+
+
+class TestFlatTypeInfo(unittest.TestCase):
+    def test_flat_tables(self):
+        class C(ComplexModel):
+            i = Integer
+            s = Unicode(exc=True)
+            a = XmlAttribute(Unicode)
+
+        class D(C):
+            f = Float
+
+        fti = D.get_flat_type_info(D)
+        assert fti is D._flat_type_info
+        assert fti is D.get_flat_type_info(D)
+        assert list(fti.keys()) == ['i', 's', 'a', 'f']
+        assert D._flat_keys == ('i', 's', 'a', 'f')
+        assert D._flat_inc_keys == ('i', 'a', 'f')
+        assert D._flat_attr_keys == ('a',)
+        assert C._flat_keys == ('i', 's', 'a')
+
+    def test_flat_tables_update(self):
+        class C(ComplexModel):
+            class Attributes(ComplexModel.Attributes):
+                _subclasses = []
+
+            i = Integer
+
+        class D(C):
+            f = Float
+
+        C.append_field('s', Unicode)
+        assert C._flat_keys == ('i', 's')
+        assert D._flat_keys == ('i', 's', 'f')
+
+        C.insert_field(0, 'b', Integer)
+        assert D._flat_keys == ('b', 'i', 's', 'f')
+
+        C._replace_field('s', Unicode(exc=True))
+        assert D._flat_inc_keys == ('b', 'i', 'f')
+
+        # in-place modification is tracked as well
+        D._type_info['g'] = Integer
+        assert D._flat_keys == ('b', 'i', 's', 'f', 'g')
+        assert D(g=5).g == 5
+
+        del D._type_info['g']
+        assert D._flat_keys == ('b', 'i', 's', 'f')
+
+
 class TestAdditional(unittest.TestCase):
     def test_time_segment(self):
         data = TimeSegment.from_string("[11:12:13.123456,14:15:16.789012]")
@@ -760,6 +760,48 @@ class TestHttpPatterns(unittest.TestCase):
         server.get_out_object(ctx)
         assert ctx.out_error is None
 
+    def test_router_candidates(self):
+        from spyne.server.http import HttpRouter
+
+        class SomeService(Service):
+            @srpc(Integer, _returns=Integer, _patterns=[
+                                       HttpPattern('/a/<some_int>', verb='GET'),
+                                       HttpPattern('/a/b', verb='GET'),
+                                       HttpPattern('/c/<some_int>'),
+                                       HttpPattern('/d', verb='P.*'),
+                                   ])
+            def some_call(some_int):
+                pass
+
+        app = Application([SomeService], 'tns', in_protocol=HttpRpc(),
+                                                       out_protocol=HttpRpc())
+        server = WsgiApplication(app)
+        router = server._http_router
+        assert isinstance(router, HttpRouter)
+
+        def addresses(verb, path):
+            return [p.address for p in router.get_candidates(verb, path)]
+
+        assert addresses('GET', '/a/b') == ['/a/b', '/a/<some_int>']
+        assert addresses('GET', '/a/5') == ['/a/<some_int>']
+        assert addresses('POST', '/a/5') == []
+        assert addresses('POST', '/c/5') == ['/c/<some_int>']
+        assert addresses('POST', '/d') == ['/d']
+        assert addresses('GET', '/d') == ['/d']
+
+        ctx = WsgiMethodContext(server, {
+            'QUERY_STRING': '', 'PATH_INFO': '/a/b', 'SERVER_NAME': "localhost",
+            'wsgi.url_scheme': 'http', 'SERVER_PORT': '9000',
+            'REQUEST_METHOD': 'GET',
+        }, 'some-content-type')
+
+        params = server.match_pattern(ctx, 'GET', '/a/b', 'localhost')
+        assert ctx.method_request_string == 'some_call'
+        assert dict(params) == {}
+
+        params = server.match_pattern(ctx, 'GET', '/a/5', 'localhost')
+        assert dict(params) == {'some_int': ['5']}
+
 
 class ParseCookieTest(unittest.TestCase):
     def test_cookie_parse(self):
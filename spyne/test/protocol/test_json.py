@@ -18,6 +18,8 @@
 #
 
 import unittest
+
+from array import array
 try:
     import simplejson as json
 except ImportError:
@@ -28,11 +30,19 @@ from spyne import MethodContext
 from spyne import Application
 from spyne import rpc,srpc
 from spyne import Service
-from spyne.model import Integer, Unicode, ComplexModel
+from uuid import UUID
+from datetime import date, datetime
+
+from spyne.model import Integer, Unicode, ComplexModel, Iterable
+from spyne.model import Array, Boolean, Double
+from spyne.model import Date, DateTime, Uuid, AnyDict
+from spyne.error import ValidationError
 from spyne.protocol.json import JsonP
 from spyne.protocol.json import JsonDocument
 from spyne.protocol.json import JsonEncoder
 from spyne.protocol.json import _SpyneJsonRpc1
+from spyne.protocol._jsonbackend import JSON_BACKENDS
+from spyne.protocol._jsonbackend import get_json_backend
 from spyne.server import ServerBase
 from spyne.server.null import NullServer
 
@@ -138,6 +148,278 @@ class TestJsonDocument(unittest.TestCase):
         ctx, = server.generate_contexts(initial_ctx, in_string_charset='utf8')
         assert ctx.in_error.faultcode == 'Client.JsonDecodeError'
 
+    def test_stream_output(self):
+        produced = []
+
+        class SomeClass(ComplexModel):
+            i = Integer
+            s = Unicode
+
+        class SomeService(Service):
+            @srpc(Integer, _returns=Iterable(SomeClass))
+            def some_call(n):
+                for i in range(n):
+                    produced.append(i)
+                    yield SomeClass(i=i, s=u'x%d' % i)
+
+        def run(out_protocol):
+            app = Application([SomeService], 'tns', in_protocol=JsonDocument(),
+                                                      out_protocol=out_protocol)
+            server = ServerBase(app)
+
+            initial_ctx = MethodContext(server, MethodContext.SERVER)
+            initial_ctx.in_string = [b'{"some_call": {"n": 5}}']
+            ctx, = server.generate_contexts(initial_ctx)
+            server.get_in_object(ctx)
+            server.get_out_object(ctx)
+            server.get_out_string(ctx)
+
+            return ctx.out_string
+
+        del produced[:]
+        expected = json.loads(b''.join(run(JsonDocument())))
+
+        del produced[:]
+        prot = JsonDocument(stream_output=True)
+        prot.stream_buffer_size = 1
+        out_string = iter(run(prot))
+
+        assert produced == []
+        chunks = [next(out_string)]
+        assert len(produced) < 5
+
+        chunks.extend(out_string)
+        assert produced == list(range(5))
+        assert json.loads(b''.join(chunks)) == expected
+        assert len(expected) == 5
+
+    def test_stream_output_nested(self):
+        class SomeClass(ComplexModel):
+            s = Unicode
+            a = Iterable(Integer)
+
+        class SomeService(Service):
+            @srpc(_returns=SomeClass)
+            def some_call():
+                return SomeClass(s=u'x', a=(i for i in range(3)))
+
+        app = Application([SomeService], 'tns', in_protocol=JsonDocument(),
+                        out_protocol=JsonDocument(stream_output=True,
+                                                        separators=(',', ':')))
+        server = ServerBase(app)
+
+        initial_ctx = MethodContext(server, MethodContext.SERVER)
+        initial_ctx.in_string = [b'{"some_call": {}}']
+        ctx, = server.generate_contexts(initial_ctx)
+        server.get_in_object(ctx)
+        server.get_out_object(ctx)
+        server.get_out_string(ctx)
+
+        assert b''.join(ctx.out_string) == b'{"s":"x","a":[0,1,2]}'
+
+    def test_stream_output_formatting(self):
+        class SomeClass(ComplexModel):
+            s = Unicode
+            i = Integer
+            a = Iterable(Integer)
+
+        class SomeService(Service):
+            @srpc(Boolean, _returns=Iterable(SomeClass))
+            def some_call(lazy):
+                def _gen(n):
+                    for i in range(n):
+                        yield i
+
+                retval = [SomeClass(s=u'x', i=n, a=_gen(n)) for n in range(3)]
+                if lazy:
+                    return (o for o in retval)
+                return [SomeClass(s=o.s, i=o.i, a=list(o.a)) for o in retval]
+
+        def run(lazy, **kwargs):
+            app = Application([SomeService], 'tns', in_protocol=JsonDocument(),
+                      out_protocol=JsonDocument(stream_output=True, **kwargs))
+            server = ServerBase(app)
+
+            initial_ctx = MethodContext(server, MethodContext.SERVER)
+            initial_ctx.in_string = [('{"some_call": {"lazy": %s}}' %
+                                  ('true' if lazy else 'false')).encode('utf8')]
+            ctx, = server.generate_contexts(initial_ctx)
+            server.get_in_object(ctx)
+            server.get_out_object(ctx)
+            server.get_out_string(ctx)
+
+            return b''.join(ctx.out_string)
+
+        for kwargs in ({'indent': 2}, {'sort_keys': True},
+                                            {'indent': '\t', 'sort_keys': True}):
+            expected = run(False, **kwargs)
+            assert run(True, **kwargs) == expected, kwargs
+            assert expected == json.dumps(json.loads(expected),
+                                          **kwargs).encode('utf8'), kwargs
+
+    def _get_backends(self):
+        retval = []
+        for name, _ in JSON_BACKENDS:
+            try:
+                retval.append(get_json_backend(name))
+            except ImportError:
+                pass
+        return retval
+
+    def test_backend_auto(self):
+        assert get_json_backend('auto') is self._get_backends()[0]
+        assert get_json_backend(None).name == 'json'
+        self.assertRaises(ValueError, get_json_backend, 'nope')
+
+    def test_backend_roundtrip(self):
+        class SomeClass(ComplexModel):
+            d = Date
+            dt = DateTime
+            dtf = DateTime(dt_format='%Y')
+            u = Uuid
+            a = Iterable(Integer)
+
+        class SomeService(Service):
+            @srpc(SomeClass, _returns=SomeClass)
+            def some_call(sc):
+                sc.a = (i for i in sc.a)
+                return sc
+
+        body = json.dumps({"some_call": {"sc": {
+            "d": "2001-02-03",
+            "dt": "2001-02-03T04:05:06.000007",
+            "dtf": "2001",
+            "u": "00000000-0000-0000-0000-000000001234",
+            "a": [1, 2, 3],
+        }}}).encode('utf8')
+
+        def run(backend, **kwargs):
+            app = Application([SomeService], 'tns',
+                        in_protocol=JsonDocument(backend=backend),
+                        out_protocol=JsonDocument(backend=backend, **kwargs))
+            server = NullServer(app, ostr=True)
+
+            initial_ctx = MethodContext(server, MethodContext.SERVER)
+            initial_ctx.in_string = [body]
+            ctx, = server.generate_contexts(initial_ctx,
+                                                      in_string_charset='utf8')
+            server.get_in_object(ctx)
+            assert ctx.in_error is None
+            server.get_out_object(ctx)
+            server.get_out_string(ctx)
+
+            return json.loads(b''.join(ctx.out_string))
+
+        expected = run('json')
+        assert expected['dtf'] == '2001'
+        assert expected['a'] == [1, 2, 3]
+
+        for backend in self._get_backends():
+            assert run(backend) == expected, backend
+            assert run(backend, stream_output=True) == expected, backend
+
+    def test_bulk_array(self):
+        class SomeClass(ComplexModel):
+            i = Integer
+            d = Double(default=1.5)
+            s = Unicode(sub_name='S')
+            dt = DateTime
+            b = Boolean
+
+        class SomeService(Service):
+            @srpc(_returns=Array(Double))
+            def get_doubles():
+                return array('d', [0.5, 2.0])
+
+            @srpc(_returns=Array(Integer))
+            def get_ints():
+                return [1, None, 20]
+
+            @srpc(_returns=Array(SomeClass))
+            def get_objects():
+                return [
+                    SomeClass(i=1, s=u'x', dt=datetime(2001, 2, 3), b=True),
+                    SomeClass(i=2, d=3.0),
+                ]
+
+        app = Application([SomeService], 'tns',
+                                    in_protocol=JsonDocument(),
+                                    out_protocol=JsonDocument())
+        server = NullServer(app, ostr=True)
+
+        assert json.loads(b''.join(server.service.get_doubles())) == \
+                                                                     [0.5, 2.0]
+        assert json.loads(b''.join(server.service.get_ints())) == \
+                                                       [1, None, 20]
+        assert json.loads(b''.join(server.service.get_objects())) == [
+            {"i": 1, "d": 1.5, "S": "x", "dt": "2001-02-03T00:00:00",
+                                                                   "b": True},
+            {"i": 2, "d": 3.0},
+        ]
+
+    def test_native_array(self):
+        class SomeClass(ComplexModel):
+            d = Array(Double, native='array')
+            i = Array(Integer, native='array')
+
+        for validator in (None, 'soft'):
+            prot = JsonDocument(validator=validator)
+            ret = prot._doc_to_object(None, SomeClass,
+                      {"d": [1, 2.5], "i": [3, 4]}, validator=prot.validator)
+
+            assert ret.d == array('d', [1.0, 2.5])
+            assert ret.i == array('q', [3, 4])
+
+        prot = JsonDocument()
+        self.assertRaises(ValidationError, prot._doc_to_object, None,
+                                                  SomeClass, {"i": [1, None]})
+
+    def test_backend_invalid_input(self):
+        class SomeService(Service):
+            pass
+
+        for backend in self._get_backends():
+            app = Application([SomeService], 'tns',
+                                    in_protocol=JsonDocument(backend=backend),
+                                    out_protocol=JsonDocument(backend=backend))
+
+            server = ServerBase(app)
+
+            initial_ctx = MethodContext(server, MethodContext.SERVER)
+            initial_ctx.in_string = [b'{']
+            ctx, = server.generate_contexts(initial_ctx,
+                                                      in_string_charset='utf8')
+            assert ctx.in_error.faultcode == 'Client.JsonDecodeError', backend
+
+    def test_backend_fallback(self):
+        class SomeClass(ComplexModel):
+            i = Iterable(Integer)
+            d = AnyDict
+
+        class SomeService(Service):
+            @srpc(_returns=SomeClass)
+            def some_call():
+                return SomeClass(i=(i for i in (1, 2 ** 70)), d={1: 'x'})
+
+        def run(backend, **kwargs):
+            app = Application([SomeService], 'tns',
+                        in_protocol=JsonDocument(backend=backend),
+                        out_protocol=JsonDocument(backend=backend, **kwargs))
+            server = NullServer(app, ostr=True)
+
+            return b''.join(server.service.some_call())
+
+        expected = json.loads(run('json'))
+        assert expected == {"i": [1, 2 ** 70], "d": {"1": "x"}}
+
+        for backend in self._get_backends():
+            assert json.loads(run(backend)) == expected, backend
+            assert json.loads(run(backend, stream_output=True)) == expected, \
+                                                                        backend
+            assert run(backend, indent=4) == run('json', indent=4), backend
+            assert run(backend, indent=4, sort_keys=True) == \
+                                  run('json', indent=4, sort_keys=True), backend
+
 
 class TestJsonP(unittest.TestCase):
     def test_callback_name(self):
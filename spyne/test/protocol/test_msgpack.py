@@ -33,6 +33,9 @@ from spyne.decorator import rpc
 from spyne.decorator import srpc
 from spyne.service import Service
 from spyne.model.complex import Array
+from spyne.error import ValidationError
+from spyne.model.primitive import Double
+from spyne.model.primitive import Integer8
 from spyne.model.primitive import String
 from spyne.model.complex import ComplexModel
 from spyne.model.primitive import Unicode
@@ -66,6 +69,33 @@ TestMessagePackDocument  = TDictDocumentTest(msgpack, MessagePackDocument,
                    loads_kwargs=dict(use_list=False), convert_dict=convert_dict)
 
 
+class TestMessagePackNativeArray(unittest.TestCase):
+    def test_native_array(self):
+        try:
+            import numpy
+        except ImportError:
+            native = 'array'
+        else:
+            native = 'numpy'
+
+        class SomeClass(ComplexModel):
+            d = Array(Double, native=native)
+            i = Array(Integer8, native=native)
+
+        prot = MessagePackDocument()
+        doc = msgpack.unpackb(msgpack.packb({'d': [0.5, 2], 'i': [-1, 1]}),
+                                                                     raw=True)
+        ret = prot._doc_to_object(None, SomeClass, doc)
+
+        assert type(ret.d).__module__ in ('array', 'numpy')
+        assert list(ret.d) == [0.5, 2.0]
+        assert list(ret.i) == [-1, 1]
+
+        doc = msgpack.unpackb(msgpack.packb({'i': [1, 1000]}), raw=True)
+        self.assertRaises(ValidationError, prot._doc_to_object, None,
+                                                               SomeClass, doc)
+
+
 class TestMessagePackRpc(unittest.TestCase):
     def test_invalid_input(self):
         class SomeService(Service):
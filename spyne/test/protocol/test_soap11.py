@@ -495,6 +495,37 @@ class TestSoapHeader(unittest.TestCase):
         self.assertEqual(ctx.in_header[1], 'SomeMessageID')
         self.assertEqual(ctx.in_header[2], None)
 
+    def test_soap_input_header_stream(self):
+        app = Application([SOAPServiceWithHeader], 'tns',
+                               in_protocol=Soap11(stream_input=True),
+                               out_protocol=Soap11())
+
+        server = ServerBase(app)
+        initial_ctx = MethodContext(server, MethodContext.SERVER)
+        initial_ctx.in_string = [
+            b'''<senv:Envelope xmlns:tns="tns"
+                        xmlns:wsa="http://www.w3.org/2005/08/addressing"
+                        xmlns:senv="http://schemas.xmlsoap.org/soap/envelope/">
+                <senv:Header>
+                    <wsa:Action>/SomeAction</wsa:Action>
+                    <wsa:MessageID>SomeMessageID</wsa:MessageID>
+                </senv:Header>
+                <senv:Body>
+                    <tns:someRequest>
+                        <tns:response>OK</tns:response>
+                    </tns:someRequest>
+                </senv:Body>
+                </senv:Envelope>'''
+        ]
+
+        ctx, = server.generate_contexts(initial_ctx, in_string_charset='utf8')
+        server.get_in_object(ctx)
+
+        self.assertEqual(ctx.in_header[0], '/SomeAction')
+        self.assertEqual(ctx.in_header[1], 'SomeMessageID')
+        self.assertEqual(ctx.in_object.response, 'OK')
+        self.assertEqual(len(ctx.in_body_doc), 0)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -24,6 +24,7 @@ import logging
 logging.basicConfig(level=logging.DEBUG)
 
 import sys
+import array
 import unittest
 import decimal
 import datetime
@@ -42,11 +43,14 @@ from spyne.server import ServerBase
 from spyne.application import Application
 from spyne.decorator import srpc
 from six import BytesIO
+from spyne.model import PushBase
 from spyne.model import Fault, Integer, Decimal, Unicode, Date, DateTime, \
-    XmlData, Array, ComplexModel, XmlAttribute, Mandatory as M
+    XmlData, Array, Iterable, ComplexModel, XmlAttribute, Double, \
+    Mandatory as M
 from spyne.protocol.xml import XmlDocument, SchemaValidationError
 
-from spyne.util import six
+from spyne.util import six, Break
+from spyne.util.cdict import cdict
 from spyne.util.xml import get_xml_as_object, get_object_as_xml, \
     get_object_as_xml_polymorphic, get_xml_as_object_polymorphic
 from spyne.server.wsgi import WsgiApplication
@@ -156,6 +160,35 @@ class TestXml(unittest.TestCase):
         xpath = parent.xpath('//x:cls/x:s/text()', namespaces={'x': 'tns'})
         assert xpath == val.s
 
+    def test_bulk_array(self):
+        class cls(ComplexModel):
+            __namespace__ = 'tns'
+            i = Integer(max_occurs='unbounded', format='%03d')
+            d = Date(max_occurs='unbounded', default=datetime.date(2001, 2, 3))
+        val = cls(i=array.array('i', [1, 20]),
+                                 d=[datetime.datetime(2002, 3, 4, 5, 6), None])
+
+        parent = etree.Element('parent')
+        XmlDocument().to_parent(None, cls, val, parent, 'tns')
+        print(etree.tostring(parent, pretty_print=True))
+        xpath = parent.xpath('//x:cls/x:i/text()', namespaces={'x': 'tns'})
+        assert xpath == ['001', '020']
+        xpath = parent.xpath('//x:cls/x:d/text()', namespaces={'x': 'tns'})
+        assert xpath == ['2002-03-04', '2001-02-03']
+
+    def test_native_array(self):
+        class cls(ComplexModel):
+            __namespace__ = 'tns'
+            d = Array(Double, native='array')
+            i = Array(Integer, native='array')
+
+        elt = get_object_as_xml(cls(d=[1.0, 2.5], i=[3, 4]), cls)
+
+        for validator in (None, 'soft'):
+            ret = XmlDocument(validator=validator).from_element(None, cls, elt)
+            assert ret.d == array.array('d', [1.0, 2.5])
+            assert ret.i == array.array('q', [3, 4])
+
     def test_decimal(self):
         d = decimal.Decimal('1e100')
 
@@ -656,6 +689,307 @@ class TestIncremental(unittest.TestCase):
         assert elt.xpath('x:getResult/x:SomeComplexModel/x:s/text()',
                         namespaces={'x': __name__}) == ['a', 'b', 'c', 'd', 'e']
 
+    def test_push_member_resumes_plan(self):
+        class SomeComplexModel(ComplexModel):
+            __namespace__ = 'tns'
+            a = Integer
+            b = Array(Integer)
+            c = Unicode
+
+        inst = SomeComplexModel(a=1, b=PushBase(), c='x')
+        parent = etree.Element('parent')
+
+        ret = XmlDocument().to_parent(None, SomeComplexModel, inst, parent,
+                                                                          'tns')
+        assert ret is not None
+
+        ret.send(2)
+        ret.send(3)
+        try:
+            ret.throw(Break())
+        except StopIteration:
+            pass
+
+        elt, = parent
+        assert [e.tag for e in elt] == ['{tns}a', '{tns}b', '{tns}c']
+        assert elt.xpath('x:b/integer/text()',
+                                   namespaces={'x': 'tns'}) == ['2', '3']
+        assert elt.xpath('x:c/text()', namespaces={'x': 'tns'}) == ['x']
+
+
+class TestMemberPlan(unittest.TestCase):
+    def test_plan(self):
+        class SomeBase(ComplexModel):
+            __namespace__ = 'tns'
+            a = Integer
+            e = Integer(exc=True)
+
+        class SomeChild(SomeBase):
+            b = Integer(sub_name='bb', sub_ns='other')
+            c = Array(Integer, wrapped=False)
+
+        prot = XmlDocument()
+        plan = prot.get_member_plan(SomeChild)
+        assert plan is prot.get_member_plan(SomeChild)
+
+        assert [(p[0], p[4], p[5], p[6]) for p in plan] == [
+            ('a', 'tns', 'a', False),
+            ('b', 'other', 'bb', False),
+            ('c', 'tns', 'c', True),
+        ]
+
+        elt = get_object_as_xml(SomeChild(a=1, e=2, b=3, c=[4, 5]))
+        assert [e.tag for e in elt] == \
+                   ['{tns}a', '{other}bb', '{tns}c', '{tns}c']
+
+    def test_plan_unresolved_namespace_not_cached(self):
+        class SomeClass(ComplexModel):
+            a = Integer
+
+        SomeClass.__namespace__ = None
+
+        prot = XmlDocument()
+        prot.get_member_plan(SomeClass)
+        assert SomeClass not in prot._member_plans
+
+    def test_plan_append_field(self):
+        class SomeBase(ComplexModel):
+            __namespace__ = 'tns'
+            a = Integer
+
+        class SomeChild(SomeBase):
+            b = Integer
+
+        elt = get_object_as_xml(SomeChild(a=1, b=2))
+        assert [e.tag for e in elt] == ['{tns}a', '{tns}b']
+
+        SomeBase.append_field('x', Unicode)
+
+        elt = get_object_as_xml(SomeBase(a=1, x='hi'))
+        assert [e.tag for e in elt] == ['{tns}a', '{tns}x']
+        assert elt[1].text == 'hi'
+
+        # subclasses see the new member too
+        elt = get_object_as_xml(SomeChild(a=1, x='hi', b=2))
+        assert [e.tag for e in elt] == ['{tns}a', '{tns}x', '{tns}b']
+
+        o = get_xml_as_object(elt, SomeChild)
+        assert o.x == 'hi'
+
+    def test_tag_map(self):
+        class SomeBase(ComplexModel):
+            __namespace__ = 'tns'
+            a = Integer
+
+        class SomeChild(SomeBase):
+            b = Integer(sub_name='bb', sub_ns='other')
+            c = Array(Integer, wrapped=False)
+
+        prot = XmlDocument()
+        tag_map = prot.get_member_tag_map(SomeChild)
+        assert tag_map is prot.get_member_tag_map(SomeChild)
+
+        assert tag_map['{tns}a'][0] == 'a'
+        assert tag_map['{other}bb'][0] == 'b'
+        assert tag_map['{tns}c'][4]
+
+        elt = etree.fromstring(
+            '<c:SomeChild xmlns:c="tns" xmlns:o="other" xmlns:x="unknown">'
+              '<c:a>1</c:a><o:bb>2</o:bb><c:c>3</c:c><x:c>4</x:c>'
+            '</c:SomeChild>')
+
+        o = get_xml_as_object(elt, SomeChild)
+        assert o.a == 1
+        assert o.b == 2
+        assert o.c == [3, 4]
+
+
+class TestAttrCache(unittest.TestCase):
+    def test_prewarm(self):
+        class SomeInner(ComplexModel):
+            i = Integer(ge=5)
+
+        class SomeOuter(ComplexModel):
+            s = Unicode
+            a = Array(SomeInner)
+
+        class SomeService(Service):
+            @rpc(_returns=SomeOuter)
+            def get(ctx):
+                pass
+
+        prot = XmlDocument()
+        Application([SomeService], 'tns', in_protocol=XmlDocument(),
+                                                            out_protocol=prot)
+
+        stats = prot.get_attrcache_stats()
+        assert stats['prewarmed'] > 0
+        assert stats['misses'] == 0
+
+        inner_i = SomeInner._type_info['i']
+        prot.enable_attrcache_stats()
+        assert prot.get_cls_attrs(inner_i).ge == 5
+        prot.disable_attrcache_stats()
+
+        stats = prot.get_attrcache_stats()
+        assert stats['misses'] == 0
+        assert stats['hits'] == 1
+
+    def test_eviction(self):
+        import gc
+
+        prot = XmlDocument()
+        cls = Integer.customize(ge=1)
+        prot.get_cls_attrs(cls)
+        size = prot.get_attrcache_stats()['size']
+
+        del cls
+        gc.collect()
+
+        assert prot.get_attrcache_stats()['size'] == size - 1
+
+    def test_finalize_handlers(self):
+        class SomeClass(ComplexModel):
+            s = Unicode(max_len=5)
+
+        class SomeService(Service):
+            @rpc(SomeClass, _returns=SomeClass)
+            def get(ctx, c):
+                return c
+
+        prot = XmlDocument()
+        app = Application([SomeService], 'tns', in_protocol=XmlDocument(),
+                                                            out_protocol=prot)
+
+        handlers = prot.serialization_handlers
+        assert not handlers.frozen
+
+        ServerBase(app)
+
+        assert handlers.frozen
+        assert dict.__contains__(handlers, SomeClass)
+        assert dict.__contains__(handlers, SomeClass._type_info['s'])
+        assert prot._to_unicode_handlers.frozen
+
+        SomeSubclass = SomeClass.customize(sub_name='x')
+        size = len(handlers)
+        assert handlers[SomeSubclass] == handlers[SomeClass]
+        assert len(handlers) == size
+
+    def test_protocols_with_app(self):
+        from spyne.protocol.dictdoc import HierDictDocument
+        from spyne.protocol.http import HttpRpc
+        from spyne.protocol.json import JsonDocument
+        from spyne.protocol.msgpack import MessagePackDocument
+        from spyne.protocol.soap import Soap11
+        from spyne.protocol.yaml import YamlDocument
+
+        class SomeService(Service):
+            @rpc(Unicode, _returns=Unicode)
+            def echo(ctx, s):
+                return s
+
+        for cls in (XmlDocument, Soap11, JsonDocument, MessagePackDocument,
+                                    YamlDocument, HttpRpc, HierDictDocument):
+            app = Application([SomeService], 'tns')
+            prot = cls(app=app)
+            assert prot.app is app
+
+            tables = [v for v in prot.__dict__.values()
+                                                    if isinstance(v, cdict)]
+            assert len(tables) > 0
+            assert not any(t.frozen for t in tables)
+
+            app.in_protocol = app.out_protocol = prot
+            ServerBase(app)
+            assert all(t.frozen for t in tables)
+
+
+class TestStreamInput(unittest.TestCase):
+    def _run(self, service, in_string, **kwargs):
+        app = Application([service], 'tns',
+                                in_protocol=XmlDocument(stream_input=True,
+                                                                     **kwargs),
+                                out_protocol=XmlDocument())
+
+        server = ServerBase(app)
+        initial_ctx = MethodContext(server, MethodContext.SERVER)
+        initial_ctx.in_string = in_string
+
+        ctx, = server.generate_contexts(initial_ctx)
+        server.get_in_object(ctx)
+        assert ctx.in_error is None
+        server.get_out_object(ctx)
+        assert ctx.out_error is None
+
+        return ctx
+
+    def test_iterable(self):
+        chunks_read = []
+        num_children = []
+
+        def gen_chunks():
+            yield b'<some_call xmlns="tns"><s>abc</s><a>'
+            for i in range(5):
+                chunks_read.append(i)
+                yield ('<integer>%d</integer>' % i).encode('ascii')
+            yield b'</a></some_call>'
+
+        class SomeService(Service):
+            @rpc(Unicode, Iterable(Integer), _returns=Integer)
+            def some_call(ctx, s, a):
+                assert s == 'abc'
+
+                retval = 0
+                for i in a:
+                    # items are parsed on demand and not kept in the tree
+                    assert len(chunks_read) == i + 1
+                    num_children.append(len(ctx.in_document[0]))
+                    retval += i
+
+                return retval
+
+        ctx = self._run(SomeService, gen_chunks())
+
+        assert ctx.out_object == [10]
+        assert max(num_children) <= 1
+        assert len(ctx.in_document) == 0
+
+    def test_members(self):
+        class SomeService(Service):
+            @rpc(Integer, Array(Integer), Unicode, _returns=Unicode)
+            def some_call(ctx, i, a, s):
+                # arguments are dropped from the tree once deserialized
+                assert len(ctx.in_document) == 0
+                return '%d %r %s' % (i, a, s)
+
+        ctx = self._run(SomeService, [b'<some_call xmlns="tns"><i>1</i><a>'
+                              b'<integer>2</integer><integer>3</integer></a>'
+                                     b'<x/><s>abc</s></some_call>'], validator='soft')
+
+        assert ctx.out_object == ['1 [2, 3] abc']
+
+    def test_syntax_error(self):
+        class SomeService(Service):
+            @rpc(Iterable(Integer), _returns=Integer)
+            def some_call(ctx, a):
+                return sum(a)
+
+        app = Application([SomeService], 'tns',
+                                in_protocol=XmlDocument(stream_input=True),
+                                out_protocol=XmlDocument())
+
+        server = ServerBase(app)
+        initial_ctx = MethodContext(server, MethodContext.SERVER)
+        initial_ctx.in_string = [b'<some_call xmlns="tns"><a><integer>1',
+                                                               b'</a></foo>']
+
+        ctx, = server.generate_contexts(initial_ctx)
+        server.get_in_object(ctx)
+        assert ctx.in_error is None
+        server.get_out_object(ctx)
+        assert ctx.out_error.faultcode == 'Client.XMLSyntaxError'
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+#
+# spyne - Copyright (C) Spyne contributors.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301
+#
+
+import json
+import unittest
+
+from spyne.test import benchmark
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_all_pairs(self):
+        results = benchmark.run(count=2, warmup=0, size=2, alloc=False)
+
+        expected = set()
+        for protocol, pair in benchmark.PROTOCOLS.items():
+            if pair.in_protocol is None:
+                continue
+            for shape in pair.shapes:
+                for transport in benchmark.TRANSPORTS:
+                    expected.add('%s/%s/%s' % (protocol, shape, transport))
+
+        assert set(r.key for r in results) == expected
+
+        for r in results:
+            assert r.response_size > 0, r.key
+            assert r.latency_ms['min'] <= r.latency_ms['p50'] \
+                                          <= r.latency_ms['max'], r.key
+
+    def test_same_response(self):
+        null, wsgi = benchmark.run(protocols=['xml'], shapes=['nested'],
+                                              count=1, warmup=0, alloc=False)
+
+        assert null.transport == 'null'
+        assert wsgi.transport == 'wsgi'
+        assert null.response_size == wsgi.response_size
+
+    def test_compare(self):
+        result, = benchmark.run(protocols=['json'], shapes=['flat'],
+                            transports=['null'], count=2, warmup=0, alloc=True)
+
+        doc = json.loads(json.dumps(dict(meta=benchmark.get_meta(),
+                                                results=[result.as_dict()])))
+        assert doc['results'][0]['in_protocol'] == 'JsonDocument'
+
+        assert benchmark.compare([result], doc, 0.1) == []
+
+        doc['results'][0]['rps'] = result.rps * 2
+        (key, old, new), = benchmark.compare([result], doc, 0.1)
+        assert key == 'json/flat/null'
+        assert new == result.rps
+
+
+if __name__ == '__main__':
+    unittest.main()
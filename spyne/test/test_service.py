@@ -129,6 +129,47 @@ class TestEvents(unittest.TestCase):
 
         assert h[0] == 2
 
+    def test_listener_added_after_first_call(self):
+        h = []
+
+        class SomeService(Service):
+            @srpc()
+            def some_call():
+                pass
+
+        app = Application([SomeService], "some_tns")
+        app.event_manager.enable_counters()
+
+        server = NullServer(app)
+        server.service.some_call()
+        assert h == []
+
+        SomeService.event_manager.add_listener('method_call',
+                                               lambda ctx: h.append(ctx))
+        server.service.some_call()
+        assert len(h) == 1
+
+        counters = app.event_manager.get_counters()
+        assert counters['method_call'] == 2
+        assert counters['method_return_object'] == 2
+
+    def test_del_listener(self):
+        from spyne import EventManager
+
+        def handler(ctx):
+            pass
+
+        evmgr = EventManager(None)
+        generation = EventManager.generation
+
+        evmgr.add_listener('some_event', handler)
+        assert evmgr.has_listeners('some_event')
+        assert EventManager.generation > generation
+
+        evmgr.del_listener('some_event', handler)
+        assert not evmgr.has_listeners('some_event')
+        assert evmgr.get_handlers('some_event') == ()
+
 
 class TestMultipleMethods(unittest.TestCase):
     def test_single_method(self):
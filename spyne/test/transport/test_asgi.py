@@ -0,0 +1,368 @@
+#
+# spyne - Copyright (C) Spyne contributors.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301
+#
+
+import re
+import sys
+import threading
+import unittest
+
+from spyne import Application, Service, rpc
+from spyne.model import Integer, Iterable, Unicode, Fault, PushBase
+from spyne.protocol.http import HttpRpc
+from spyne.protocol.html import HtmlColumnTable
+from spyne.protocol.json import JsonDocument
+from spyne.protocol.soap import Soap11
+
+
+def _call(asgi_app, path, query_string=b'', body=b'', method='GET',
+                                                   headers=(), chunk_size=None):
+    import asyncio
+
+    messages = []
+
+    async def _run():
+        chunks = [body]
+        if chunk_size is not None:
+            chunks = [body[i:i + chunk_size]
+                                     for i in range(0, len(body), chunk_size)]
+
+        async def receive():
+            if len(chunks) > 0:
+                data = chunks.pop(0)
+                return {'type': 'http.request', 'body': data,
+                                                  'more_body': len(chunks) > 0}
+
+            # the client never goes away
+            await asyncio.Event().wait()
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+            'method': method, 'scheme': 'http', 'path': path,
+            'query_string': query_string, 'root_path': '',
+            'headers': [(b'host', b'localhost')] + list(headers),
+            'client': ('127.0.0.1', 12345), 'server': ('localhost', 80),
+        }
+
+        await asgi_app(scope, receive, send)
+
+    asyncio.run(_run())
+
+    start = messages[0]
+    assert start['type'] == 'http.response.start'
+    assert all(m['type'] == 'http.response.body' for m in messages[1:])
+    assert not messages[-1].get('more_body', False)
+
+    headers = dict((k.decode('latin1'), v.decode('latin1'))
+                                                  for k, v in start['headers'])
+    body = b''.join(m['body'] for m in messages[1:])
+
+    return start['status'], headers, body, messages
+
+
+@unittest.skipIf(sys.version_info < (3, 7), "asyncio.run needs Python 3.7")
+class TestAsgiPushStream(unittest.TestCase):
+    def test_feed(self):
+        import asyncio
+        from spyne.server.asgi import AsgiPushStream
+
+        data = []
+
+        async def _run():
+            stream = AsgiPushStream(asyncio.get_event_loop(),
+                                                           max_buffer_length=2)
+
+            class SomePusher(PushBase):
+                def append(self, inst):
+                    stream.write(inst)
+
+            f = stream.feed(SomePusher(), [b'a', b'b', b'c', b'd', b'e'])
+            assert stream.buffer == [b'a', b'b']
+
+            async def write(chunk):
+                data.append(chunk)
+
+            drain = asyncio.ensure_future(stream.drain(write))
+            await f
+            stream.finish()
+            await drain
+
+        asyncio.run(_run())
+
+        assert data == [b'ab', b'cd', b'e']
+
+
+@unittest.skipIf(sys.version_info < (3, 7), "asyncio.run needs Python 3.7")
+class TestAsgiEnviron(unittest.TestCase):
+    def test_gen_environ(self):
+        from spyne.server.asgi import _gen_environ
+
+        req_env = _gen_environ({
+            'type': 'http', 'method': 'POST', 'path': '/', 'query_string': b'',
+            'headers': [(b'content-type', b'text/plain; charset="latin-1"')],
+            'client': ('127.0.0.1', 12345), 'server': ('localhost', 8000),
+        })
+
+        # environ values are strings, as in PEP-3333
+        assert req_env['REMOTE_ADDR'] == '127.0.0.1'
+        assert req_env['REMOTE_PORT'] == '12345'
+        assert req_env['SERVER_PORT'] == '8000'
+        assert req_env['CONTENT_TYPE'] == 'text/plain; charset="latin-1"'
+
+    def test_get_charset(self):
+        from spyne.server.wsgi import _get_charset
+
+        assert _get_charset('text/xml; charset=utf-8') == 'utf-8'
+        assert _get_charset('text/plain; charset="latin-1"') == 'latin-1'
+        assert _get_charset('application/json') is None
+        assert _get_charset('') is None
+        assert _get_charset(None) is None
+
+
+@unittest.skipIf(sys.version_info < (3, 7), "asyncio.run needs Python 3.7")
+class TestAsgiApplication(unittest.TestCase):
+    def gen_app(self, out_protocol=None, **kwargs):
+        from spyne.server.asgi import AsgiApplication
+
+        threads = self.threads = []
+
+        class SomeService(Service):
+            @rpc(Integer, _returns=Unicode)
+            def blocking_call(ctx, n):
+                threads.append(threading.current_thread())
+                return u'x' * n
+
+            @rpc(Integer, _returns=Unicode)
+            async def async_call(ctx, n):
+                import asyncio
+                threads.append(threading.current_thread())
+
+                await asyncio.sleep(0)
+                return u'y' * n
+
+            @rpc(_returns=Unicode)
+            async def long_poll(ctx):
+                import asyncio
+                try:
+                    await asyncio.Event().wait()
+                finally:
+                    threads.append(None)
+
+            @rpc(Integer, _returns=Integer)
+            async def async_fault(ctx, n):
+                raise Fault('Client.SomeFault', 'some fault')
+
+            @rpc(Integer, _returns=Iterable(Unicode))
+            async def async_iter(ctx, n):
+                async def _gen():
+                    for i in range(n):
+                        yield u'z%d' % i
+                return _gen()
+
+            @rpc(Integer, _returns=Iterable(Unicode))
+            def blocking_iter(ctx, n):
+                return (u'w%d' % i for i in range(n))
+
+            @rpc(Integer, _returns=Iterable(Unicode))
+            def push(ctx, n):
+                def _cb(push):
+                    for i in range(n):
+                        push.append(u'p%d' % i)
+
+                return Iterable.Push(_cb)
+
+        if out_protocol is None:
+            out_protocol = JsonDocument()
+
+        app = Application([SomeService], 'tns', in_protocol=HttpRpc(),
+                                                      out_protocol=out_protocol)
+
+        return AsgiApplication(app, **kwargs)
+
+    def test_blocking(self):
+        status, headers, body, _ = _call(self.gen_app(), '/blocking_call',
+                                                              b'n=3')
+
+        assert status == 200
+        assert body == b'"xxx"'
+        assert headers['Content-Type'].startswith('application/json')
+        assert self.threads[0] is not threading.current_thread()
+
+    def test_async(self):
+        status, headers, body, _ = _call(self.gen_app(), '/async_call', b'n=3')
+
+        assert status == 200
+        assert body == b'"yyy"'
+        assert self.threads == [threading.current_thread()]
+
+    def test_async_fault(self):
+        status, headers, body, _ = _call(self.gen_app(), '/async_fault',
+                                                                        b'n=3')
+
+        assert status == 400
+        assert b'some fault' in body
+
+    def test_long_poll_disconnect(self):
+        import asyncio
+
+        asgi_app = self.gen_app()
+        messages = []
+
+        async def _run():
+            received = []
+
+            async def receive():
+                received.append(None)
+                if len(received) == 1:
+                    return {'type': 'http.request', 'body': b''}
+                await asyncio.sleep(0.01)
+                return {'type': 'http.disconnect'}
+
+            async def send(message):
+                messages.append(message)
+
+            scope = {'type': 'http', 'method': 'GET', 'path': '/long_poll',
+                                          'query_string': b'', 'headers': []}
+
+            await asgi_app(scope, receive, send)
+
+        asyncio.run(_run())
+
+        assert messages == []
+        assert self.threads == [None]
+
+    def test_post(self):
+        body = b'n=4'
+        status, headers, body, _ = _call(self.gen_app(), '/blocking_call',
+                 body=body, method='POST', chunk_size=1, headers=[
+                   (b'content-type', b'application/x-www-form-urlencoded')])
+
+        assert status == 200
+        assert body == b'"xxxx"'
+
+    def test_request_too_long(self):
+        status, headers, body, _ = _call(
+                            self.gen_app(max_content_length=10),
+                                    '/blocking_call', body=b'n=4' * 10,
+                                                 method='POST', chunk_size=4)
+
+        assert status == 413
+
+    def test_async_iter(self):
+        status, headers, body, _ = _call(self.gen_app(), '/async_iter',
+                                                                        b'n=3')
+
+        assert status == 200
+        assert body == b'["z0", "z1", "z2"]'
+
+    def test_push_async_iter(self):
+        asgi_app = self.gen_app(HtmlColumnTable(), push_iterables=True,
+                                                    max_push_buffer_length=1)
+        status, headers, body, messages = _call(asgi_app, '/async_iter',
+                                                                     b'n=5000')
+
+        assert status == 200
+        assert 'Content-Length' not in headers
+        assert len(re.findall(b'>z[0-9]+<', body)) == 5000
+        assert body.endswith(b'</table>')
+
+        # the response is not sent in one go
+        assert len(messages) > 3
+
+    def test_push_blocking_iter(self):
+        asgi_app = self.gen_app(HtmlColumnTable(), push_iterables=True,
+                                                    max_push_buffer_length=1)
+        status, headers, body, messages = _call(asgi_app, '/blocking_iter',
+                                                                       b'n=50')
+
+        assert status == 200
+        assert len(re.findall(b'>w[0-9]+<', body)) == 50
+        assert body.endswith(b'</table>')
+
+    def test_push_unsupported(self):
+        # these protocols can't serialize incrementally, so the client gets
+        # a fault instead of an empty response.
+        for prot in (JsonDocument, Soap11):
+            for path in ('/async_iter', '/blocking_iter', '/push'):
+                asgi_app = self.gen_app(prot(), push_iterables=True)
+                status, headers, body, _ = _call(asgi_app, path, b'n=3')
+
+                assert status == 500, (prot, path)
+                assert b'Server' in body, (prot, path)
+                assert int(headers['Content-Length']) == len(body)
+
+    def test_push(self):
+        asgi_app = self.gen_app(HtmlColumnTable())
+        status, headers, body, messages = _call(asgi_app, '/push', b'n=5')
+
+        assert status == 200
+        assert len(re.findall(b'>p[0-9]+<', body)) == 5
+        assert body.endswith(b'</table>')
+
+    def test_compress(self):
+        import gzip
+
+        asgi_app = self.gen_app(compress=True)
+        headers = [(b'accept-encoding', b'gzip')]
+
+        for path in ('/blocking_call', '/async_call'):
+            status, resp_headers, body, _ = _call(asgi_app, path, b'n=2000',
+                                                               headers=headers)
+
+            assert status == 200
+            assert resp_headers['Content-Encoding'] == 'gzip'
+            assert resp_headers['Vary'] == 'Accept-Encoding'
+            assert 'Content-Length' not in resp_headers
+            assert len(gzip.decompress(body)) == 2002
+
+        # short responses are sent as is
+        status, resp_headers, body, _ = _call(asgi_app, '/blocking_call',
+                                                      b'n=3', headers=headers)
+        assert 'Content-Encoding' not in resp_headers
+        assert body == b'"xxx"'
+
+    def test_wsdl(self):
+        from spyne.server.asgi import AsgiApplication
+
+        class SomeService(Service):
+            @rpc(Integer, _returns=Integer)
+            def some_call(ctx, n):
+                return n
+
+        app = Application([SomeService], 'tns', in_protocol=Soap11(),
+                                                         out_protocol=Soap11())
+
+        asgi_app = AsgiApplication(app)
+        status, headers, body, _ = _call(asgi_app, '/', b'wsdl')
+
+        assert status == 200
+        assert b'some_call' in body
+        assert b'http://localhost/' in body
+        assert int(headers['Content-Length']) == len(body)
+
+        status, headers, body, _ = _call(asgi_app, '/', b'wsdl', headers=[
+                           (b'if-none-match', headers['ETag'].encode('ascii'))])
+
+        assert status == 304
+        assert body == b''
+
+
+if __name__ == '__main__':
+    unittest.main()
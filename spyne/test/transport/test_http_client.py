@@ -0,0 +1,195 @@
+#
+# spyne - Copyright (C) Spyne contributors.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301
+#
+
+import time
+import threading
+import unittest
+
+from io import BytesIO
+
+from spyne import Application, Service, srpc
+from spyne.client.http import HttpClient
+from spyne.model import Integer, Double, Unicode, Fault
+from spyne.protocol.soap import Soap11
+from spyne.server.wsgi import WsgiApplication
+from spyne.util.six.moves.BaseHTTPServer import BaseHTTPRequestHandler, \
+    HTTPServer
+from spyne.util.six.moves.socketserver import ThreadingMixIn
+
+
+class SomeService(Service):
+    @srpc(Unicode, Integer, Double, _returns=Unicode)
+    def some_call(s, n, delay):
+        if delay:
+            time.sleep(delay)
+        return s * n
+
+    @srpc()
+    def some_fault():
+        raise Fault('Client.SomeFault', 'some fault')
+
+
+app = Application([SomeService], 'tns', in_protocol=Soap11(),
+                                                         out_protocol=Soap11())
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Runs the WSGI application over persistent HTTP/1.1 connections, which
+    wsgiref doesn't support."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def read_body(self):
+        if self.headers.get('Transfer-Encoding') != 'chunked':
+            return self.rfile.read(int(self.headers['Content-Length']))
+
+        body = []
+        while True:
+            length = int(self.rfile.readline().strip(), 16)
+            body.append(self.rfile.read(length))
+            self.rfile.readline()
+
+            if length == 0:
+                return b''.join(body)
+
+    def do_POST(self):
+        server = self.server
+        server.connections.add(self.client_address)
+        server.transfer_encodings.append(
+                                        self.headers.get('Transfer-Encoding'))
+
+        body = self.read_body()
+        status = []
+
+        def start_response(code, headers):
+            status.append(code)
+
+        ret = server.wsgi_app({
+            'REQUEST_METHOD': 'POST',
+            'PATH_INFO': '/',
+            'QUERY_STRING': '',
+            'CONTENT_TYPE': self.headers['Content-Type'],
+            'CONTENT_LENGTH': str(len(body)),
+            'SERVER_NAME': 'localhost',
+            'SERVER_PORT': str(server.server_port),
+            'wsgi.url_scheme': 'http',
+            'wsgi.input': BytesIO(body),
+        }, start_response)
+
+        data = b''.join(ret)
+
+        self.send_response(int(status[0][:3]))
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+        # pretend to keep the connection alive but close it anyway, like a
+        # server does when its keep-alive timeout expires.
+        if server.close_connections:
+            self.close_connection = True
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class TestHttpClient(unittest.TestCase):
+    def setUp(self):
+        self.server = _Server(('127.0.0.1', 0), _Handler)
+        self.server.wsgi_app = WsgiApplication(app)
+        self.server.connections = set()
+        self.server.transfer_encodings = []
+        self.server.close_connections = False
+
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+
+        self.url = 'http://127.0.0.1:%d/' % self.server.server_port
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_keep_alive(self):
+        client = HttpClient(self.url, app)
+
+        for i in range(5):
+            assert client.service.some_call(u'a', i) == u'a' * i
+
+        assert len(self.server.connections) == 1
+        assert self.server.transfer_encodings == [None] * 5
+
+    def test_stale_connection(self):
+        self.server.close_connections = True
+        client = HttpClient(self.url, app)
+
+        for i in range(3):
+            assert client.service.some_call(u'a', i) == u'a' * i
+
+        assert len(self.server.connections) == 3
+
+    def test_chunked(self):
+        client = HttpClient(self.url, app, chunked=True)
+
+        assert client.service.some_call(u'a', 3) == u'aaa'
+        assert self.server.transfer_encodings == ['chunked']
+
+    def test_fault(self):
+        client = HttpClient(self.url, app)
+
+        try:
+            client.service.some_fault()
+        except Fault as e:
+            assert e.faultcode.endswith('Client.SomeFault')
+        else:
+            raise Exception("must raise Fault")
+
+    def test_call_many(self):
+        client = HttpClient(self.url, app, pool_size=5)
+
+        start = time.time()
+        ret = client.call_many([
+            ('some_call', (u'a', i, 0.2 if i % 2 else 0)) for i in range(10)
+        ])
+
+        # the calls ran concurrently
+        assert time.time() - start < 1.0
+        assert ret == [u'a' * i for i in range(10)]
+        assert len(self.server.connections) <= 5
+
+    def test_call_many_exceptions(self):
+        client = HttpClient(self.url, app)
+
+        calls = [
+            ('some_call', (u'a',), {'n': 2}),
+            ('some_fault', ()),
+        ]
+
+        ret = client.call_many(calls, return_exceptions=True)
+        assert ret[0] == u'aa'
+        assert isinstance(ret[1], Fault)
+
+        self.assertRaises(Fault, client.call_many, calls)
+
+
+if __name__ == '__main__':
+    unittest.main()
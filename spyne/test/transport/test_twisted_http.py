@@ -0,0 +1,244 @@
+#
+# spyne - Copyright (C) Spyne contributors.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301
+#
+
+import threading
+
+from spyne import Application, Service, rpc
+from spyne.model import Integer, Iterable, Unicode, PushBase
+from spyne.protocol.http import HttpRpc
+from spyne.protocol.html import HtmlColumnTable
+
+from twisted.trial import unittest
+
+
+class TestPushProducer(unittest.TestCase):
+    def test_feed(self):
+        from spyne.server.twisted._base import PushProducer
+
+        producer = PushProducer(None)
+        data = []
+
+        class SomePusher(PushBase):
+            def append(self, inst):
+                data.append(inst)
+                if len(data) % 2 == 0:
+                    producer.pauseProducing()
+
+        pusher = SomePusher()
+        pusher.flow_control = producer
+
+        d = pusher.feed(range(5))
+        assert data == [0, 1]
+
+        producer.resumeProducing()
+        assert data == [0, 1, 2, 3]
+
+        done = []
+        d.addCallback(done.append)
+        assert done == []
+
+        producer.resumeProducing()
+        assert data == [0, 1, 2, 3, 4]
+        assert done == [None]
+
+    def test_feed_stopped(self):
+        from spyne.server.twisted._base import PushProducer
+
+        producer = PushProducer(None)
+        producer.pauseProducing()
+
+        pusher = PushBase()
+        pusher.flow_control = producer
+
+        d = pusher.feed(range(5))
+        producer.stopProducing()
+
+        return self.assertFailure(d, Exception)
+
+
+class TestTwistedHttpPush(unittest.TestCase):
+    def tearDown(self):
+        from twisted.internet import reactor
+
+        # TwistedHttpTransport schedules a call to find the reactor thread
+        for call in reactor.getDelayedCalls():
+            call.cancel()
+
+    def gen_site(self, push_iterables):
+        from twisted.web.server import Site
+        from spyne.server.twisted import TwistedWebResource
+
+        class SomeService(Service):
+            @rpc(Integer, _returns=Iterable(Unicode))
+            def some_call(ctx, n):
+                return (u'x' * 1000 for _ in range(n))
+
+            @rpc(Integer, _returns=Iterable(Unicode))
+            async def async_call(ctx, n):
+                import asyncio
+                await asyncio.sleep(0)
+
+                # runs in the shared event loop, not in the reactor thread
+                return [threading.current_thread().name] * n
+
+        app = Application([SomeService], 'tns', in_protocol=HttpRpc(),
+                                                out_protocol=HtmlColumnTable())
+
+        resource = TwistedWebResource(app, push_iterables=push_iterables)
+        # the reactor is not running so there's no reactor thread yet
+        resource.http_transport.reactor_thread = threading.current_thread()
+
+        retval = Site(resource)
+        retval.timeOut = None
+
+        return retval
+
+    def gen_prot(self, site, pause_after=None):
+        from twisted.internet.testing import StringTransport
+
+        prot = site.buildProtocol(None)
+        transport = StringTransport()
+        prot.makeConnection(transport)
+
+        if pause_after is not None:
+            # simulate a slow client by pausing once pause_after bytes are
+            # written
+            write = transport.write
+            paused = []
+            def _write(data):
+                write(data)
+                if len(transport.value()) > pause_after and not paused:
+                    paused.append(True)
+                    transport.producer.pauseProducing()
+            transport.write = _write
+            transport.writeSequence = lambda seq: _write(b''.join(seq))
+
+        return prot, transport
+
+    def test_push_iterables(self):
+        request = b'GET /some_call?n=100 HTTP/1.1\r\nHost: x\r\n\r\n'
+        data = b'x' * 1000
+
+        prot, transport = self.gen_prot(self.gen_site(False))
+        prot.dataReceived(request)
+        assert transport.value().count(data) == 100
+
+        prot, transport = self.gen_prot(self.gen_site(True),
+                                                         pause_after=16 * 1024)
+        prot.dataReceived(request)
+        assert transport.value().count(data) < 100
+
+        transport.producer.resumeProducing()
+        assert transport.value().count(data) == 100
+        assert transport.value().endswith(b'</table>\r\n0\r\n\r\n')
+
+    def test_async_method(self):
+        from twisted.internet import reactor
+        from twisted.internet.task import deferLater
+
+        prot, transport = self.gen_prot(self.gen_site(False))
+        prot.dataReceived(b'GET /async_call?n=3 HTTP/1.1\r\nHost: x\r\n\r\n')
+
+        def _check():
+            if not transport.value().endswith(b'\r\n0\r\n\r\n'):
+                return deferLater(reactor, 0.01, _check)
+
+            assert transport.value().count(b'>spyne-event-loop<') == 3
+
+        return deferLater(reactor, 0.01, _check)
+
+    def test_compress(self):
+        import zlib
+        from twisted.internet import reactor
+        from twisted.internet.task import deferLater
+        from twisted.web.server import Site
+        from spyne.protocol.json import JsonDocument
+        from spyne.server.twisted import TwistedWebResource
+
+        class SomeService(Service):
+            @rpc(Integer, _returns=Iterable(Unicode))
+            def some_call(ctx, n):
+                return (u'x' * 1000 for _ in range(n))
+
+        app = Application([SomeService], 'tns', in_protocol=HttpRpc(),
+                                                   out_protocol=JsonDocument())
+
+        resource = TwistedWebResource(app, compress=True)
+        resource.http_transport.reactor_thread = threading.current_thread()
+        site = Site(resource)
+        site.timeOut = None
+
+        prot, transport = self.gen_prot(site)
+        prot.dataReceived(b'GET /some_call?n=100 HTTP/1.1\r\nHost: x\r\n'
+                                         b'Accept-Encoding: gzip\r\n\r\n')
+
+        def _check():
+            # the response is written by a pull producer in the reactor
+            if not transport.value().endswith(b'\r\n0\r\n\r\n'):
+                return deferLater(reactor, 0.01, _check)
+
+            headers, body = transport.value().split(b'\r\n\r\n', 1)
+            assert headers.startswith(b'HTTP/1.1 200')
+            assert b'Content-Encoding: gzip' in headers
+            assert b'Transfer-Encoding: chunked' in headers
+
+            # undo the chunked transfer encoding
+            data = []
+            while True:
+                length, body = body.split(b'\r\n', 1)
+                length = int(length, 16)
+                if length == 0:
+                    break
+                data.append(body[:length])
+                body = body[length + 2:]
+
+            data = zlib.decompress(b''.join(data), 16 + zlib.MAX_WBITS)
+            assert data.count(b'x' * 1000) == 100
+
+        return deferLater(reactor, 0.01, _check)
+
+    def test_wsdl(self):
+        from twisted.web.server import Site
+        from spyne.protocol.soap import Soap11
+        from spyne.server.twisted import TwistedWebResource
+
+        class SomeService(Service):
+            @rpc(Integer, _returns=Integer)
+            def some_call(ctx, n):
+                return n
+
+        app = Application([SomeService], 'tns', in_protocol=Soap11(),
+                                                         out_protocol=Soap11())
+        site = Site(TwistedWebResource(app))
+        site.timeOut = None
+
+        prot, transport = self.gen_prot(site)
+        prot.dataReceived(b'GET /?wsdl HTTP/1.1\r\nHost: x\r\n\r\n')
+
+        headers, body = transport.value().split(b'\r\n\r\n', 1)
+        assert headers.startswith(b'HTTP/1.1 200')
+        assert b'some_call' in body
+
+        etag, = [l.split(b': ', 1)[1] for l in headers.split(b'\r\n')
+                                                 if l.lower().startswith(b'etag')]
+
+        prot, transport = self.gen_prot(site)
+        prot.dataReceived(b'GET /?wsdl HTTP/1.1\r\nHost: x\r\n'
+                                     b'If-None-Match: ' + etag + b'\r\n\r\n')
+
+        assert transport.value().startswith(b'HTTP/1.1 304')
@@ -0,0 +1,324 @@
+#
+# spyne - Copyright (C) Spyne contributors.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301
+#
+
+import os
+import json
+import time
+import shutil
+import signal
+import tempfile
+import threading
+import unittest
+
+import zmq
+
+from spyne import Application, Service, srpc
+from spyne.model import Integer, Double
+from spyne.protocol.json import JsonDocument
+
+
+class SomeService(Service):
+    @srpc(Double, _returns=Integer)
+    def get_pid(delay):
+        if delay:
+            time.sleep(delay)
+        return os.getpid()
+
+
+def _call(url, delay=None, timeout=1000):
+    """Returns the pid of the worker that processed the request, or None when
+    the request timed out."""
+
+    socket = zmq.Context.instance().socket(zmq.REQ)
+    socket.setsockopt(zmq.LINGER, 0)
+    socket.setsockopt(zmq.RCVTIMEO, timeout)
+    socket.connect(url)
+
+    try:
+        socket.send(json.dumps({"get_pid": {"delay": delay}}).encode('utf8'))
+        try:
+            return json.loads(socket.recv().decode('utf8'))
+        except zmq.Again:
+            return None
+
+    finally:
+        socket.close()
+
+
+@unittest.skipIf(not hasattr(os, 'fork'), "needs fork()")
+class TestZeroMQPreforkServer(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.url = 'ipc://%s/server' % self.tmp_dir
+        self.server_pid = None
+
+    def tearDown(self):
+        if self.server_pid is not None:
+            os.kill(self.server_pid, signal.SIGKILL)
+            os.waitpid(self.server_pid, 0)
+
+        shutil.rmtree(self.tmp_dir)
+
+    def start_server(self, pool_size, server_class=None):
+        from spyne.server.zeromq import ZeroMQPreforkServer
+
+        if server_class is None:
+            server_class = ZeroMQPreforkServer
+
+        class SomeServer(server_class):
+            poll_interval = 0.05
+
+        pid = os.fork()
+        if pid == 0:
+            retval = 1
+            try:
+                app = Application([SomeService], 'tns',
+                          in_protocol=JsonDocument(), out_protocol=JsonDocument())
+
+                SomeServer(app, self.url, pool_size).serve_forever()
+                retval = 0
+
+            finally:
+                os._exit(retval)
+
+        self.server_pid = pid
+
+    def stop_server(self):
+        os.kill(self.server_pid, signal.SIGTERM)
+        _, status = os.waitpid(self.server_pid, 0)
+        self.server_pid = None
+
+        return status
+
+    def test_workers(self):
+        self.start_server(2)
+
+        pids = set(_call(self.url) for _ in range(10))
+
+        assert None not in pids
+        assert len(pids) == 2
+        assert self.server_pid not in pids
+
+        assert self.stop_server() == 0
+
+    def test_restart(self):
+        self.start_server(1)
+
+        pid = _call(self.url)
+        os.kill(pid, signal.SIGKILL)
+
+        for _ in range(20):
+            new_pid = _call(self.url, timeout=250)
+            if new_pid is not None:
+                break
+
+        assert new_pid not in (None, pid)
+
+    def test_restart_backoff(self):
+        from spyne.server.zeromq import ZeroMQPreforkServer
+
+        starts = os.path.join(self.tmp_dir, 'starts')
+
+        class BrokenServer(ZeroMQPreforkServer):
+            def run_worker(self, i):
+                with open(starts, 'a') as f:
+                    f.write('.')
+                os._exit(1)
+
+        self.start_server(1, BrokenServer)
+        time.sleep(1)
+
+        # starts at 0, 0.1, 0.3 and 0.7 seconds
+        with open(starts) as f:
+            assert 2 < len(f.read()) < 6
+
+        assert self.stop_server() == 0
+
+    def test_worker_died_while_busy(self):
+        self.start_server(1)
+        pid = _call(self.url)
+
+        socket = zmq.Context.instance().socket(zmq.REQ)
+        socket.setsockopt(zmq.LINGER, 0)
+        socket.connect(self.url)
+
+        try:
+            socket.send(json.dumps({"get_pid": {"delay": 5}}).encode('utf8'))
+            time.sleep(0.2)
+
+            os.kill(pid, signal.SIGKILL)
+            time.sleep(0.2)
+
+            # the lost request isn't waited for
+            start = time.time()
+            assert self.stop_server() == 0
+            assert time.time() - start < 2
+
+        finally:
+            socket.close()
+
+    def test_drain(self):
+        self.start_server(1)
+        assert _call(self.url) is not None
+
+        socket = zmq.Context.instance().socket(zmq.REQ)
+        socket.setsockopt(zmq.LINGER, 0)
+        socket.setsockopt(zmq.RCVTIMEO, 5000)
+        socket.connect(self.url)
+
+        try:
+            socket.send(json.dumps({"get_pid": {"delay": 0.5}}).encode('utf8'))
+            time.sleep(0.1)
+
+            os.kill(self.server_pid, signal.SIGTERM)
+
+            # the pending request is processed before the server exits
+            assert json.loads(socket.recv().decode('utf8')) is not None
+
+        finally:
+            socket.close()
+
+        _, status = os.waitpid(self.server_pid, 0)
+        self.server_pid = None
+
+        assert status == 0
+
+        # new requests are not accepted
+        assert _call(self.url, timeout=250) is None
+
+
+class TestZeroMQRouterServer(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.url = 'ipc://%s/server' % self.tmp_dir
+        self.server = None
+
+    def tearDown(self):
+        if self.server is not None:
+            self.stop_server()
+
+        shutil.rmtree(self.tmp_dir)
+
+    def start_server(self, **kwargs):
+        from spyne.server.zeromq import ZeroMQRouterServer
+
+        class SomeServer(ZeroMQRouterServer):
+            poll_interval = 0.05
+
+        app = Application([SomeService], 'tns',
+                          in_protocol=JsonDocument(), out_protocol=JsonDocument())
+
+        self.server = SomeServer(app, self.url, **kwargs)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def stop_server(self):
+        self.server.shutdown()
+        self.thread.join()
+        self.server = None
+
+    def _send(self, socket, request_id, delay):
+        socket.send_multipart([request_id, b'',
+                  json.dumps({"get_pid": {"delay": delay}}).encode('utf8')])
+
+    def _dealer(self):
+        socket = zmq.Context.instance().socket(zmq.DEALER)
+        socket.setsockopt(zmq.LINGER, 0)
+        socket.setsockopt(zmq.RCVTIMEO, 5000)
+        socket.connect(self.url)
+        return socket
+
+    def test_req(self):
+        self.start_server()
+
+        assert _call(self.url) == os.getpid()
+
+    def test_out_of_order(self):
+        self.start_server(pool_size=2)
+
+        socket = self._dealer()
+        try:
+            self._send(socket, b'slow', 0.5)
+            self._send(socket, b'fast', 0)
+
+            request_id, delim, pid = socket.recv_multipart()
+            assert (request_id, delim) == (b'fast', b'')
+            assert json.loads(pid.decode('utf8')) == os.getpid()
+
+            request_id, _, _ = socket.recv_multipart()
+            assert request_id == b'slow'
+
+        finally:
+            socket.close()
+
+    def test_aux_proc_pool(self):
+        from spyne.auxproc.thread import ThreadAuxProc
+
+        aux = ThreadAuxProc(pool_size=2)
+        aux.initialize(None)
+        self.start_server(pool=aux.pool)
+
+        socket = self._dealer()
+        try:
+            self._send(socket, b'slow', 0.5)
+            self._send(socket, b'fast', 0)
+
+            assert socket.recv_multipart()[0] == b'fast'
+            assert socket.recv_multipart()[0] == b'slow'
+
+        finally:
+            socket.close()
+            aux.pool.close()
+
+    def test_max_pending(self):
+        self.start_server(pool_size=2, max_pending=1)
+
+        socket = self._dealer()
+        try:
+            self._send(socket, b'slow', 0.2)
+            self._send(socket, b'fast', 0)
+
+            # the second request is not read before the first one is done.
+            assert socket.recv_multipart()[0] == b'slow'
+            assert socket.recv_multipart()[0] == b'fast'
+
+        finally:
+            socket.close()
+
+    def test_shutdown(self):
+        self.start_server()
+
+        socket = self._dealer()
+        try:
+            self._send(socket, b'slow', 0.5)
+            time.sleep(0.1)
+
+            self.server.shutdown()
+
+            # the pending request is processed before the server exits
+            assert socket.recv_multipart()[0] == b'slow'
+
+        finally:
+            socket.close()
+
+        self.thread.join()
+        self.server = None
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+#
+# spyne - Copyright (C) Spyne contributors.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301
+#
+
+import asyncio
+import threading
+import unittest
+
+from spyne import Application, Service, rpc, srpc
+from spyne.model import Integer, Unicode, Fault
+from spyne.protocol.http import HttpRpc
+from spyne.protocol.json import JsonDocument
+from spyne.protocol.xml import XmlDocument
+from spyne.server.null import NullServer
+from spyne.server.wsgi import WsgiApplication
+from spyne.util.aio import get_shared_loop, run_coroutine
+
+
+class TestSharedLoop(unittest.TestCase):
+    def test_run_coroutine(self):
+        async def _some_coro():
+            return threading.current_thread()
+
+        thread = run_coroutine(_some_coro())
+
+        assert thread is not threading.current_thread()
+        assert get_shared_loop() is get_shared_loop()
+
+    def test_run_coroutine_from_loop(self):
+        async def _inner():
+            pass
+
+        async def _outer():
+            coro = _inner()
+            try:
+                run_coroutine(coro)
+            finally:
+                coro.close()
+
+        self.assertRaises(RuntimeError, run_coroutine, _outer())
+
+
+class TestAsyncMethods(unittest.TestCase):
+    def test_is_coroutine(self):
+        class SomeService(Service):
+            @srpc(_returns=Integer)
+            def sync_call():
+                return 1
+
+            @srpc(_returns=Integer)
+            async def async_call():
+                return 1
+
+        app = Application([SomeService], 'tns', in_protocol=XmlDocument(),
+                                                    out_protocol=XmlDocument())
+
+        smm = app.interface.service_method_map
+        assert not smm['{tns}sync_call'][0].is_coroutine
+        assert smm['{tns}async_call'][0].is_coroutine
+
+    def test_null_server(self):
+        class SomeService(Service):
+            @srpc(Integer, _returns=Integer)
+            async def some_call(n):
+                # the backend calls run concurrently
+                async def _backend_call(i):
+                    await asyncio.sleep(0.01)
+                    return i
+
+                retval = await asyncio.gather(*[_backend_call(i)
+                                                             for i in range(n)])
+                return sum(retval)
+
+        app = Application([SomeService], 'tns', in_protocol=XmlDocument(),
+                                                    out_protocol=XmlDocument())
+
+        assert NullServer(app).service.some_call(10) == 45
+
+    def test_null_server_fault(self):
+        class SomeService(Service):
+            @srpc(Integer, _returns=Integer)
+            async def some_call(n):
+                raise Fault('Client.SomeFault', 'some fault')
+
+        app = Application([SomeService], 'tns', in_protocol=XmlDocument(),
+                                                    out_protocol=XmlDocument())
+
+        try:
+            NullServer(app).service.some_call(10)
+        except Fault as e:
+            assert e.faultcode == 'Client.SomeFault'
+        else:
+            raise Exception("must raise Fault")
+
+    def test_wsgi(self):
+        class SomeService(Service):
+            @rpc(Unicode, _returns=Unicode)
+            async def some_call(ctx, s):
+                await asyncio.sleep(0)
+                return s * 2
+
+        app = Application([SomeService], 'tns', in_protocol=HttpRpc(),
+                                                   out_protocol=JsonDocument())
+
+        status = []
+        def start_response(code, headers):
+            status.append(code)
+
+        ret = WsgiApplication(app)({
+            'QUERY_STRING': 's=ab',
+            'PATH_INFO': '/some_call',
+            'REQUEST_METHOD': 'GET',
+            'SERVER_NAME': 'localhost',
+            'SERVER_PORT': '80',
+            'wsgi.url_scheme': 'http',
+        }, start_response)
+
+        assert b''.join(ret) == b'"abab"'
+        assert status[0].startswith('200')
+
+
+if __name__ == '__main__':
+    unittest.main()
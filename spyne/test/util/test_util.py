@@ -86,6 +86,37 @@ class TestTypeInfo(unittest.TestCase):
         assert d[1] == d['b'] == 2
 
 
+class TestCompress(unittest.TestCase):
+    def test_negotiate_encoding(self):
+        from spyne.util.compress import negotiate_encoding
+
+        assert negotiate_encoding(None, ('gzip',)) is None
+        assert negotiate_encoding('gzip', ('gzip',)) == 'gzip'
+        assert negotiate_encoding('GZIP;q=0.5', ('gzip',)) == 'gzip'
+        assert negotiate_encoding('gzip;q=0', ('gzip',)) is None
+        assert negotiate_encoding('identity', ('gzip',)) is None
+        assert negotiate_encoding('*', ('br', 'gzip')) == 'br'
+        assert negotiate_encoding('br;q=0.1, gzip', ('br', 'gzip')) == 'gzip'
+        assert negotiate_encoding('*, br;q=0', ('br', 'gzip')) == 'gzip'
+
+    def test_compress_iter(self):
+        import zlib
+        from spyne.util.compress import compress, compress_iter
+
+        chunks = [b'a' * 1000, b'', b'b' * 1000]
+        data = b''.join(chunks)
+
+        gz = b''.join(compress_iter(iter(chunks), 'gzip'))
+        assert zlib.decompress(gz, 16 + zlib.MAX_WBITS) == data
+
+        deflated = list(compress_iter(chunks, 'deflate'))
+        assert b'' not in deflated
+        assert zlib.decompress(b''.join(deflated)) == data
+        assert zlib.decompress(compress(data, 'deflate', 1)) == data
+
+        self.assertRaises(ValueError, list, compress_iter(chunks, 'xz'))
+
+
 class TestXml(unittest.TestCase):
     def test_serialize(self):
 
@@ -201,6 +232,38 @@ class TestCDict(unittest.TestCase):
         else:
             raise Exception("Must fail.")
 
+    def test_cdict_freeze(self):
+        from spyne.util.cdict import cdict
+
+        class A(object):
+            pass
+
+        class B(A):
+            pass
+
+        class C(B):
+            pass
+
+        d = cdict({A: "fun"})
+        assert d[C] == 'fun'
+        assert not (C in d)
+
+        d[B] = 'zan'
+        assert d[C] == 'zan'
+
+        d.freeze([B, C, object])
+        assert dict(d) == {A: 'fun', B: 'zan', C: 'zan'}
+
+        class D(C):
+            pass
+
+        assert d[D] == 'zan'
+        assert not (D in d)
+
+        self.assertRaises(TypeError, d.__setitem__, D, 'fun')
+        self.assertRaises(TypeError, d.update, {D: 'fun'})
+        self.assertRaises(TypeError, d.pop, A)
+
 
 class TestTDict(unittest.TestCase):
     def test_tdict_notype(self):
@@ -596,6 +659,70 @@ class TestMemoization(unittest.TestCase):
         f({})
         assert counter[0] == 3
 
+    def test_memoize_lru(self):
+        counter = [0]
+        @memoize.bounded(maxsize=2)
+        def f(arg):
+            counter[0] += 1
+            return arg
+
+        f(1)
+        f(2)
+        f(1)
+        f(3)  # evicts 2
+        assert counter[0] == 3
+
+        f(1)
+        assert counter[0] == 3
+        f(2)
+        assert counter[0] == 4
+
+        stats = f.get_stats()
+        assert stats['size'] == 2
+        assert stats['hits'] == 2
+        assert stats['misses'] == 4
+        assert stats['evictions'] == 2
+        assert stats in memoize.registry.get_stats()
+
+    def test_memoize_ttl(self):
+        counter = [0]
+        @memoize.bounded(ttl=60)
+        def f(arg):
+            counter[0] += 1
+            return arg
+
+        f(1)
+        f(1)
+        assert counter[0] == 1
+
+        f.expires[(1,)] -= 120
+        f(1)
+        assert counter[0] == 2
+        assert f.get_stats()['evictions'] == 1
+
+    def test_memoize_weak_class_keys(self):
+        import gc
+
+        @memoize
+        def f(cls):
+            return cls.__name__
+
+        @memoize_id
+        def g(cls):
+            return cls.__name__
+
+        class C(object):
+            pass
+
+        assert f(C) == g(C) == 'C'
+        assert len(f.memo) == len(g.memo) == 1
+
+        del C
+        gc.collect()
+
+        assert len(f.memo) == len(g.memo) == 0
+        assert f.get_stats()['evictions'] == g.get_stats()['evictions'] == 1
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -95,6 +95,33 @@ else:
         return joiner.join(val)
 
 
+_BUFFER_TYPES = (six.binary_type, bytearray, memoryview)
+
+
+def join_in_string(in_string):
+    """Returns the contents of the given ``ctx.in_string`` as a single buffer.
+
+    When the transport already read the whole request into one buffer (a
+    ``bytearray`` or a ``memoryview`` of an mmap'd file, see
+    :class:`spyne.server.wsgi.WsgiApplication`), that buffer is returned as-is
+    instead of being copied into a new ``bytes`` object.
+    """
+
+    if isinstance(in_string, _BUFFER_TYPES):
+        return in_string
+
+    if not isinstance(in_string, (list, tuple)):
+        in_string = list(in_string)
+
+    if len(in_string) == 1:
+        return in_string[0]
+
+    if len(in_string) > 0 and isinstance(in_string[0], six.text_type):
+        return u''.join(in_string)
+
+    return b''.join(in_string)
+
+
 def utf8(s):
     if isinstance(s, bytes):
         return s.decode('utf8')
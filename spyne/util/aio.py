@@ -0,0 +1,84 @@
+
+#
+# spyne - Copyright (C) Spyne contributors.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301
+#
+
+"""Helpers for running the coroutines returned by ``async def`` service
+methods from transports that don't have an asyncio event loop of their own."""
+
+import os
+import threading
+
+try:
+    import asyncio
+    from inspect import iscoroutine, iscoroutinefunction
+
+except ImportError:  # Python 2
+    asyncio = None
+
+    def iscoroutine(obj):
+        return False
+
+    def iscoroutinefunction(func):
+        return False
+
+
+_loop = None
+_loop_pid = None
+_loop_thread = None
+_mtx_loop = threading.Lock()
+
+
+def get_shared_loop():
+    """Returns the asyncio event loop that's shared by all transports that run
+    coroutines to completion. It's run in a daemon thread which is started on
+    first call, and once more in every process that's forked afterwards."""
+
+    global _loop, _loop_pid, _loop_thread
+
+    with _mtx_loop:
+        if _loop is None or _loop_pid != os.getpid():
+            loop = asyncio.new_event_loop()
+
+            thread = threading.Thread(target=loop.run_forever,
+                                                      name='spyne-event-loop')
+            thread.daemon = True
+            thread.start()
+
+            _loop = loop
+            _loop_pid = os.getpid()
+            _loop_thread = thread
+
+        return _loop
+
+
+def submit_coroutine(coro):
+    """Schedules the given coroutine in the shared event loop and returns a
+    :class:`concurrent.futures.Future` that's done when the coroutine is."""
+
+    return asyncio.run_coroutine_threadsafe(coro, get_shared_loop())
+
+
+def run_coroutine(coro):
+    """Runs the given coroutine to completion in the shared event loop and
+    returns its return value. The calling thread is blocked in the meantime,
+    so this must not be called from the shared event loop itself."""
+
+    if threading.current_thread() is _loop_thread:
+        raise RuntimeError("Can't block the shared event loop to run %r" % coro)
+
+    return submit_coroutine(coro).result()
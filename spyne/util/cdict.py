@@ -20,8 +20,16 @@
 """cdict (ClassDict) is a funny kind of dict that tries to return the values for
 the base classes of a key when the entry for the key is not found. It is not a
 generalized dictionary that can handle any type of key -- it relies on
-spyne.model api to look for classes. It also assumes cdict never changes after
-the first lookup.
+spyne.model api to look for classes.
+
+Keys that are not in the dict are resolved by walking their MRO. Results are
+cached in a separate table that is only written to under a lock, so the dict
+itself only changes when it's explicitly modified. Modifying the dict
+invalidates that cache.
+
+Calling :func:`cdict.freeze` precomputes entries for the given classes and
+makes the dict immutable. It's meant to be called once all handlers are
+registered, e.g. when a protocol is bound to an application.
 
 >>> from spyne.util.cdict import cdict
 >>> class A(object):
@@ -39,43 +47,112 @@ the first lookup.
 >>> d=cdict({A: "fun", object: "base"})
 >>> print d[A]
 fun
->>> print d
-{<class '__main__.A'>: 'fun', <type 'object'>: 'base'}
 >>> print d[B]
 fun
->>> print d
-{<class '__main__.A'>: 'fun', <class '__main__.B'>: 'fun', <type 'object'>: 'base'}
 >>> print d[C]
 base
 >>> print d
-{<class '__main__.A'>: 'fun', <class '__main__.B'>: 'fun', <class '__main__.C'>: 'base', <type 'object'>: 'base'}
->>> print d[D]
-*** KeyError: <class __main__.D at 0x8d92c0>
+{<class '__main__.A'>: 'fun', <type 'object'>: 'base'}
+>>> d.freeze([B])
+>>> print d
+{<class '__main__.A'>: 'fun', <class '__main__.B'>: 'fun', <type 'object'>: 'base'}
+>>> d[D] = 'oops'
+*** TypeError: cdict is frozen
 >>>
 """
 
 import logging
 logger = logging.getLogger(__name__)
 
+from inspect import getmro
+from threading import Lock
+
+
+def _frozen(*args, **kwargs):
+    raise TypeError("cdict is frozen")
+
+
 class cdict(dict):
+    def __init__(self, *args, **kwargs):
+        super(cdict, self).__init__(*args, **kwargs)
+
+        self.frozen = False
+        self._resolved = {}
+        self._lock = Lock()
+
     def __getitem__(self, cls):
         try:
             return dict.__getitem__(self, cls)
 
-        except KeyError as e:
+        except KeyError:
             if not hasattr(cls, '__bases__'):
                 cls = cls.__class__
 
-            for b in reversed(cls.__bases__):
-                try:
-                    retval = self[b]
-                    # this is why a cdict instance must never be modified after
-                    # the first lookup
-                    self[cls] = retval
-                    return retval
-                except KeyError:
-                    pass
-            raise e
+            try:
+                return self._resolved[cls]
+            except KeyError:
+                pass
+
+            with self._lock:
+                return self._resolve(cls)
+
+    def _lookup(self, cls):
+        for b in getmro(cls):
+            if dict.__contains__(self, b):
+                return dict.__getitem__(self, b)
+
+        raise KeyError(cls)
+
+    def _resolve(self, cls):
+        """Must be called with the lock held."""
+
+        retval = self._lookup(cls)
+
+        # replace the table instead of modifying it so that readers never see
+        # it while it's being changed.
+        resolved = dict(self._resolved)
+        resolved[cls] = retval
+        self._resolved = resolved
+
+        return retval
+
+    def __setitem__(self, key, value):
+        if self.frozen:
+            _frozen()
+
+        with self._lock:
+            dict.__setitem__(self, key, value)
+            self._resolved = {}
+
+    def __delitem__(self, key):
+        if self.frozen:
+            _frozen()
+
+        with self._lock:
+            dict.__delitem__(self, key)
+            self._resolved = {}
+
+    def _mutate(name):
+        def _mutator(self, *args, **kwargs):
+            if self.frozen:
+                _frozen()
+
+            with self._lock:
+                retval = getattr(dict, name)(self, *args, **kwargs)
+                self._resolved = {}
+
+            return retval
+
+        _mutator.__name__ = name
+        return _mutator
+
+    update = _mutate('update')
+    setdefault = _mutate('setdefault')
+    pop = _mutate('pop')
+    popitem = _mutate('popitem')
+    clear = _mutate('clear')
+
+    del _mutate
 
     def get(self, k, d=None):
         try:
@@ -83,3 +160,28 @@ class cdict(dict):
 
         except KeyError:
             return d
+
+    def freeze(self, classes=()):
+        """Stores entries for the given classes in the dict itself, so that
+        looking them up is a single dict hit, and makes the dict immutable.
+        Classes that don't resolve to any entry are ignored. Classes that are
+        looked up later are still resolved, but never change the dict."""
+
+        with self._lock:
+            if self.frozen:
+                return
+
+            for cls in classes:
+                if dict.__contains__(self, cls):
+                    continue
+
+                try:
+                    dict.__setitem__(self, cls, self._lookup(cls))
+                except KeyError:
+                    pass
+
+            self._resolved = {}
+            self.frozen = True
+
+    def __reduce__(self):
+        return self.__class__, (dict(self),)
@@ -0,0 +1,166 @@
+#
+# spyne - Copyright (C) Spyne contributors.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301
+#
+
+"""Helpers for the HTTP content codings. ``br`` is only available when the
+``brotli`` package is installed."""
+
+import gzip
+import zlib
+
+from io import BytesIO
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+ENCODINGS = ('gzip',)
+"""Content codings that are offered for precompressed documents, in the
+order of preference. :func:`compress` also supports ``deflate``."""
+
+if brotli is not None:
+    ENCODINGS = ('br',) + ENCODINGS
+
+
+def parse_accept_encoding(accept_encoding):
+    """Parses the value of an ``Accept-Encoding`` header and returns a dict
+    of lowercase content codings to their quality values."""
+
+    retval = {}
+    if not accept_encoding:
+        return retval
+
+    for elt in accept_encoding.split(','):
+        params = elt.split(';')
+
+        coding = params[0].strip().lower()
+        if len(coding) == 0:
+            continue
+
+        q = 1.0
+        for param in params[1:]:
+            k, _, v = param.partition('=')
+            if k.strip().lower() == 'q':
+                try:
+                    q = float(v)
+                except ValueError:
+                    q = 0.0
+
+        retval[coding] = q
+
+    return retval
+
+
+def negotiate_encoding(accept_encoding, encodings=ENCODINGS):
+    """Returns the content coding in ``encodings`` that's most preferred by
+    the client, or ``None`` when the response is to be sent as is.
+
+    :param accept_encoding: The value of the ``Accept-Encoding`` header.
+    :param encodings: The content codings the server supports, in the order
+        of the server's preference.
+    """
+
+    accepted = parse_accept_encoding(accept_encoding)
+    if len(accepted) == 0:
+        return None
+
+    retval = None
+    best_q = 0.0
+
+    default_q = accepted.get('*', 0.0)
+    for encoding in encodings:
+        q = accepted.get(encoding, default_q)
+        if q > best_q:
+            retval, best_q = encoding, q
+
+    return retval
+
+
+def compress(data, encoding, level=9):
+    """Compresses the given bytestring. The output doesn't depend on the
+    current time.
+
+    :param level: The compression level, from 1 (fastest) to 9 (smallest).
+    """
+
+    if encoding == 'gzip':
+        stream = BytesIO()
+        with gzip.GzipFile(fileobj=stream, mode='wb', compresslevel=level,
+                                                                 mtime=0) as f:
+            f.write(data)
+
+        return stream.getvalue()
+
+    if encoding == 'deflate':
+        return zlib.compress(data, level)
+
+    if encoding == 'br' and brotli is not None:
+        return brotli.compress(data, quality=_brotli_quality(level))
+
+    raise ValueError("Unsupported content coding %r" % (encoding,))
+
+
+def _brotli_quality(level):
+    # brotli's quality goes up to 11.
+    if level >= 9:
+        return 11
+    return level
+
+
+class _BrotliCompressor(object):
+    def __init__(self, level):
+        self.compressor = brotli.Compressor(quality=_brotli_quality(level))
+
+    def compress(self, data):
+        return self.compressor.process(data)
+
+    def flush(self):
+        return self.compressor.finish()
+
+
+def get_compressor(encoding, level=6):
+    """Returns an object with the ``compress(data)`` and ``flush()`` methods
+    of ``zlib`` compressors that produces the given content coding."""
+
+    if encoding == 'gzip':
+        return zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    if encoding == 'deflate':
+        return zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS)
+
+    if encoding == 'br' and brotli is not None:
+        return _BrotliCompressor(level)
+
+    raise ValueError("Unsupported content coding %r" % (encoding,))
+
+
+def compress_iter(chunks, encoding, level=6):
+    """Compresses the given iterable of bytestrings as it's consumed. Empty
+    chunks are not yielded."""
+
+    compressor = get_compressor(encoding, level)
+
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+
+    data = compressor.flush()
+    if data:
+        yield data
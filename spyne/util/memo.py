@@ -19,11 +19,24 @@
 
 """The module for memoization stuff.
 
-When you have memory leaks in your daemon, the reason could very well be
-reckless usage of the tools here.
+Memoizers cache forever by default. Pass ``maxsize`` and/or ``ttl`` via
+:func:`memoize.bounded` to evict least recently used and/or expired entries::
 
-These are NOT thread-safe. If you are relying on exactly-one-execution-per-key
-behavior in a multithreaded environment, roll your own stuff.
+    @memoize.bounded(maxsize=1024, ttl=300)
+    def f(cls):
+        ...
+
+Classes passed as arguments are only weakly referenced and their entries are
+dropped when they are garbage collected, so dynamically customized classes
+don't accumulate in the memoization tables. Arguments that :class:`memoize_id`
+can't weakly reference are kept alive as long as their entries, so that their
+ids can't be reused while the entry exists.
+
+Every memoizer is registered in ``memoize.registry``, whose ``get_stats()``
+returns hit, miss and eviction counters for all of them.
+
+Calls are thread-safe, but the decorated function may still be called more
+than once for the same key when the key is evicted or reset concurrently.
 """
 
 
@@ -31,96 +44,275 @@ import logging
 logger = logging.getLogger(__name__)
 
 import threading
+import warnings
 
+from time import time
+from weakref import ref
+from collections import OrderedDict
 
-MEMOIZATION_STATS_LOG_INTERVAL = 60.0
 
+# marks keys of calls with keyword arguments
+_KWARGS = type("_KWARGS", (object,), {})()
 
-def _log_all():
-    logger.info("%d memoizers", len(memoize.registry))
-    for memo in memoize.registry:
-        logger.info("%r: %d entries.", memo.func, len(memo.memo))
+class MemoizationRegistry(list):
+    """The list of all memoizers."""
 
+    def get_stats(self):
+        """Returns a list of dicts with statistics for every memoizer. See
+        :func:`memoize.get_stats`."""
 
-def _log_func(func):
-    for memo in memoize.registry:
-        if memo.func is func.func.im_self.func:
-            break
-    else:
-        logger.error("%r not found in memoization regisry", func)
-        return
+        return [m.get_stats() for m in self]
 
-    logger.info("%r: %d entries.", memo.func, len(memo.memo))
-    for k, v in memo.memo.items():
-        logger.info("\t%r: %r", k, v)
+    def log_stats(self, level=logging.INFO):
+        logger.log(level, "%d memoizers", len(self))
+        for stats in self.get_stats():
+            logger.log(level, "%(func)r: %(size)d entries, %(hits)d hits, "
+                          "%(misses)d misses, %(evictions)d evictions.", stats)
 
+    def reset(self):
+        for m in self:
+            m.reset()
 
-def start_memoization_stats_logger(func=None):
-    logger.info("Enabling @memoize statistics every %d second(s).",
-                                                 MEMOIZATION_STATS_LOG_INTERVAL)
 
-    if func is None:
-        _log_all()
-    else:
-        _log_func(func)
+def start_memoization_stats_logger(func=None):
+    """Deprecated. Logs memoization statistics once. Use
+    ``memoize.registry.get_stats()`` or ``memoize.registry.log_stats()``
+    instead."""
 
-    t = threading.Timer(MEMOIZATION_STATS_LOG_INTERVAL,
-                                        start_memoization_stats_logger, (func,))
+    warnings.warn("start_memoization_stats_logger is deprecated, use "
+           "memoize.registry.get_stats() instead.", DeprecationWarning)
 
-    t.daemon = True
-    t.start()
+    memoize.registry.log_stats()
 
 
 class memoize(object):
-    """A memoization decorator that keeps caching until reset."""
+    """A memoization decorator that keeps caching until reset, or until
+    eviction when ``maxsize`` or ``ttl`` is set.
+
+    :param maxsize: Maximum number of entries to keep. The least recently used
+        entry is evicted when a new entry would exceed it. ``None`` means
+        unbounded.
+    :param ttl: Maximum age of an entry in seconds. ``None`` means entries
+        don't expire.
+    """
 
-    registry = []
+    registry = MemoizationRegistry()
+
+    def __init__(self, func, maxsize=None, ttl=None):
+        assert maxsize is None or maxsize > 0, "maxsize must be positive"
 
-    def __init__(self, func):
         self.func = func
-        self.memo = {}
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.bounded = maxsize is not None or ttl is not None
+
         self.lock = threading.RLock()
+        if maxsize is None:
+            self.memo = {}
+        else:
+            self.memo = OrderedDict()
+
+        self.expires = {}
+        self.referents = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
         memoize.registry.append(self)
 
+    @classmethod
+    def bounded(cls, maxsize=None, ttl=None):
+        """Returns a decorator that creates memoizers of this type with the
+        given ``maxsize`` and ``ttl``."""
+
+        def _decorator(func):
+            return cls(func, maxsize=maxsize, ttl=ttl)
+
+        return _decorator
+
     def __call__(self, *args, **kwargs):
         key = self.get_key(args, kwargs)
-        # we hope that gil makes this comparison is race-free
-        if not key in self.memo:
-            with self.lock:
-                # make sure the situation hasn't changed after lock acq
-                if not key in self.memo:
-                    value = self.func(*args, **kwargs)
-                    self.memo[key] = value
-                    return value
-        return self.memo.get(key)
+
+        if self.bounded:
+            return self._call_bounded(key, args, kwargs)
+
+        try:
+            value = self.memo[key]
+        except KeyError:
+            return self._miss(key, args, kwargs)
+
+        self.hits += 1
+        return value
+
+    def _call_bounded(self, key, args, kwargs):
+        with self.lock:
+            try:
+                value = self.memo[key]
+            except KeyError:
+                return self._miss(key, args, kwargs)
+
+            if self.ttl is not None and self.expires[key] < time():
+                self._remove(key)
+                self.evictions += 1
+                return self._miss(key, args, kwargs)
+
+            if self.maxsize is not None:
+                # move it to the end of the lru queue
+                del self.memo[key]
+                self.memo[key] = value
+
+            self.hits += 1
+            return value
+
+    def _miss(self, key, args, kwargs):
+        with self.lock:
+            # make sure the situation hasn't changed after lock acq
+            try:
+                value = self.memo[key]
+            except KeyError:
+                pass
+            else:
+                self.hits += 1
+                return value
+
+            self.misses += 1
+            value = self.func(*args, **kwargs)
+            if self.should_store(value):
+                self._store(key, value, args, kwargs)
+
+            return value
+
+    def _store(self, key, value, args, kwargs):
+        if self.maxsize is not None:
+            while len(self.memo) >= self.maxsize:
+                oldest = next(iter(self.memo))
+                self._remove(oldest)
+                self.evictions += 1
+
+        referents = self.get_referents(key, args, kwargs)
+        if referents:
+            self.referents[key] = referents
+
+        if self.ttl is not None:
+            self.expires[key] = time() + self.ttl
+
+        self.memo[key] = value
+
+    def _remove(self, key):
+        self.memo.pop(key, None)
+        self.expires.pop(key, None)
+        self.referents.pop(key, None)
+
+    def _make_callback(self, key):
+        # must not keep a strong reference to the key objects
+        self_ref = ref(self)
+
+        def _collected(_):
+            self_ = self_ref()
+            if self_ is not None and key in self_.memo:
+                self_._remove(key)
+                self_.evictions += 1
+
+        return _collected
+
+    def should_store(self, value):
+        """Returns whether the given return value of the memoized function is
+        to be stored."""
+
+        return True
 
     def get_key(self, args, kwargs):
-        return tuple(args), tuple(kwargs.items())
+        """Classes are weakly referenced in keys."""
+
+        argkey = tuple([ref(a) if isinstance(a, type) else a for a in args])
+        if not kwargs:
+            return argkey
+
+        kwkey = tuple([(k, ref(v) if isinstance(v, type) else v)
+                                                   for k, v in kwargs.items()])
+
+        return _KWARGS, argkey, kwkey
+
+    def get_referents(self, key, args, kwargs):
+        """Returns the objects that must be kept alive along with the entry for
+        the given key, typically weak references with callbacks that remove
+        the entry when a key object is garbage collected."""
+
+        cb = None
+        retval = []
+        for a in args + tuple(kwargs.values()):
+            if isinstance(a, type):
+                if cb is None:
+                    cb = self._make_callback(key)
+                retval.append(ref(a, cb))
+
+        return retval
+
+    def get_stats(self):
+        """Returns a dict with ``func``, ``size``, ``maxsize``, ``ttl``,
+        ``hits``, ``misses`` and ``evictions`` keys."""
+
+        return dict(
+            func=self.func,
+            size=len(self.memo),
+            maxsize=self.maxsize,
+            ttl=self.ttl,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+        )
 
     def reset(self):
-        self.memo = {}
+        with self.lock:
+            self.memo.clear()
+            self.expires.clear()
+            self.referents.clear()
 
 
 class memoize_first(object):
     """A memoization decorator that keeps the first call without condition, aka
     a singleton accessor."""
 
-    registry = []
-
     def __init__(self, func):
         self.func = func
         self.lock = threading.RLock()
+
+        self.hits = 0
+        self.misses = 0
+
         memoize.registry.append(self)
 
     def __call__(self, *args, **kwargs):
-        if not hasattr(self, 'memo'):
-            value = self.func(*args, **kwargs)
-            self.memo = value
-            return value
-        return self.memo
+        try:
+            value = self.memo
+        except AttributeError:
+            with self.lock:
+                if not hasattr(self, 'memo'):
+                    self.misses += 1
+                    self.memo = self.func(*args, **kwargs)
+                    return self.memo
+
+                value = self.memo
+
+        self.hits += 1
+        return value
+
+    def get_stats(self):
+        return dict(
+            func=self.func,
+            size=int(hasattr(self, 'memo')),
+            maxsize=1,
+            ttl=None,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=0,
+        )
 
     def reset(self):
-        del self.memo
+        with self.lock:
+            if hasattr(self, 'memo'):
+                del self.memo
 
 
 def memoize_ignore(values):
@@ -134,19 +326,8 @@ def memoize_ignore(values):
                        "memoize_ignore requires an iterable of values to ignore"
 
     class _memoize_ignored(memoize):
-        def __call__(self, *args, **kwargs):
-            key = self.get_key(args, kwargs)
-            # we hope that gil makes this comparison is race-free
-            if not key in self.memo:
-                with self.lock:
-                    # make sure the situation hasn't changed after lock acq
-                    if not key in self.memo:
-                        value = self.func(*args, **kwargs)
-                        if not value in values:
-                            self.memo[key] = value
-
-                        return value
-            return self.memo.get(key)
+        def should_store(self, value):
+            return not (value in values)
 
     return _memoize_ignored
 
@@ -156,25 +337,29 @@ class memoize_ignore_none(memoize):
     function returns `None`, the value is returned but not memoized.
     """
 
-    def __call__(self, *args, **kwargs):
-        key = self.get_key(args, kwargs)
-        # we hope that gil makes this comparison is race-free
-        if not key in self.memo:
-            with self.lock:
-                # make sure the situation hasn't changed after lock acq
-                if not key in self.memo:
-                    value = self.func(*args, **kwargs)
-                    if not (value is None):
-                        self.memo[key] = value
-
-                    return value
-        return self.memo.get(key)
+    def should_store(self, value):
+        return not (value is None)
 
 
 class memoize_id(memoize):
     """A memoization decorator that keeps caching until reset for unhashable
-    types. It works on id()'s of objects instead."""
+    types. It works on id()'s of objects instead.
+
+    Entries are removed when an argument is garbage collected. Arguments that
+    can't be weakly referenced are kept alive as long as their entries."""
 
     def get_key(self, args, kwargs):
         return tuple([id(a) for a in args]), \
                                   tuple([(k, id(v)) for k, v in kwargs.items()])
+
+    def get_referents(self, key, args, kwargs):
+        cb = self._make_callback(key)
+
+        retval = []
+        for a in args + tuple(kwargs.values()):
+            try:
+                retval.append(ref(a, cb))
+            except TypeError:
+                retval.append(a)
+
+        return retval